@@ -0,0 +1,89 @@
+"""Compare commit walk throughput of the git backends.
+
+Usage:
+    python benchmarks/bench_backends.py [REPO_PATH] [--commits N]
+
+Without REPO_PATH, a synthetic repository with N commits is created in a
+temporary directory with ``git fast-import``.
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from git_reporter_ai.backends import create_backend
+from git_reporter_ai.models import GitBackendType
+
+
+def create_synthetic_repo(path: Path, commits: int, files: int = 200) -> None:
+    """Create a repository with ``commits`` commits touching a few files each."""
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    lines = []
+    start = int(time.time()) - commits * 60
+    for i in range(commits):
+        message = f"Change {i}: update module {i % files}\n"
+        lines.append("commit refs/heads/main")
+        lines.append(
+            f"committer Dev {i % 7} <dev{i % 7}@example.com> {start + i * 60} +0000"
+        )
+        lines.append(f"data {len(message)}")
+        lines.append(message)
+        for j in range(3):
+            content = f"{i}\n" * (1 + (i + j) % 20)
+            lines.append(f"M 644 inline src/module_{(i + j) % files}.py")
+            lines.append(f"data {len(content)}")
+            lines.append(content)
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        cwd=path,
+        input="\n".join(lines).encode(),
+        check=True,
+    )
+
+
+def bench(repo_path: Path) -> None:
+    results = {}
+    # The rest backend reads hosted repositories, not local ones
+    local_backends = [b for b in GitBackendType if b != GitBackendType.REST]
+    for backend_type in local_backends:
+        backend = create_backend(backend_type, repo_path, repo_path.name)
+        started = time.perf_counter()
+        commits = list(backend.iter_commits())
+        elapsed = time.perf_counter() - started
+        results[backend_type] = commits
+        print(
+            f"{backend_type.value:>10}: {len(commits):>7} commits in {elapsed:7.2f}s "
+            f"({len(commits) / elapsed:,.0f} commits/s)"
+        )
+
+    by_sha = [
+        {c.sha: (c.insertions, c.deletions, c.files_changed) for c in commits}
+        for commits in results.values()
+    ]
+    if all(stats == by_sha[0] for stats in by_sha):
+        print("All backends returned identical commits and stats.")
+    else:
+        print("WARNING: backends returned different results.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("repo", nargs="?", type=Path, help="Repository to walk")
+    parser.add_argument("--commits", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.repo:
+        bench(args.repo.resolve())
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = Path(tmp) / "synthetic"
+        print(f"Creating synthetic repository with {args.commits} commits...")
+        create_synthetic_repo(repo_path, args.commits)
+        bench(repo_path)
+
+
+if __name__ == "__main__":
+    main()
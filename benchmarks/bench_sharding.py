@@ -0,0 +1,84 @@
+"""Measure how sharded stats extraction scales with the number of workers.
+
+Usage:
+    python benchmarks/bench_sharding.py [REPO_PATH] [--commits N] [--workers 1,2,4]
+
+Without REPO_PATH, a synthetic repository with N commits is created in a
+temporary directory with ``git fast-import``. Workers default to powers of
+two up to the CPU count.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from bench_backends import create_synthetic_repo
+
+from git_reporter_ai.backends import GitCLIBackend
+
+
+def default_workers() -> list[int]:
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+    return workers
+
+
+def bench(repo_path: Path, workers: list[int]) -> None:
+    baseline = None
+    reference = None
+    identical = True
+    for count in workers:
+        backend = GitCLIBackend(repo_path, repo_path.name, workers=count)
+        started = time.perf_counter()
+        commits = list(backend.iter_commits())
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(
+            f"{count:>3} workers: {len(commits):>7} commits in {elapsed:7.2f}s "
+            f"({len(commits) / elapsed:,.0f} commits/s, "
+            f"speedup {baseline / elapsed:4.1f}x)"
+        )
+
+        stats = {c.sha: (c.insertions, c.deletions, c.files_changed) for c in commits}
+        if reference is None:
+            reference = stats
+        elif stats != reference:
+            identical = False
+
+    if identical:
+        print("All worker counts returned identical commits and stats.")
+    else:
+        print("WARNING: sharded results differ from the single process walk.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("repo", nargs="?", type=Path, help="Repository to walk")
+    parser.add_argument("--commits", type=int, default=50000)
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=default_workers(),
+        help="Comma-separated worker counts",
+    )
+    args = parser.parse_args()
+
+    if args.repo:
+        bench(args.repo.resolve(), args.workers)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = Path(tmp) / "synthetic"
+        print(f"Creating synthetic repository with {args.commits} commits...")
+        create_synthetic_repo(repo_path, args.commits)
+        bench(repo_path, args.workers)
+
+
+if __name__ == "__main__":
+    main()
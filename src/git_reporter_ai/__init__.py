@@ -8,11 +8,13 @@ from .git_analyzer import GitAnalyzer
 from .models import (
     AIProvider,
     Config,
+    GitBackendType,
     GitCommit,
     Report,
     ReportPeriod,
     ReportRequest,
     RepositoryConfig,
+    WorkspaceConfig,
 )
 from .report_generator import ReportGenerator
 
@@ -23,9 +25,11 @@ __all__ = [
     "ReportGenerator",
     "AIProvider",
     "Config",
+    "GitBackendType",
     "GitCommit",
     "Report",
     "ReportPeriod",
     "ReportRequest",
     "RepositoryConfig",
+    "WorkspaceConfig",
 ]
@@ -1,7 +1,21 @@
 """AI providers for report generation."""
 
 from .base import AIProvider
+from .budget import TokenBudget, TokenBudgetExceeded
 from .gemini_provider import GeminiProvider
+from .hedged_provider import HedgedProvider, HedgeMetrics
+from .local_provider import LocalProvider
 from .openai_provider import OpenAIProvider
+from .scheduler import RequestScheduler
 
-__all__ = ["AIProvider", "OpenAIProvider", "GeminiProvider"]
+__all__ = [
+    "AIProvider",
+    "OpenAIProvider",
+    "GeminiProvider",
+    "HedgedProvider",
+    "HedgeMetrics",
+    "LocalProvider",
+    "RequestScheduler",
+    "TokenBudget",
+    "TokenBudgetExceeded",
+]
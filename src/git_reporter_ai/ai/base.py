@@ -1,14 +1,72 @@
 """Base AI provider interface."""
 
+import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional
 
-from ..models import GitCommit, ReportPeriod
+from pydantic_ai.usage import RunUsage
+
+from ..diff_context import indent_excerpt
+from ..ledger import UsageLedger
+from ..models import GitCommit, ReportPeriod, TokenUsage, UsageRecord
+from ..themes import ThemeClusterer, format_theme
+from .budget import TokenBudget, TokenBudgetExceeded
+from .scheduler import PRIORITY_NORMAL, RequestScheduler
+
+# Identical for every request so providers can reuse it as a cached prefix;
+# anything request-specific belongs in the user prompt
+SYSTEM_PROMPT = (
+    "You are a helpful assistant that creates concise, professional work reports "
+    "based on git commit history. Your reports should:\n"
+    "1. Summarize the main accomplishments and work done\n"
+    "2. Group related commits into logical themes or projects\n"
+    "3. Highlight significant changes, features, or bug fixes\n"
+    "4. Be written in a professional tone suitable for a manager\n"
+    "5. Focus on what was achieved, not just listing commits\n"
+    "6. Be structured with clear sections and bullet points\n"
+    "\n"
+    "The user message starts with the report period (daily, weekly, monthly, "
+    "quarterly, yearly, custom or since_last, the work added since the "
+    "previous report) and optional additional context, followed "
+    "by the work to report on in one of two forms:\n"
+    "- 'Commits:' lists one commit per line as "
+    "'[repository] date: message (+insertions/-deletions, files)'.\n"
+    "- 'Themes:' lists commits that were already grouped by similarity. Each "
+    "theme has a heading with its keywords, commit count, repositories and "
+    "line totals and the directories it touched, followed by its largest "
+    "commits, largest first, as '[repository] date: message "
+    "(+insertions/-deletions)' (the repository only when the theme spans "
+    "several) and, in large themes, a last line counting the smaller commits "
+    "left out. Use the themes as a starting point for the report's sections.\n"
+    "Some commits are followed by an indented excerpt of their diff (file "
+    "names, hunk headers and changed lines, '...' when truncated). Use it to "
+    "understand what a commit did when its message is vague.\n"
+    "\n"
+    "Generate a professional summary suitable for sharing with a manager, "
+    "titled after the report period."
+)
 
 
 class AIProvider(ABC):
     """Base class for AI providers."""
 
+    # Set by subclasses; every LLM request goes through this scheduler
+    scheduler: RequestScheduler
+    # Groups large commit sets into themes before they are sent to the model
+    clusterer: Optional[ThemeClusterer] = None
+    # Tokens used by this provider's requests, including prompt cache hits
+    usage: Optional[TokenUsage] = None
+    # Provider and model recorded in the usage ledger
+    name: str = "ai"
+    model: Optional[str] = None
+    # Records every call made by this provider, if set
+    ledger: Optional[UsageLedger] = None
+    # Token budget of the run; prompts are shrunk to fit it, if set
+    budget: Optional[TokenBudget] = None
+
     @abstractmethod
     async def generate_report(
         self,
@@ -28,11 +86,14 @@ class AIProvider(ABC):
         """
         pass
 
-    def _format_commits_for_prompt(self, commits: list[GitCommit]) -> str:
+    def _format_commits_for_prompt(
+        self, commits: list[GitCommit], excerpts: bool = True
+    ) -> str:
         """Format commits into a readable format for the AI prompt.
 
         Args:
             commits: List of commits
+            excerpts: Include the diff excerpts attached to commits
 
         Returns:
             Formatted string
@@ -47,25 +108,240 @@ class AIProvider(ABC):
                 f"{commit.message[:100]} "
                 f"(+{commit.insertions}/-{commit.deletions}, {commit.files_changed} files)"
             )
+            if excerpts and commit.diff_excerpt:
+                lines.append(indent_excerpt(commit.diff_excerpt))
 
         return "\n".join(lines)
 
-    def _create_system_prompt(self, period: ReportPeriod) -> str:
-        """Create the system prompt for the AI.
+    def _create_user_prompt(
+        self,
+        commits: list[GitCommit],
+        period: ReportPeriod,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Create the user prompt for the AI.
+
+        All instructions live in the constant system prompt, so the request
+        prefix is byte-identical across runs and periods and can be served
+        from the provider's prompt cache. The user prompt only carries the
+        variable data, least variable first.
 
         Args:
+            commits: List of commits
             period: Report period
+            additional_context: Optional additional context
 
         Returns:
-            System prompt
+            User prompt
         """
-        return (
-            f"You are a helpful assistant that creates concise, professional {period.value} "
-            f"work reports based on git commit history. Your reports should:\n"
-            f"1. Summarize the main accomplishments and work done\n"
-            f"2. Group related commits into logical themes or projects\n"
-            f"3. Highlight significant changes, features, or bug fixes\n"
-            f"4. Be written in a professional tone suitable for a manager\n"
-            f"5. Focus on what was achieved, not just listing commits\n"
-            f"6. Be structured with clear sections and bullet points\n"
+        user_prompt = f"Report period: {period.value}\n"
+        if additional_context:
+            user_prompt += f"Additional context: {additional_context}\n"
+
+        clustered = self.clusterer is not None and self.clusterer.should_cluster(
+            commits
         )
+        if clustered:
+            # Themes are compact blocks, so the model does not have to group
+            # (or even read) every commit itself
+            themes = self.clusterer.cluster(commits)
+            commits_text = "\n\n".join(
+                format_theme(theme, self.clusterer.max_commits_per_theme)
+                for theme in themes
+            )
+            work = f"\nThemes:\n\n{commits_text}\n"
+        else:
+            commits_text = self._format_commits_for_prompt(commits)
+            work = f"\nCommits:\n\n{commits_text}\n"
+
+        if self.budget is not None:
+            limit = self.budget.prompt_limit() - self._estimate_tokens(
+                self._create_system_prompt(), user_prompt
+            )
+            if self._estimate_tokens(work) > limit:
+                work = self._shrink_work(commits, limit, clustered)
+        return user_prompt + work
+
+    def _shrink_work(
+        self, commits: list[GitCommit], limit: int, clustered: bool
+    ) -> str:
+        """Describe the work within a token limit, dropping detail as needed.
+
+        Commits are grouped into themes if they were not already, then diff
+        excerpts are left out, and finally only the newest commits that fit
+        are listed.
+
+        Args:
+            commits: Commits, newest first
+            limit: Estimated tokens the work section may use
+            clustered: Whether the commits were already grouped into themes
+
+        Returns:
+            Work section of the user prompt
+
+        Raises:
+            TokenBudgetExceeded: If not even one commit fits
+        """
+        if self.clusterer is not None and not clustered:
+            themes = self.clusterer.cluster(commits)
+            work = "\nThemes:\n\n" + "\n\n".join(
+                format_theme(t, self.clusterer.max_commits_per_theme) for t in themes
+            )
+            if self._estimate_tokens(work) <= limit:
+                return work + "\n"
+
+        lines = self._format_commits_for_prompt(commits, excerpts=False).split("\n")
+        omitted_note = "- ... {} older commits omitted to stay within the token budget"
+        kept = []
+        used = self._estimate_tokens("\nCommits:\n\n", omitted_note)
+        for line in lines:
+            used += self._estimate_tokens(line)
+            if used > limit:
+                break
+            kept.append(line)
+        if not kept:
+            raise TokenBudgetExceeded(
+                "Token budget exceeded: the prompt does not fit in the tokens "
+                "left of max_tokens_per_run"
+            )
+        if len(kept) < len(lines):
+            kept.append(omitted_note.format(len(lines) - len(kept)))
+        return "\nCommits:\n\n" + "\n".join(kept) + "\n"
+
+    def _estimate_tokens(self, *texts: str) -> int:
+        """Roughly estimate the number of tokens in some prompt text.
+
+        Args:
+            texts: Prompt parts
+
+        Returns:
+            Estimated token count (about four characters per token)
+        """
+        return sum(len(text) for text in texts) // 4 + 1
+
+    async def _run_agent(
+        self,
+        agent,
+        system_prompt: str,
+        user_prompt: str,
+        priority: int = PRIORITY_NORMAL,
+    ) -> str:
+        """Run a pydantic-ai agent through the request scheduler.
+
+        Args:
+            agent: pydantic-ai agent to run
+            system_prompt: System prompt the agent was created with
+            user_prompt: User prompt to send
+            priority: Scheduling priority (lower runs first)
+
+        Returns:
+            Generated text
+
+        Raises:
+            TokenBudgetExceeded: If the request does not fit in the token budget
+        """
+        tokens = self._estimate_tokens(system_prompt, user_prompt)
+        model_settings = None
+        reserved = 0
+        if self.budget is not None:
+            # Cap the answer so the request stays within the budget
+            output_tokens = self.budget.reserve(tokens)
+            reserved = tokens + output_tokens
+            model_settings = {"max_tokens": output_tokens}
+
+        # Usage of every attempt, so retried and failed ones are paid for too
+        attempts: list[RunUsage] = []
+        try:
+            result = await self.scheduler.submit(
+                lambda: self._call_agent(agent, user_prompt, model_settings, attempts),
+                priority=priority,
+                tokens=tokens,
+            )
+        finally:
+            usage = RunUsage()
+            for attempt in attempts:
+                usage.incr(attempt)
+            if self.budget is not None:
+                self.budget.settle(reserved, usage.input_tokens + usage.output_tokens)
+            if attempts:
+                if self.usage is None:
+                    self.usage = TokenUsage()
+                self.usage.add(
+                    requests=usage.requests,
+                    input_tokens=usage.input_tokens,
+                    cache_read_tokens=usage.cache_read_tokens,
+                    output_tokens=usage.output_tokens,
+                )
+
+        # pydantic-ai AgentRunResult has the output in the 'output' attribute
+        return result.output
+
+    async def _call_agent(
+        self,
+        agent,
+        user_prompt: str,
+        model_settings,
+        attempts: Optional[list[RunUsage]] = None,
+    ):
+        """Run an agent once, recording the call in the usage ledger.
+
+        Every attempt is recorded, including failed and cancelled ones (e.g.
+        retried requests or the loser of a hedged request), with the tokens
+        its model requests used before it ended.
+
+        Args:
+            agent: pydantic-ai agent to run
+            user_prompt: User prompt to send
+            model_settings: Settings overriding the agent's, if any
+            attempts: Appended the usage of this attempt, which the agent
+                updates as it goes
+
+        Returns:
+            pydantic-ai run result
+        """
+        started = time.monotonic()
+        record = UsageRecord(provider=self.name, model=self.model, status="error")
+        usage = RunUsage()
+        if attempts is not None:
+            attempts.append(usage)
+        try:
+            result = await agent.run(
+                user_prompt, model_settings=model_settings, usage=usage
+            )
+            record.status = "ok"
+            return result
+        except asyncio.CancelledError:
+            record.status = "cancelled"
+            raise
+        finally:
+            record.requests = usage.requests
+            record.input_tokens = usage.input_tokens
+            record.cache_read_tokens = usage.cache_read_tokens
+            record.output_tokens = usage.output_tokens
+            if self.ledger is not None:
+                record.latency = time.monotonic() - started
+                record.timestamp = datetime.now()
+                self.ledger.record(record)
+
+    def _prompt_cache_key(self, system_prompt: str) -> str:
+        """Derive a provider prompt-cache key from the stable prompt prefix.
+
+        Args:
+            system_prompt: System prompt
+
+        Returns:
+            Key that changes only when the system prompt changes
+        """
+        digest = hashlib.sha256(system_prompt.encode()).hexdigest()[:16]
+        return f"git-reporter-{digest}"
+
+    def _create_system_prompt(self) -> str:
+        """Create the system prompt for the AI.
+
+        The prompt does not depend on the request, so it forms a stable,
+        cacheable prefix for every report.
+
+        Returns:
+            System prompt
+        """
+        return SYSTEM_PROMPT
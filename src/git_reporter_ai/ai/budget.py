@@ -0,0 +1,73 @@
+"""Token budget shared by the LLM requests of one report run."""
+
+# Output tokens allowed per request, and the least worth sending a request for
+OUTPUT_TOKENS = 4096
+MIN_OUTPUT_TOKENS = 256
+
+
+class TokenBudgetExceeded(RuntimeError):
+    """Raised when a request cannot be made within the run's token budget."""
+
+
+class TokenBudget:
+    """Tokens a report run may still spend, shared by all its requests.
+
+    Requests reserve their estimated prompt and their output allowance before
+    they are sent and settle with the actual usage afterwards, so concurrent
+    requests (e.g. hedged ones) cannot overspend together. Prompt sizes are
+    estimated, so the budget is approximate on the prompt side; the output is
+    capped through the model's ``max_tokens`` setting.
+    """
+
+    def __init__(self, limit: int):
+        """Initialize the budget.
+
+        Args:
+            limit: Tokens (prompt and output) the run may spend
+        """
+        self.limit = limit
+        self.spent = 0
+        self.reserved = 0
+
+    @property
+    def remaining(self) -> int:
+        """Tokens neither spent nor reserved by requests in flight."""
+        return self.limit - self.spent - self.reserved
+
+    def prompt_limit(self) -> int:
+        """Largest prompt that still leaves room for an answer."""
+        remaining = self.remaining
+        return remaining - min(OUTPUT_TOKENS, remaining // 2)
+
+    def reserve(self, prompt_tokens: int) -> int:
+        """Reserve tokens for a request.
+
+        Args:
+            prompt_tokens: Estimated prompt tokens
+
+        Returns:
+            Output tokens the request may generate
+
+        Raises:
+            TokenBudgetExceeded: If the prompt leaves too little room for an answer
+        """
+        available = self.remaining - prompt_tokens
+        if available < MIN_OUTPUT_TOKENS:
+            raise TokenBudgetExceeded(
+                f"Token budget exceeded: a request of about {prompt_tokens} prompt "
+                f"tokens does not fit in the {max(0, self.remaining)} tokens left "
+                f"of max_tokens_per_run ({self.limit})"
+            )
+        output_tokens = min(OUTPUT_TOKENS, available)
+        self.reserved += prompt_tokens + output_tokens
+        return output_tokens
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Release a reservation and account for the tokens actually used.
+
+        Args:
+            reserved: Tokens reserved for the request
+            used: Prompt and output tokens the request consumed
+        """
+        self.reserved -= reserved
+        self.spent += used
@@ -6,22 +6,44 @@ from typing import Optional
 from pydantic_ai import Agent
 from pydantic_ai.models.gemini import GeminiModel
 
+from ..ledger import UsageLedger
 from ..models import GitCommit, ReportPeriod
+from ..themes import ThemeClusterer
 from .base import AIProvider as BaseAIProvider
+from .budget import TokenBudget
+from .scheduler import RequestScheduler
 
 
 class GeminiProvider(BaseAIProvider):
     """Google Gemini-based AI provider using pydantic-ai."""
 
-    def __init__(self, api_key: str, model: str = "gemini-2.0-flash-exp"):
+    name = "gemini"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.0-flash-exp",
+        scheduler: Optional[RequestScheduler] = None,
+        clusterer: Optional[ThemeClusterer] = None,
+        ledger: Optional[UsageLedger] = None,
+        budget: Optional[TokenBudget] = None,
+    ):
         """Initialize the Gemini provider.
 
         Args:
             api_key: Google AI API key
             model: Model name to use
+            scheduler: Request scheduler shared with other calls (creates one if None)
+            clusterer: Optional theme clusterer used to compact large prompts
+            ledger: Optional usage ledger recording every call
+            budget: Optional token budget shared with the other requests of the run
         """
         self.api_key = api_key
         self.model = model
+        self.scheduler = scheduler or RequestScheduler()
+        self.clusterer = clusterer
+        self.ledger = ledger
+        self.budget = budget
         # Set API key in environment for pydantic-ai
         os.environ["GEMINI_API_KEY"] = api_key
 
@@ -47,29 +69,8 @@ class GeminiProvider(BaseAIProvider):
         # Create pydantic-ai agent with Gemini model
         # pydantic-ai reads GEMINI_API_KEY from environment
         model = GeminiModel(self.model)
-        agent = Agent(
-            model,
-            system_prompt=self._create_system_prompt(period),
-        )
-
-        # Format commits
-        commits_text = self._format_commits_for_prompt(commits)
-
-        # Create user prompt
-        user_prompt = (
-            f"Please create a {period.value} work report based on these commits:\n\n"
-            f"{commits_text}\n\n"
-        )
-
-        if additional_context:
-            user_prompt += f"Additional context: {additional_context}\n\n"
-
-        user_prompt += (
-            "Generate a professional summary suitable for sharing with a manager."
-        )
-
-        # Run the agent
-        result = await agent.run(user_prompt)
+        system_prompt = self._create_system_prompt()
+        agent = Agent(model, system_prompt=system_prompt)
 
-        # pydantic-ai AgentRunResult has the output in the 'output' attribute
-        return result.output
+        user_prompt = self._create_user_prompt(commits, period, additional_context)
+        return await self._run_agent(agent, system_prompt, user_prompt)
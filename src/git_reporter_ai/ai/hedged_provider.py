@@ -0,0 +1,168 @@
+"""Hedged requests that race a secondary provider against a slow primary."""
+
+import asyncio
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+from ..models import GitCommit, ReportPeriod, TokenUsage
+from .base import AIProvider as BaseAIProvider
+
+
+class HedgeMetrics:
+    """Counters and latencies collected by hedged providers."""
+
+    def __init__(self, window: int = 1000):
+        """Initialize empty metrics.
+
+        Args:
+            window: Number of recent latencies kept for percentiles
+        """
+        self.requests = 0
+        self.hedged = 0
+        self.secondary_wins = 0
+        self.primary_failures = 0
+        self.recent_latencies: deque[float] = deque(maxlen=window)
+
+    def latency_percentile(self, percentile: float) -> float:
+        """Return a percentile (0-100) of recent request latencies."""
+        if not self.recent_latencies:
+            return 0.0
+        latencies = sorted(self.recent_latencies)
+        index = min(len(latencies) - 1, round(percentile / 100 * (len(latencies) - 1)))
+        return latencies[index]
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the metrics as a plain dictionary."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "secondary_wins": self.secondary_wins,
+            "primary_failures": self.primary_failures,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "latency_p99": self.latency_percentile(99),
+        }
+
+
+def _error(task: asyncio.Future) -> Optional[BaseException]:
+    """Get the error a finished request failed with, if any.
+
+    A request cancelled from inside the provider has no exception to report
+    (``exception()`` would raise), so its cancellation counts as the error.
+    """
+    if task.cancelled():
+        return asyncio.CancelledError()
+    return task.exception()
+
+
+class HedgedProvider(BaseAIProvider):
+    """Sends a request to a secondary provider when the primary is slow.
+
+    The primary provider gets the request first. If it has not answered
+    within ``delay`` seconds (or failed earlier), the same request goes to the
+    secondary provider; the first successful answer is used and the other
+    request is cancelled, which also frees its scheduler slot.
+    """
+
+    def __init__(
+        self,
+        primary: BaseAIProvider,
+        secondary: BaseAIProvider,
+        delay: float,
+        metrics: Optional[HedgeMetrics] = None,
+    ):
+        """Initialize the hedged provider.
+
+        Args:
+            primary: Provider asked first
+            secondary: Provider asked once the primary is late
+            delay: Seconds to wait for the primary before hedging
+            metrics: Metrics shared with other requests (creates one if None)
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.delay = delay
+        self.metrics = metrics or HedgeMetrics()
+
+    @property
+    def usage(self) -> Optional[TokenUsage]:
+        """Tokens used by both providers, including cancelled requests."""
+        usages = [p.usage for p in (self.primary, self.secondary) if p.usage]
+        if not usages:
+            return None
+        total = TokenUsage()
+        for usage in usages:
+            total.add(**usage.model_dump())
+        return total
+
+    async def generate_report(
+        self,
+        commits: list[GitCommit],
+        period: ReportPeriod,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Generate a report summary from whichever provider answers first.
+
+        Args:
+            commits: List of commits to summarize
+            period: Report period
+            additional_context: Optional additional context
+
+        Returns:
+            Generated report text
+
+        Raises:
+            Exception: The primary's error if both providers fail (the
+                secondary's if the primary was cancelled)
+        """
+        self.metrics.requests += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(
+            self.primary.generate_report(commits, period, additional_context)
+        )
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay)
+            if done and _error(primary) is None:
+                self.metrics.recent_latencies.append(time.monotonic() - started)
+                return primary.result()
+            if done:
+                self.metrics.primary_failures += 1
+                print(
+                    f"Warning: Primary provider failed ({_error(primary)}), "
+                    "trying the secondary provider",
+                    file=sys.stderr,
+                )
+
+            self.metrics.hedged += 1
+            secondary = asyncio.ensure_future(
+                self.secondary.generate_report(commits, period, additional_context)
+            )
+            tasks.append(secondary)
+
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer the primary if both finished in the same iteration
+                for task in tasks:
+                    if task in done and _error(task) is None:
+                        if task is secondary:
+                            self.metrics.secondary_wins += 1
+                        self.metrics.recent_latencies.append(time.monotonic() - started)
+                        return task.result()
+            errors = [_error(task) for task in tasks]
+            raise next(
+                (e for e in errors if not isinstance(e, asyncio.CancelledError)),
+                errors[0],
+            )
+        finally:
+            # Cancel the loser (or both, if this request was cancelled)
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
@@ -0,0 +1,173 @@
+"""Offline provider that builds a structured report without an LLM."""
+
+import heapq
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+from ..models import GitCommit, ReportPeriod
+from .base import AIProvider as BaseAIProvider
+
+# type(scope)!: description
+CONVENTIONAL_COMMIT = re.compile(
+    r"^(?P<type>[a-zA-Z]+)(?:\((?P<scope>[^)]*)\))?!?:\s*(?P<description>.+)$"
+)
+
+# Section titles in display order
+COMMIT_TYPES = {
+    "feat": "Features",
+    "fix": "Bug Fixes",
+    "perf": "Performance",
+    "refactor": "Refactoring",
+    "docs": "Documentation",
+    "test": "Tests",
+    "build": "Build & CI",
+    "ci": "Build & CI",
+    "style": "Style",
+    "chore": "Chores",
+    "revert": "Reverts",
+}
+OTHER = "Other Changes"
+
+
+def parse_subject(message: str) -> tuple[str, str]:
+    """Split a commit message into a section title and a display subject.
+
+    Args:
+        message: Full commit message
+
+    Returns:
+        Tuple of (section title, subject line)
+    """
+    subject = message.split("\n", 1)[0].strip()
+    match = CONVENTIONAL_COMMIT.match(subject)
+    if not match:
+        return OTHER, subject
+
+    section = COMMIT_TYPES.get(match["type"].lower(), OTHER)
+    description = match["description"]
+    if match["scope"]:
+        description = f"**{match['scope']}:** {description}"
+    return section, description
+
+
+class LocalProvider(BaseAIProvider):
+    """Deterministic provider that summarizes commits locally.
+
+    Commits are grouped by repository and conventional-commit type, the largest
+    changes are listed by churn and activity statistics are added. Runs in a
+    single pass over the commits with bounded memory and needs no network
+    access or API key.
+    """
+
+    name = "local"
+
+    def __init__(self, max_items_per_section: int = 20, top_changes: int = 10):
+        """Initialize the local provider.
+
+        Args:
+            max_items_per_section: Commits listed per type section before truncating
+            top_changes: Number of largest changes to highlight
+        """
+        self.max_items_per_section = max_items_per_section
+        self.top_changes = top_changes
+
+    async def generate_report(
+        self,
+        commits: Iterable[GitCommit],
+        period: ReportPeriod,
+        additional_context: Optional[str] = None,
+    ) -> str:
+        """Generate a structured markdown report from commits.
+
+        Args:
+            commits: List of commits to summarize
+            period: Report period
+            additional_context: Optional additional context
+
+        Returns:
+            Generated report text
+        """
+        # Single pass with bounded state, so disk-backed commit streams work too
+        sections: dict[str, dict[str, list[str]]] = {}
+        section_counts: Counter[tuple[str, str]] = Counter()
+        days: Counter[str] = Counter()
+        authors: set[str] = set()
+        top: list[tuple[int, int, GitCommit]] = []
+        total = insertions = deletions = files_changed = 0
+
+        for commit in commits:
+            section, subject = parse_subject(commit.message)
+            section_counts[commit.repository, section] += 1
+            items = sections.setdefault(commit.repository, {}).setdefault(section, [])
+            if len(items) < self.max_items_per_section:
+                items.append(f"{subject} (`{commit.sha[:7]}`)")
+            days[commit.date.strftime("%Y-%m-%d")] += 1
+            authors.add(commit.email.lower())
+            insertions += commit.insertions
+            deletions += commit.deletions
+            files_changed += commit.files_changed
+
+            # Earlier commits win ties, as with heapq.nlargest
+            entry = (commit.insertions + commit.deletions, -total, commit)
+            if len(top) < self.top_changes:
+                heapq.heappush(top, entry)
+            elif self.top_changes:
+                heapq.heappushpop(top, entry)
+            total += 1
+
+        if not total:
+            return "No commits found in this period."
+
+        lines = [f"# {period.value.capitalize()} Work Report", ""]
+        if additional_context:
+            lines += [additional_context, ""]
+
+        busiest_day, busiest_count = max(days.items(), key=lambda item: item[1])
+        lines += [
+            "## Overview",
+            "",
+            (
+                f"- **Commits:** {total} across {len(sections)} "
+                f"repositor{'y' if len(sections) == 1 else 'ies'}"
+            ),
+            (
+                f"- **Lines changed:** +{insertions} / -{deletions} "
+                f"in {files_changed} files"
+            ),
+            (
+                f"- **Active days:** {len(days)} "
+                f"(busiest: {busiest_day} with {busiest_count} commits)"
+            ),
+            f"- **Authors:** {len(authors)}",
+            "",
+        ]
+
+        lines += ["## Largest Changes", ""]
+        for _, _, commit in sorted(top, key=lambda entry: entry[:2], reverse=True):
+            lines.append(
+                f"- [{commit.repository}] {parse_subject(commit.message)[1]} "
+                f"(+{commit.insertions}/-{commit.deletions}, "
+                f"{commit.files_changed} files)"
+            )
+        lines.append("")
+
+        section_order = list(dict.fromkeys(COMMIT_TYPES.values())) + [OTHER]
+        for repository in sorted(sections):
+            repo_sections = sections[repository]
+            count = sum(
+                section_counts[repository, section] for section in repo_sections
+            )
+            lines += [f"## {repository} ({count} commits)", ""]
+            for section in section_order:
+                items = repo_sections.get(section)
+                if not items:
+                    continue
+                lines += [f"### {section}", ""]
+                lines += [f"- {item}" for item in items]
+                remaining = section_counts[repository, section] - len(items)
+                if remaining > 0:
+                    lines.append(f"- ...and {remaining} more")
+                lines.append("")
+
+        return "\n".join(lines).rstrip() + "\n"
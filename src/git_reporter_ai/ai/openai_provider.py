@@ -3,29 +3,56 @@
 import os
 from typing import Optional
 
+from openai import AsyncOpenAI
 from pydantic_ai import Agent
+from pydantic_ai.providers.openai import OpenAIProvider as OpenAIClientProvider
 
 try:
     from pydantic_ai.models.openai import OpenAIChatModel as OpenAIModel
 except ImportError:
     from pydantic_ai.models.openai import OpenAIModel
 
+from ..ledger import UsageLedger
 from ..models import GitCommit, ReportPeriod
+from ..themes import ThemeClusterer
 from .base import AIProvider as BaseAIProvider
+from .budget import TokenBudget
+from .scheduler import RequestScheduler
 
 
 class OpenAIProvider(BaseAIProvider):
     """OpenAI-based AI provider using pydantic-ai."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    name = "openai"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        base_url: Optional[str] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        clusterer: Optional[ThemeClusterer] = None,
+        ledger: Optional[UsageLedger] = None,
+        budget: Optional[TokenBudget] = None,
+    ):
         """Initialize the OpenAI provider.
 
         Args:
             api_key: OpenAI API key
             model: Model name to use
+            base_url: Optional OpenAI-compatible endpoint (e.g. a local server)
+            scheduler: Request scheduler shared with other calls (creates one if None)
+            clusterer: Optional theme clusterer used to compact large prompts
+            ledger: Optional usage ledger recording every call
+            budget: Optional token budget shared with the other requests of the run
         """
         self.api_key = api_key
         self.model = model
+        self.base_url = base_url
+        self.scheduler = scheduler or RequestScheduler()
+        self.clusterer = clusterer
+        self.ledger = ledger
+        self.budget = budget
         # Set API key in environment for pydantic-ai
         os.environ["OPENAI_API_KEY"] = api_key
 
@@ -48,32 +75,22 @@ class OpenAIProvider(BaseAIProvider):
         if not commits:
             return "No commits found in this period."
 
-        # Create pydantic-ai agent
-        # pydantic-ai reads OPENAI_API_KEY from environment
-        model = OpenAIModel(self.model)
-        agent = Agent(
-            model,
-            system_prompt=self._create_system_prompt(period),
+        # Create pydantic-ai agent; retries are left to the scheduler
+        client = AsyncOpenAI(
+            api_key=self.api_key, base_url=self.base_url, max_retries=0
         )
-
-        # Format commits
-        commits_text = self._format_commits_for_prompt(commits)
-
-        # Create user prompt
-        user_prompt = (
-            f"Please create a {period.value} work report based on these commits:\n\n"
-            f"{commits_text}\n\n"
+        model = OpenAIModel(
+            self.model, provider=OpenAIClientProvider(openai_client=client)
         )
-
-        if additional_context:
-            user_prompt += f"Additional context: {additional_context}\n\n"
-
-        user_prompt += (
-            "Generate a professional summary suitable for sharing with a manager."
+        system_prompt = self._create_system_prompt()
+        # The cache key routes requests sharing the prefix to the same cache
+        agent = Agent(
+            model,
+            system_prompt=system_prompt,
+            model_settings={
+                "openai_prompt_cache_key": self._prompt_cache_key(system_prompt)
+            },
         )
 
-        # Run the agent
-        result = await agent.run(user_prompt)
-
-        # pydantic-ai AgentRunResult has the output in the 'output' attribute
-        return result.output
+        user_prompt = self._create_user_prompt(commits, period, additional_context)
+        return await self._run_agent(agent, system_prompt, user_prompt)
@@ -0,0 +1,312 @@
+"""Request scheduler for AI provider calls.
+
+Every LLM request goes through a :class:`RequestScheduler`, which enforces
+request and token rate limits, caps the number of concurrent requests, orders
+waiting requests by priority and retries rate-limited or timed-out calls with
+jittered exponential backoff.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Lower values are dispatched first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket that refills continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute: float):
+        """Initialize the bucket full.
+
+        Args:
+            rate_per_minute: Units added per minute, also the bucket capacity
+        """
+        self.capacity = float(rate_per_minute)
+        self.rate = rate_per_minute / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds to wait until ``amount`` units are available."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` units from the bucket."""
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+class SchedulerMetrics:
+    """Counters and queue wait times collected by a scheduler."""
+
+    def __init__(self, window: int = 1000):
+        """Initialize empty metrics.
+
+        Args:
+            window: Number of recent wait times kept for percentiles
+        """
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: deque[float] = deque(maxlen=window)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long a request waited in the queue."""
+        self.requests += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self.recent_waits.append(seconds)
+
+    def wait_percentile(self, percentile: float) -> float:
+        """Return a percentile (0-100) of recent queue wait times."""
+        if not self.recent_waits:
+            return 0.0
+        waits = sorted(self.recent_waits)
+        index = min(len(waits) - 1, round(percentile / 100 * (len(waits) - 1)))
+        return waits[index]
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the metrics as a plain dictionary."""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "wait_avg": self.total_wait / self.requests if self.requests else 0.0,
+            "wait_p50": self.wait_percentile(50),
+            "wait_p95": self.wait_percentile(95),
+            "wait_max": self.max_wait,
+        }
+
+
+def _iter_causes(exc: BaseException):
+    """Yield an exception and the exceptions it was raised from."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """Extract a Retry-After delay in seconds from an exception, if present."""
+    for error in _iter_causes(exc):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+        if not headers:
+            continue
+        value = headers.get("retry-after")
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an exception is a rate limit, timeout or transient server error."""
+    for error in _iter_causes(exc):
+        if isinstance(
+            error,
+            (
+                asyncio.TimeoutError,
+                TimeoutError,
+                httpx.TimeoutException,
+                httpx.NetworkError,
+            ),
+        ):
+            return True
+        status_code = getattr(error, "status_code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        if status_code in RETRYABLE_STATUS_CODES:
+            return True
+    return False
+
+
+class RequestScheduler:
+    """Rate-limited, priority-ordered executor for LLM requests."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_in_flight: int = 4,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        timeout: Optional[float] = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            requests_per_minute: Request rate limit (None = unlimited)
+            tokens_per_minute: Estimated token rate limit (None = unlimited)
+            max_in_flight: Maximum number of concurrent requests
+            max_retries: Retries for rate-limited, timed-out or failed requests
+            base_delay: Initial backoff delay in seconds
+            max_delay: Maximum backoff delay in seconds
+            timeout: Per-attempt timeout in seconds (None = no timeout)
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.metrics = SchedulerMetrics()
+
+        self._queue: list[tuple[int, int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._in_flight = 0
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently running."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting to be dispatched."""
+        return sum(1 for entry in self._queue if not entry[3].done())
+
+    async def submit(
+        self,
+        call: Callable[[], Awaitable[T]],
+        priority: int = PRIORITY_NORMAL,
+        tokens: int = 0,
+    ) -> T:
+        """Run a request once the rate limits and concurrency cap allow it.
+
+        Args:
+            call: Zero-argument callable returning the request coroutine
+            priority: Dispatch priority (lower runs first)
+            tokens: Estimated tokens consumed by the request
+
+        Returns:
+            The result of the call
+
+        Raises:
+            Exception: The last error once retries are exhausted, or any
+                non-retryable error immediately
+        """
+        attempt = 0
+        while True:
+            await self._acquire(priority, tokens)
+            try:
+                if self.timeout:
+                    return await asyncio.wait_for(call(), self.timeout)
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.metrics.failures += 1
+                    raise
+                delay = self._backoff(attempt, get_retry_after(e))
+                attempt += 1
+                self.metrics.retries += 1
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def _acquire(self, priority: int, tokens: int) -> None:
+        """Wait in the priority queue until the request may be dispatched."""
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._counter), tokens, waiter))
+        enqueued = time.monotonic()
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # A slot granted just before cancellation must be handed back
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        self.metrics.record_wait(time.monotonic() - enqueued)
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _on_wakeup(self) -> None:
+        self._wakeup = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to queued requests while limits allow."""
+        while self._queue:
+            _, _, tokens, waiter = self._queue[0]
+            if waiter.done():
+                # Cancelled while waiting
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self.max_in_flight:
+                return
+
+            delay = 0.0
+            if self.request_bucket:
+                delay = max(delay, self.request_bucket.delay(1))
+            if self.token_bucket and tokens:
+                delay = max(delay, self.token_bucket.delay(tokens))
+            if delay > 0:
+                if self._wakeup is None:
+                    self._wakeup = asyncio.get_running_loop().call_later(
+                        delay, self._on_wakeup
+                    )
+                return
+
+            heapq.heappop(self._queue)
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket and tokens:
+                self.token_bucket.consume(tokens)
+            self._in_flight += 1
+            waiter.set_result(None)
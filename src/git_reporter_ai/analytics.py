@@ -0,0 +1,316 @@
+"""Columnar commit analytics backed by NumPy.
+
+Commits are loaded once into a :class:`CommitTable` of NumPy arrays, with
+repositories and authors dictionary-encoded as integer codes. All aggregations
+are then vectorized (``bincount``, ``percentile``). Loading still reads every
+commit object once, so for large histories it costs more than the
+aggregations themselves.
+
+NumPy is an optional dependency: ``pip install 'git-reporter-ai[analytics]'``.
+"""
+
+import csv
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Iterable
+
+from .models import GitCommit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Commit dates are naive local times; subtracting a naive epoch keeps wall-clock time
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+# Commits converted to columns at a time
+CHUNK_SIZE = 65536
+
+GROUP_BY_OPTIONS = ("repository", "author", "day")
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Commit analytics requires numpy. "
+            "Install it with: pip install 'git-reporter-ai[analytics]'"
+        )
+
+
+class CommitTable:
+    """Columnar table of commit metadata."""
+
+    def __init__(
+        self,
+        timestamps: "np.ndarray",
+        repo_codes: "np.ndarray",
+        repositories: list[str],
+        author_codes: "np.ndarray",
+        authors: list[str],
+        insertions: "np.ndarray",
+        deletions: "np.ndarray",
+        files_changed: "np.ndarray",
+    ):
+        """Initialize the table from prepared columns.
+
+        Args:
+            timestamps: Commit times as ``datetime64[s]`` (local wall-clock time)
+            repo_codes: Index into ``repositories`` for each commit
+            repositories: Distinct repository names
+            author_codes: Index into ``authors`` for each commit
+            authors: Distinct author emails
+            insertions: Inserted lines per commit
+            deletions: Deleted lines per commit
+            files_changed: Changed files per commit
+        """
+        _require_numpy()
+        self.timestamps = timestamps
+        self.repo_codes = repo_codes
+        self.repositories = repositories
+        self.author_codes = author_codes
+        self.authors = authors
+        self.insertions = insertions
+        self.deletions = deletions
+        self.files_changed = files_changed
+
+    @classmethod
+    def from_commits(cls, commits: Iterable[GitCommit]) -> "CommitTable":
+        """Load commits into a columnar table.
+
+        Args:
+            commits: Commits to load (any iterable, consumed once in chunks)
+
+        Returns:
+            Commit table
+        """
+        _require_numpy()
+        repo_index: dict[str, int] = {}
+        author_index: dict[str, int] = {}
+        chunks: dict[str, list[np.ndarray]] = {
+            "seconds": [],
+            "repo_codes": [],
+            "author_codes": [],
+            "insertions": [],
+            "deletions": [],
+            "files_changed": [],
+        }
+
+        # Load in fixed-size chunks so only the columns are held for large
+        # (possibly disk-backed) inputs; column-wise comprehensions are much
+        # cheaper than per-row appends
+        iterator = iter(commits)
+        while chunk := list(islice(iterator, CHUNK_SIZE)):
+            chunks["seconds"].append(
+                np.array([(c.date - _EPOCH) // _SECOND for c in chunk], dtype=np.int64)
+            )
+            chunks["repo_codes"].append(
+                np.array(
+                    [
+                        repo_index.setdefault(c.repository, len(repo_index))
+                        for c in chunk
+                    ],
+                    dtype=np.int32,
+                )
+            )
+            chunks["author_codes"].append(
+                np.array(
+                    [
+                        author_index.setdefault(c.email.lower(), len(author_index))
+                        for c in chunk
+                    ],
+                    dtype=np.int32,
+                )
+            )
+            chunks["insertions"].append(
+                np.array([c.insertions for c in chunk], dtype=np.int64)
+            )
+            chunks["deletions"].append(
+                np.array([c.deletions for c in chunk], dtype=np.int64)
+            )
+            chunks["files_changed"].append(
+                np.array([c.files_changed for c in chunk], dtype=np.int64)
+            )
+
+        columns = {
+            name: np.concatenate(parts)
+            if parts
+            else np.array([], dtype=np.int32 if name.endswith("codes") else np.int64)
+            for name, parts in chunks.items()
+        }
+        return cls(
+            timestamps=columns["seconds"].astype("datetime64[s]"),
+            repo_codes=columns["repo_codes"],
+            repositories=list(repo_index),
+            author_codes=columns["author_codes"],
+            authors=list(author_index),
+            insertions=columns["insertions"],
+            deletions=columns["deletions"],
+            files_changed=columns["files_changed"],
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def churn(self) -> "np.ndarray":
+        """Inserted plus deleted lines per commit."""
+        return self.insertions + self.deletions
+
+    @property
+    def days(self) -> "np.ndarray":
+        """Commit dates as ``datetime64[D]``."""
+        return self.timestamps.astype("datetime64[D]")
+
+    def churn_totals(self) -> dict[str, int]:
+        """Total commits, insertions, deletions, churn and files changed.
+
+        Returns:
+            Mapping of metric name to total
+        """
+        return {
+            "commits": len(self),
+            "insertions": int(self.insertions.sum()),
+            "deletions": int(self.deletions.sum()),
+            "churn": int(self.churn.sum()),
+            "files_changed": int(self.files_changed.sum()),
+        }
+
+    def percentiles(
+        self, column: str = "churn", q: Iterable[float] = (50, 90, 99)
+    ) -> dict[float, float]:
+        """Percentiles of a per-commit metric.
+
+        Args:
+            column: ``churn``, ``insertions``, ``deletions`` or ``files_changed``
+            q: Percentiles to compute (0-100)
+
+        Returns:
+            Mapping of percentile to value
+        """
+        q = list(q)
+        if not len(self):
+            return {p: 0.0 for p in q}
+        values = np.percentile(getattr(self, column), q)
+        return {p: float(v) for p, v in zip(q, values)}
+
+    def weekday_histogram(self) -> "np.ndarray":
+        """Commit counts per weekday, Monday first."""
+        # 1970-01-01 was a Thursday
+        weekday = (self.days.astype(np.int64) + 3) % 7
+        return np.bincount(weekday, minlength=7)
+
+    def hour_histogram(self) -> "np.ndarray":
+        """Commit counts per hour of the day (0-23)."""
+        seconds = (self.timestamps - self.days).astype(np.int64)
+        return np.bincount(seconds // 3600, minlength=24)
+
+    def activity(self, by: str = "repository") -> dict[str, "np.ndarray"]:
+        """Commit counts and churn grouped by repository, author or day.
+
+        Args:
+            by: ``repository``, ``author`` or ``day``
+
+        Returns:
+            Columns ``key``, ``commits``, ``insertions``, ``deletions`` and
+            ``files_changed``, one row per group (days without commits omitted)
+
+        Raises:
+            ValueError: If the grouping is unknown
+        """
+        if by == "repository":
+            codes, keys = self.repo_codes, np.array(self.repositories, dtype=object)
+        elif by == "author":
+            codes, keys = self.author_codes, np.array(self.authors, dtype=object)
+        elif by == "day":
+            days = self.days
+            if not len(days):
+                codes, keys = days.astype(np.int64), np.array([], dtype=object)
+            else:
+                first = days.min()
+                codes = (days - first).astype(np.int64)
+                span = np.arange(codes.max() + 1)
+                keys = (first + span).astype(str).astype(object)
+        else:
+            raise ValueError(
+                f"Unknown grouping: {by}. Use one of {', '.join(GROUP_BY_OPTIONS)}"
+            )
+
+        size = len(keys)
+        commits = np.bincount(codes, minlength=size)
+        present = commits > 0
+        return {
+            "key": keys[present],
+            "commits": commits[present],
+            "insertions": np.bincount(
+                codes, weights=self.insertions, minlength=size
+            ).astype(np.int64)[present],
+            "deletions": np.bincount(
+                codes, weights=self.deletions, minlength=size
+            ).astype(np.int64)[present],
+            "files_changed": np.bincount(
+                codes, weights=self.files_changed, minlength=size
+            ).astype(np.int64)[present],
+        }
+
+    def to_columns(self) -> dict[str, "np.ndarray"]:
+        """Per-commit columns with repositories and authors decoded."""
+        return {
+            "date": self.timestamps.astype(str),
+            "repository": np.array(self.repositories, dtype=object)[self.repo_codes],
+            "email": np.array(self.authors, dtype=object)[self.author_codes],
+            "insertions": self.insertions,
+            "deletions": self.deletions,
+            "files_changed": self.files_changed,
+        }
+
+
+def export_csv(columns: dict[str, "np.ndarray"], path: Path) -> None:
+    """Write columns to a CSV file.
+
+    Args:
+        columns: Column name to equal-length array
+        path: Output file path
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*(col.tolist() for col in columns.values())))
+
+
+def export_parquet(columns: dict[str, "np.ndarray"], path: Path) -> None:
+    """Write columns to a Parquet file.
+
+    Args:
+        columns: Column name to equal-length array
+        path: Output file path
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet export requires pyarrow. Install it with: pip install pyarrow"
+        ) from e
+
+    table = pa.table({name: col.tolist() for name, col in columns.items()})
+    pq.write_table(table, path)
+
+
+def export_columns(columns: dict[str, "np.ndarray"], path: Path) -> None:
+    """Write columns to CSV or Parquet depending on the file extension.
+
+    Args:
+        columns: Column name to equal-length array
+        path: Output file path (``.parquet`` for Parquet, anything else is CSV)
+    """
+    if path.suffix.lower() == ".parquet":
+        export_parquet(columns, path)
+    else:
+        export_csv(columns, path)
@@ -0,0 +1,65 @@
+"""Git backends used to walk commit history."""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+from git import Repo
+
+from ..models import GitBackendType
+from .base import GitBackend
+from .cli_backend import GitCLIBackend
+from .gitpython_backend import GitPythonBackend
+from .rest_backend import RestBackend, resolve_api
+
+__all__ = [
+    "GitBackend",
+    "GitCLIBackend",
+    "GitPythonBackend",
+    "RestBackend",
+    "create_backend",
+    "resolve_api",
+]
+
+
+def create_backend(
+    backend_type: GitBackendType,
+    repo_path: Optional[Path],
+    repository: str,
+    repo: Optional[Repo] = None,
+    url: Optional[str] = None,
+    api_url: Optional[str] = None,
+    api_token: Optional[str] = None,
+    refs: Iterable[str] = (),
+    workers: int = 1,
+) -> GitBackend:
+    """Create a git backend.
+
+    Args:
+        backend_type: Backend to create
+        repo_path: Path to the local repository (None for the REST backend)
+        repository: Repository name recorded on each commit
+        repo: Already opened GitPython repository, reused by the GitPython backend
+        url: Remote repository URL read by the REST backend
+        api_url: REST API base URL (derived from ``url`` if None)
+        api_token: REST API access token
+        refs: Branch patterns listed by the REST backend
+        workers: Processes computing commit stats in the cli backend
+
+    Returns:
+        Git backend instance
+
+    Raises:
+        ValueError: If the backend type is unknown
+    """
+    if backend_type == GitBackendType.GITPYTHON:
+        return GitPythonBackend(repo_path, repository, repo=repo)
+    elif backend_type == GitBackendType.CLI:
+        return GitCLIBackend(repo_path, repository, workers=workers)
+    elif backend_type == GitBackendType.REST:
+        if not url:
+            raise ValueError(
+                f"The rest backend needs a remote 'repo' URL: {repository}"
+            )
+        return RestBackend(url, repository, api_url=api_url, token=api_token, refs=refs)
+    else:
+        raise ValueError(f"Unknown git backend: {backend_type}")
@@ -0,0 +1,50 @@
+"""Base git backend interface."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from ..identity import AuthorFilter
+from ..models import GitCommit
+from ..progress import RepoProgress
+
+
+class GitBackend(ABC):
+    """Base class for backends that walk a repository's commit history."""
+
+    def __init__(self, repo_path: Optional[Path], repository: str):
+        """Initialize the backend.
+
+        Args:
+            repo_path: Path to the local repository (None for remote backends)
+            repository: Repository name recorded on each commit
+        """
+        self.repo_path = repo_path
+        self.repository = repository
+        # Walk counters read by the progress dashboard; replaced by the
+        # analyzer with the tracked progress of the repository
+        self.progress = RepoProgress(repository)
+
+    @abstractmethod
+    def iter_commits(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        author: Optional[AuthorFilter] = None,
+        tips: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Iterator[GitCommit]:
+        """Iterate over commits reachable from the given tips.
+
+        Args:
+            start_date: Only commits committed at or after this time
+            end_date: Only commits committed at or before this time
+            author: Only commits whose raw author email or name is in this filter
+            tips: Commits the walk starts from (all refs if None)
+            exclude: Skip commits reachable from these (ignored by backends
+                without a local history)
+
+        Yields:
+            GitCommit objects, in no particular order
+        """
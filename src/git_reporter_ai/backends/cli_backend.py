@@ -0,0 +1,417 @@
+"""Fast backend that streams a single ``git log`` process."""
+
+import itertools
+import multiprocessing
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+from ..identity import AuthorFilter
+from ..models import MAX_COMMIT_PATHS, GitCommit
+from .base import GitBackend
+
+# Record separator between commits; fields within a header are NUL-separated
+RECORD_SEPARATOR = b"\x1e"
+LOG_FORMAT = "%x1e%H%x00%an%x00%ae%x00%ct%x00%B%x00"
+# Header fields used to list commits before they are sharded
+LIST_FORMAT = "%x1e%H%x00%an%x00%ae%x00%ct"
+CHUNK_SIZE = 1 << 16
+
+# Ranges with fewer commits are not sharded
+SHARD_MIN_COMMITS = 2000
+MIN_SHARD_SIZE = 250
+MAX_SHARD_SIZE = 5000
+
+
+def iter_records(stream: IO[bytes], separator: bytes = RECORD_SEPARATOR):
+    """Split a byte stream into records without reading it all into memory.
+
+    Args:
+        stream: Binary stream to read
+        separator: Record separator
+
+    Yields:
+        Raw record bytes (empty records are skipped)
+    """
+    buffer = b""
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        *records, buffer = buffer.split(separator)
+        for record in records:
+            if record:
+                yield record
+    if buffer:
+        yield buffer
+
+
+def parse_numstat(data: bytes) -> tuple[int, int, int, list[str]]:
+    """Sum ``--numstat`` output.
+
+    Args:
+        data: Numstat lines (``insertions<TAB>deletions<TAB>path``)
+
+    Returns:
+        Tuple of (files_changed, insertions, deletions, paths); binary files
+        count as changed files with no line changes, and at most
+        ``MAX_COMMIT_PATHS`` paths are kept
+    """
+    files_changed = insertions = deletions = 0
+    paths = []
+    for line in data.split(b"\n"):
+        added, _, rest = line.partition(b"\t")
+        if not rest:
+            continue
+        removed, _, path = rest.partition(b"\t")
+        files_changed += 1
+        if len(paths) < MAX_COMMIT_PATHS:
+            paths.append(path.decode(errors="replace"))
+        if added != b"-":
+            insertions += int(added)
+        if removed != b"-":
+            deletions += int(removed)
+    return files_changed, insertions, deletions, paths
+
+
+def run_log(command: list[str], cwd: Path, stdin_lines: Optional[list[str]] = None):
+    """Stream the records of a ``git log`` process.
+
+    Args:
+        command: git command line
+        cwd: Repository path
+        stdin_lines: Lines fed to the process (revisions for ``--stdin``)
+
+    Yields:
+        Raw record bytes
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    with tempfile.TemporaryFile() as stderr, tempfile.TemporaryFile() as stdin:
+        if stdin_lines is not None:
+            stdin.write(("\n".join(stdin_lines) + "\n").encode())
+            stdin.seek(0)
+        process = subprocess.Popen(
+            command, cwd=cwd, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr
+        )
+        finished = False
+        try:
+            yield from iter_records(process.stdout)
+            finished = True
+        finally:
+            # Stop git if the caller abandoned the walk early
+            if not finished:
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"git log failed in {cwd}: "
+                f"{stderr.read().decode(errors='replace').strip()}"
+            )
+
+
+def make_commit(
+    sha: bytes,
+    name: bytes,
+    email: bytes,
+    committed: int,
+    message: bytes,
+    stats: tuple[int, int, int, list[str]],
+    repository: str,
+) -> GitCommit:
+    """Decode the fields of a log record into a commit.
+
+    Args:
+        sha: Commit SHA
+        name: Author name
+        email: Author email
+        committed: Committer time (Unix seconds)
+        message: Commit message
+        stats: Parsed numstat, see :func:`parse_numstat`
+        repository: Repository name recorded on the commit
+
+    Returns:
+        Commit
+    """
+    files_changed, insertions, deletions, paths = stats
+    return GitCommit(
+        sha=sha.decode(),
+        author=name.decode(errors="replace"),
+        email=email.decode(errors="replace"),
+        date=datetime.fromtimestamp(committed),
+        message=message.decode(errors="replace").strip(),
+        repository=repository,
+        files_changed=files_changed,
+        insertions=insertions,
+        deletions=deletions,
+        paths=paths,
+    )
+
+
+def read_shard(repo_path: Path, shas: list[str]) -> list[tuple]:
+    """Read a shard of commits with their stats (runs in a worker process).
+
+    Records are returned as plain tuples, which are much cheaper to send back
+    to the parent process than models.
+
+    Args:
+        repo_path: Path to the repository
+        shas: Commits of the shard
+
+    Returns:
+        ``(sha, name, email, timestamp, message, stats)`` tuples in the
+        order of ``shas``
+    """
+    command = [
+        "git",
+        "log",
+        "--stdin",
+        "--no-walk=unsorted",
+        "--no-color",
+        "--no-renames",
+        "--diff-merges=first-parent",
+        "--numstat",
+        f"--format={LOG_FORMAT}",
+    ]
+    records = []
+    for record in run_log(command, repo_path, shas):
+        sha, name, email, timestamp, message, numstat = record.split(b"\0", 5)
+        records.append(
+            (sha, name, email, int(timestamp), message, parse_numstat(numstat))
+        )
+    return records
+
+
+def _shard_commits(records: list[tuple], repository: str) -> Iterator[GitCommit]:
+    for record in records:
+        yield make_commit(*record, repository)
+
+
+class GitCLIBackend(GitBackend):
+    """Walks history by streaming the output of one ``git log --numstat``.
+
+    The date range and author are pushed down to git, stats for every commit
+    come from the same process, and commit headers are only decoded for
+    commits that pass the filters.
+
+    With several workers, large ranges are sharded instead: a cheap walk
+    without diffs lists the matching commits in date order, and contiguous
+    shards of them are diffed by a process pool. Shards are sized from the
+    number of commits in the range, so sparse ranges run in few shards and
+    dense ones are spread evenly over all workers.
+    """
+
+    def __init__(self, repo_path: Path, repository: str, workers: int = 1):
+        """Initialize the backend.
+
+        Args:
+            repo_path: Path to the local repository
+            repository: Repository name recorded on each commit
+            workers: Processes computing commit stats for large ranges
+        """
+        super().__init__(repo_path, repository)
+        self.workers = max(1, workers)
+
+    def _log_command(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        author: Optional[AuthorFilter],
+        tips: Optional[list[str]],
+        exclude: Optional[list[str]],
+        stats: bool = True,
+    ) -> list[str]:
+        command = ["git", "log", "--no-color"]
+        if tips is None:
+            command.append("--all")
+        if tips or exclude:
+            # Revisions are read from stdin, which has no argument limit
+            command.append("--stdin")
+        if stats:
+            command += [
+                "--no-renames",
+                "--diff-merges=first-parent",
+                "--numstat",
+                f"--format={LOG_FORMAT}",
+            ]
+        else:
+            command += ["--date-order", f"--format={LIST_FORMAT}"]
+        if start_date:
+            command.append(f"--since={start_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        if end_date:
+            command.append(f"--until={end_date.strftime('%Y-%m-%d %H:%M:%S')}")
+        if author:
+            # Repeated --author options match any of them; they narrow the
+            # walk inside git and are checked exactly below
+            command += ["--fixed-strings", "--regexp-ignore-case"]
+            command += [f"--author=<{email}>" for email in sorted(author.emails)]
+            command += [f"--author={name} <" for name in sorted(author.names)]
+        return command
+
+    def _filter(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        author: Optional[AuthorFilter],
+    ):
+        """Build a predicate on raw ``(name, email, timestamp)`` fields."""
+        start_ts = start_date.timestamp() if start_date else None
+        end_ts = end_date.timestamp() if end_date else None
+        email_bytes = {email.encode() for email in author.emails} if author else None
+        name_bytes = {name.encode() for name in author.names} if author else None
+
+        def accept(name: bytes, email: bytes, committed: int) -> bool:
+            if start_ts is not None and committed < start_ts:
+                return False
+            if end_ts is not None and committed > end_ts:
+                return False
+            return not (
+                author
+                and email.lower() not in email_bytes
+                and name.lower() not in name_bytes
+            )
+
+        return accept
+
+    def iter_commits(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        author: Optional[AuthorFilter] = None,
+        tips: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Iterator[GitCommit]:
+        if tips is not None and not tips:
+            return
+        if self.workers > 1:
+            yield from self._iter_sharded(start_date, end_date, author, tips, exclude)
+            return
+
+        accept = self._filter(start_date, end_date, author)
+        command = self._log_command(start_date, end_date, author, tips, exclude)
+        progress = self.progress
+        for record in run_log(command, self.repo_path, _revisions(tips, exclude)):
+            sha, name, email, timestamp, message, numstat = record.split(b"\0", 5)
+
+            # Filter on raw bytes before decoding anything else
+            committed = int(timestamp)
+            progress.scanned += 1
+            progress.cursor = committed
+            if not accept(name, email, committed):
+                continue
+            yield make_commit(
+                sha,
+                name,
+                email,
+                committed,
+                message,
+                parse_numstat(numstat),
+                self.repository,
+            )
+
+    def _iter_sharded(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        author: Optional[AuthorFilter],
+        tips: Optional[list[str]],
+        exclude: Optional[list[str]],
+    ) -> Iterator[GitCommit]:
+        """Compute stats of the matching commits in a process pool.
+
+        Yields:
+            Commits newest first (by commit date)
+        """
+        accept = self._filter(start_date, end_date, author)
+        command = self._log_command(
+            start_date, end_date, author, tips, exclude, stats=False
+        )
+        progress = self.progress
+        shas = []
+        for record in run_log(command, self.repo_path, _revisions(tips, exclude)):
+            sha, name, email, timestamp = record.rstrip(b"\n").split(b"\0", 3)
+            committed = int(timestamp)
+            progress.scanned += 1
+            progress.cursor = committed
+            if accept(name, email, committed):
+                shas.append(sha.decode())
+        # The stats phase is measured by the commits kept out of this total
+        progress.total = len(shas)
+
+        size = shard_size(len(shas), self.workers)
+        shards = [shas[i : i + size] for i in range(0, len(shas), size)]
+        if len(shards) <= 1:
+            # Not worth starting processes
+            for shard in shards:
+                yield from _shard_commits(
+                    read_shard(self.repo_path, shard), self.repository
+                )
+            return
+
+        # Shards are submitted a few at a time and collected in order, so
+        # results of fast shards do not pile up behind a slow one
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(shards)), mp_context=_pool_context()
+        ) as pool:
+            pending: deque = deque()
+            remaining = iter(shards)
+            for shard in itertools.islice(remaining, self.workers * 2):
+                pending.append(pool.submit(read_shard, self.repo_path, shard))
+            while pending:
+                records = pending.popleft().result()
+                for shard in itertools.islice(remaining, 1):
+                    pending.append(pool.submit(read_shard, self.repo_path, shard))
+                yield from _shard_commits(records, self.repository)
+
+
+def _revisions(
+    tips: Optional[list[str]], exclude: Optional[list[str]]
+) -> Optional[list[str]]:
+    """Get the revisions fed to ``git log --stdin``, if any."""
+    revisions = list(tips or []) + [f"^{sha}" for sha in exclude or []]
+    return revisions or None
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """Get the start method of shard workers.
+
+    Workers are never forked from this process, which may be running other
+    threads (progress display, REST requests) whose held locks a fork would
+    copy. A fork server is a separate single-threaded process that imports
+    this module once and forks workers from itself; where it is not available
+    (Windows), every worker is spawned as a fresh interpreter.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def shard_size(commits: int, workers: int) -> int:
+    """Choose the number of commits per shard.
+
+    Ranges below ``SHARD_MIN_COMMITS`` stay in one shard. Larger ones are cut
+    into about four shards per worker for load balancing, within
+    ``MIN_SHARD_SIZE`` and ``MAX_SHARD_SIZE``.
+
+    Args:
+        commits: Commits in the range
+        workers: Worker processes
+
+    Returns:
+        Shard size (at least 1)
+    """
+    if commits < SHARD_MIN_COMMITS or workers <= 1:
+        return max(1, commits)
+    size = -(-commits // (workers * 4))
+    return max(MIN_SHARD_SIZE, min(MAX_SHARD_SIZE, size))
@@ -0,0 +1,88 @@
+"""GitPython-based backend."""
+
+from datetime import datetime
+from typing import Iterator, Optional
+
+from git import Repo
+from git.exc import GitCommandError
+
+from ..identity import AuthorFilter
+from ..models import MAX_COMMIT_PATHS, GitCommit
+from .base import GitBackend
+
+
+class GitPythonBackend(GitBackend):
+    """Walks history through GitPython's ``Repo.iter_commits``.
+
+    Commit attributes are parsed lazily and stats are computed with one git
+    call per commit, which makes this backend simple but slow on large
+    histories.
+    """
+
+    def __init__(self, repo_path, repository: str, repo: Optional[Repo] = None):
+        """Initialize the backend.
+
+        Args:
+            repo_path: Path to the local repository
+            repository: Repository name recorded on each commit
+            repo: Already opened GitPython repository (opened if None)
+        """
+        super().__init__(repo_path, repository)
+        self.repo = repo or Repo(repo_path)
+
+    def iter_commits(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        author: Optional[AuthorFilter] = None,
+        tips: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Iterator[GitCommit]:
+        excluded = [f"^{sha}" for sha in exclude or []]
+        if tips is None:
+            # Get all commits from all branches
+            commits = self.repo.iter_commits(excluded or None, all=True)
+        elif tips:
+            commits = self.repo.iter_commits(tips + excluded)
+        else:
+            return
+
+        progress = self.progress
+        for commit in commits:
+            progress.scanned += 1
+            progress.cursor = commit.committed_date
+            commit_date = datetime.fromtimestamp(commit.committed_date)
+
+            # Filter by date range
+            if start_date and commit_date < start_date:
+                continue
+            if end_date and commit_date > end_date:
+                continue
+
+            # Filter by author email or name
+            if author and not author.matches(commit.author.name, commit.author.email):
+                continue
+
+            # Get stats
+            try:
+                stats = commit.stats
+                files_changed = stats.total.get("files", 0)
+                insertions = stats.total.get("insertions", 0)
+                deletions = stats.total.get("deletions", 0)
+                paths = [str(path) for path in stats.files][:MAX_COMMIT_PATHS]
+            except (AttributeError, GitCommandError):
+                files_changed = insertions = deletions = 0
+                paths = []
+
+            yield GitCommit(
+                sha=commit.hexsha,
+                author=commit.author.name,
+                email=commit.author.email,
+                date=commit_date,
+                message=commit.message.strip(),
+                repository=self.repository,
+                files_changed=files_changed,
+                insertions=insertions,
+                deletions=deletions,
+                paths=paths,
+            )
@@ -0,0 +1,469 @@
+"""Clone-free backend that reads commits through GitHub and GitLab REST APIs."""
+
+import fnmatch
+import hashlib
+import json
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..config.paths import get_cache_dir
+from ..identity import AuthorFilter
+from ..models import MAX_COMMIT_PATHS, GitCommit
+from .base import GitBackend
+
+PER_PAGE = 100
+# Retries of a rate-limited request, and the longest wait before one
+RATE_LIMIT_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 300.0
+_LAST_PAGE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+_NEXT_PAGE = re.compile(r'<([^>]*)>;\s*rel="next"')
+_SSH_URL = re.compile(r"^(?:ssh://)?[^@/]+@(?P<host>[^:/]+)[:/](?P<path>.+)$")
+
+
+def parse_remote_url(url: str) -> tuple[str, str]:
+    """Split a repository URL into host and project path.
+
+    Args:
+        url: HTTPS or SSH repository URL
+
+    Returns:
+        Tuple of (host, path), e.g. ``("github.com", "owner/repo")``
+
+    Raises:
+        ValueError: If the URL has no project path
+    """
+    match = _SSH_URL.match(url)
+    if match and "://" not in url.split("@", 1)[0]:
+        host, path = match["host"], match["path"]
+    else:
+        parsed = urllib.parse.urlparse(url)
+        host, path = parsed.hostname or "", parsed.path
+    path = path.strip("/").removesuffix(".git")
+    if not host or "/" not in path:
+        raise ValueError(f"Not a repository URL: {url}")
+    return host, path
+
+
+def resolve_api(url: str, api_url: Optional[str] = None) -> tuple[str, bool]:
+    """Find the REST API serving a repository.
+
+    Args:
+        url: Repository URL
+        api_url: Explicit API base URL; URLs ending in ``/api/v4`` are
+            treated as GitLab, others as GitHub
+
+    Returns:
+        Tuple of (API base URL, whether it is a GitLab API)
+
+    Raises:
+        ValueError: If the URL is not a repository URL or the API of its host
+            cannot be derived
+    """
+    host, _ = parse_remote_url(url)
+    if api_url:
+        api_url = api_url.rstrip("/")
+        return api_url, api_url.endswith("/api/v4")
+    if host == "github.com":
+        return "https://api.github.com", False
+    if "gitlab" in host:
+        return f"https://{host}/api/v4", True
+    raise ValueError(f"Cannot derive the REST API of {host}; set api_url")
+
+
+def _parse_date(value: str) -> datetime:
+    # Naive local time, like the dates of the local backends
+    return (
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        .astimezone()
+        .replace(tzinfo=None)
+    )
+
+
+def _format_date(value: datetime) -> str:
+    # Naive datetimes are local time
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def rate_limit_delay(error: urllib.error.HTTPError) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited request.
+
+    GitHub answers ``403`` or ``429`` with ``Retry-After`` (secondary limits)
+    or with ``X-RateLimit-Remaining: 0`` and the reset time in
+    ``X-RateLimit-Reset``; GitLab answers ``429`` with ``Retry-After`` and
+    ``RateLimit-Reset``.
+
+    Args:
+        error: Failed request
+
+    Returns:
+        Delay in seconds, or None if the error is not a rate limit
+    """
+    if error.code not in (403, 429):
+        return None
+    headers = error.headers
+    retry_after = headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(
+                0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()
+            )
+        except (TypeError, ValueError):
+            pass
+    # A 403 is only a rate limit when the quota is used up
+    exhausted = error.code == 429 or headers.get("X-RateLimit-Remaining") == "0"
+    reset = headers.get("X-RateLimit-Reset") or headers.get("RateLimit-Reset")
+    if exhausted and reset is not None:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return 1.0 if error.code == 429 else None
+
+
+class HTTPCache:
+    """On-disk cache of API responses for conditional requests.
+
+    Responses are stored with their ETag and revalidated with
+    ``If-None-Match``; a ``304 Not Modified`` reuses the stored body and does
+    not count against GitHub's rate limit. Responses for a single commit never
+    change and are reused without a request. Responses are kept apart per
+    access token, so what one token may read is never served to another.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: ``rest`` in the cache directory)
+        """
+        self.directory = directory or get_cache_dir("rest")
+
+    def _path(self, url: str, token: Optional[str]) -> Path:
+        # The token itself is never written, only a fingerprint of it
+        fingerprint = hashlib.sha256(token.encode()).hexdigest() if token else ""
+        digest = hashlib.sha256(f"{fingerprint}\n{url}".encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str, token: Optional[str] = None) -> Optional[dict]:
+        """Get a stored response (``etag``, ``link`` and ``body``) or None."""
+        try:
+            with open(self._path(url, token), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        link: Optional[str],
+        body,
+        token: Optional[str] = None,
+    ) -> None:
+        """Store a response."""
+        path = self._path(url, token)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"etag": etag, "link": link, "body": body}, f)
+            tmp_path.replace(path)
+        except OSError:
+            # Caching is best effort
+            pass
+
+
+class RestBackend(GitBackend):
+    """Reads commit history of a hosted repository without cloning it.
+
+    Commits are listed through the paginated commits endpoint of GitHub or
+    GitLab, with the date range and a single author email passed as query
+    parameters. Once the first page reveals the page count, the remaining
+    pages and the per-commit stats are fetched concurrently. GitHub lists the
+    default branch (or the branches matching ``refs``); GitLab lists all
+    branches unless ``refs`` is set. Rate-limited requests are retried after
+    the delay the server asks for.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        repository: str,
+        api_url: Optional[str] = None,
+        token: Optional[str] = None,
+        refs: Iterable[str] = (),
+        max_workers: int = 8,
+        cache: Optional[HTTPCache] = None,
+        timeout: float = 30.0,
+    ):
+        """Initialize the backend.
+
+        Args:
+            url: Repository URL (HTTPS or SSH)
+            repository: Repository name recorded on each commit
+            api_url: API base URL (derived from the host if None, see
+                :func:`resolve_api`)
+            token: Access token (anonymous if None)
+            refs: Branch name patterns to list (default branch or all if empty)
+            max_workers: Concurrent API requests
+            cache: Response cache (creates one if None)
+            timeout: Timeout in seconds of a single API request
+        """
+        super().__init__(None, repository)
+        _, self.project = parse_remote_url(url)
+        self.api_url, self.gitlab = resolve_api(url, api_url)
+        self.token = token
+        self.refs = list(refs)
+        self.max_workers = max_workers
+        self.cache = cache or HTTPCache()
+        self.timeout = timeout
+
+    # -- HTTP ---------------------------------------------------------------
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"User-Agent": "git-reporter"}
+        if self.gitlab:
+            if self.token:
+                headers["PRIVATE-TOKEN"] = self.token
+        else:
+            headers["Accept"] = "application/vnd.github+json"
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _get(self, url: str, immutable: bool = False) -> tuple[object, Optional[str]]:
+        """Fetch a JSON resource, revalidating a cached copy by ETag.
+
+        Args:
+            url: Resource URL
+            immutable: Reuse a cached copy without asking the server
+
+        Returns:
+            Tuple of (decoded body, Link header)
+
+        Raises:
+            RuntimeError: If the request fails, or stays rate-limited
+        """
+        cached = self.cache.get(url, self.token)
+        if cached is not None and immutable:
+            return cached["body"], cached.get("link")
+
+        headers = self._headers()
+        if cached is not None and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        request = urllib.request.Request(url, headers=headers)
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    data = response.read()
+                    # Updated from worker threads; a lost update only skews the display
+                    self.progress.received_bytes += len(data)
+                    body = json.loads(data)
+                    link = response.headers.get("Link")
+                    self.cache.put(
+                        url, response.headers.get("ETag"), link, body, self.token
+                    )
+                    return body, link
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and cached is not None:
+                    return cached["body"], cached.get("link")
+                delay = rate_limit_delay(e)
+                if delay is None:
+                    raise RuntimeError(
+                        f"API request failed for {self.repository} ({e.code}): {url}"
+                    ) from e
+                if attempt == RATE_LIMIT_RETRIES or delay > MAX_RATE_LIMIT_WAIT:
+                    raise RuntimeError(
+                        f"API rate limit exceeded for {self.repository} "
+                        f"(retry in {delay:.0f}s): {url}"
+                    ) from e
+                time.sleep(delay)
+            except urllib.error.URLError as e:
+                raise RuntimeError(
+                    f"API request failed for {self.repository}: {e.reason}"
+                ) from e
+
+    def _get_pages(self, url: str, executor: ThreadPoolExecutor) -> Iterator[list]:
+        """Yield the pages of a paginated list in order.
+
+        Pages after the first are fetched concurrently when the ``Link``
+        header names the last page, and one after another otherwise.
+        """
+        body, link = self._get(url)
+        yield body
+        if not link:
+            return
+
+        last = _LAST_PAGE.search(link)
+        if last:
+            separator = "&" if "?" in url else "?"
+            urls = [
+                f"{url}{separator}page={page}" for page in range(2, int(last[1]) + 1)
+            ]
+            for page, _ in executor.map(self._get, urls):
+                yield page
+            return
+
+        next_page = _NEXT_PAGE.search(link)
+        while next_page:
+            body, link = self._get(next_page[1])
+            yield body
+            next_page = _NEXT_PAGE.search(link or "")
+
+    # -- Commits ------------------------------------------------------------
+
+    def _project_url(self) -> str:
+        if self.gitlab:
+            return (
+                f"{self.api_url}/projects/{urllib.parse.quote(self.project, safe='')}"
+            )
+        return f"{self.api_url}/repos/{self.project}"
+
+    def _branches(self, executor: ThreadPoolExecutor) -> list[Optional[str]]:
+        """Branches to list; None stands for the API's default."""
+        if not self.refs:
+            return [None]
+        path = "/repository/branches" if self.gitlab else "/branches"
+        names = [
+            branch["name"]
+            for page in self._get_pages(
+                f"{self._project_url()}{path}?per_page={PER_PAGE}", executor
+            )
+            for branch in page
+        ]
+        return [
+            name
+            for name in names
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.refs)
+        ]
+
+    def _commits_url(
+        self,
+        branch: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        author_email: Optional[str],
+    ) -> str:
+        params = {"per_page": PER_PAGE}
+        if start_date:
+            params["since"] = _format_date(start_date)
+        # A period ending now would change the URL (and lose its ETag) on
+        # every run; such periods are cut locally instead
+        if end_date and end_date < datetime.now() - timedelta(hours=1):
+            params["until"] = _format_date(end_date)
+        if author_email:
+            params["author"] = author_email
+        if self.gitlab:
+            params["with_stats"] = "true"
+            if branch:
+                params["ref_name"] = branch
+            else:
+                params["all"] = "true"
+            path = "/repository/commits"
+        else:
+            if branch:
+                params["sha"] = branch
+            path = "/commits"
+        return f"{self._project_url()}{path}?{urllib.parse.urlencode(params)}"
+
+    def _github_commit(self, sha: str) -> GitCommit:
+        # The list endpoint has no stats; a commit's details never change
+        data, link = self._get(f"{self._project_url()}/commits/{sha}", immutable=True)
+        files = data.get("files") or []
+        # Files come in pages of 300; only huge commits have more than one
+        next_page = _NEXT_PAGE.search(link or "")
+        while next_page:
+            page, link = self._get(next_page[1], immutable=True)
+            files += page.get("files") or []
+            next_page = _NEXT_PAGE.search(link or "")
+        stats = data.get("stats") or {}
+        commit = data["commit"]
+        return GitCommit(
+            sha=data["sha"],
+            author=commit["author"]["name"],
+            email=commit["author"]["email"],
+            date=_parse_date(commit["committer"]["date"]),
+            message=commit["message"].strip(),
+            repository=self.repository,
+            files_changed=len(files),
+            insertions=stats.get("additions", 0),
+            deletions=stats.get("deletions", 0),
+            paths=[f["filename"] for f in files[:MAX_COMMIT_PATHS]],
+        )
+
+    def _gitlab_commit(self, data: dict) -> GitCommit:
+        # Line counts come with the listing; changed files would take one or
+        # more diff requests per commit, so they are left unknown
+        stats = data.get("stats") or {}
+        return GitCommit(
+            sha=data["id"],
+            author=data["author_name"],
+            email=data["author_email"],
+            date=_parse_date(data["committed_date"]),
+            message=data["message"].strip(),
+            repository=self.repository,
+            insertions=stats.get("additions", 0),
+            deletions=stats.get("deletions", 0),
+        )
+
+    def iter_commits(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        author: Optional[AuthorFilter] = None,
+        tips: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Iterator[GitCommit]:
+        # Only a single email can be passed to the API; larger filters are
+        # applied to the listed commits
+        author_email = None
+        if author and len(author.emails) == 1 and not author.names:
+            author_email = next(iter(author.emails))
+
+        seen: set[str] = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for branch in self._branches(executor):
+                url = self._commits_url(branch, start_date, end_date, author_email)
+                for page in self._get_pages(url, executor):
+                    entries = []
+                    for entry in page:
+                        self.progress.scanned += 1
+                        sha = entry["sha"] if not self.gitlab else entry["id"]
+                        if sha in seen:
+                            continue
+                        seen.add(sha)
+                        if self.gitlab:
+                            name, email = entry["author_name"], entry["author_email"]
+                        else:
+                            name = entry["commit"]["author"]["name"]
+                            email = entry["commit"]["author"]["email"]
+                        if author and not author.matches(name, email):
+                            continue
+                        entries.append(entry)
+
+                    if self.gitlab:
+                        commits = map(self._gitlab_commit, entries)
+                    else:
+                        commits = executor.map(
+                            self._github_commit, [e["sha"] for e in entries]
+                        )
+                    for commit in commits:
+                        # Dates are also checked here, as "until" may be omitted
+                        if start_date and commit.date < start_date:
+                            continue
+                        if end_date and commit.date > end_date:
+                            continue
+                        self.progress.cursor = commit.date.timestamp()
+                        yield commit
@@ -0,0 +1,255 @@
+"""Portable snapshots of the on-disk state, for runners that start empty.
+
+An archive is a gzip-compressed tar file. Its first member, ``manifest.json``,
+records the archive format and version, the size and SHA-256 digest of every
+other member, and the remote URL and HEAD of every mirror. Mirrors are stored
+as git bundles rather than copied object by object, so the archive holds one
+pack per repository and the imported mirror only fetches what is newer.
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Optional
+
+from . import __version__
+from .config.paths import get_state_dir
+from .mirrors import bundle_mirror, list_mirrors, restore_mirror
+
+ARCHIVE_FORMAT = "git-reporter-cache"
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+_CHUNK_SIZE = 1024 * 1024
+_STAGING_PREFIX = ".import-"
+
+
+def _digest(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _state_files(state_dir: Path, mirrors_dir: Path) -> list[tuple[Path, str]]:
+    """List the state files to archive, skipping mirrors and partial writes."""
+    files = []
+    for root, dirs, names in os.walk(state_dir):
+        root_path = Path(root)
+        dirs[:] = sorted(
+            d
+            for d in dirs
+            if root_path / d != mirrors_dir and not d.startswith(_STAGING_PREFIX)
+        )
+        for name in sorted(names):
+            if name.endswith(".tmp"):
+                continue
+            path = root_path / name
+            files.append((path, path.relative_to(state_dir).as_posix()))
+    return files
+
+
+def export_cache(
+    archive_path: Path,
+    include_mirrors: bool = True,
+    state_dir: Optional[Path] = None,
+) -> dict[str, int]:
+    """Pack the state directory into an archive.
+
+    Args:
+        archive_path: Archive file to write
+        include_mirrors: Bundle the mirrors of remote repositories
+        state_dir: State directory (default: see :func:`get_state_dir`)
+
+    Returns:
+        Counts of archived ``files`` and ``mirrors`` and the archive ``bytes``
+    """
+    state_dir = state_dir or get_state_dir()
+    mirrors_dir = state_dir / "cache" / "mirrors"
+
+    with tempfile.TemporaryDirectory(prefix="git-reporter-export-") as tmp:
+        members = [
+            (path, f"state/{name}")
+            for path, name in _state_files(state_dir, mirrors_dir)
+        ]
+        mirrors = []
+        if include_mirrors:
+            for mirror, url in list_mirrors(mirrors_dir):
+                bundle_path = Path(tmp) / f"{mirror.stem}.bundle"
+                try:
+                    head = bundle_mirror(mirror, bundle_path)
+                except RuntimeError as e:
+                    print(
+                        f"Warning: Skipping mirror of {url}: {e}",
+                        file=sys.stderr,
+                    )
+                    continue
+                if not bundle_path.exists():
+                    continue
+                name = f"mirrors/{bundle_path.name}"
+                members.append((bundle_path, name))
+                mirrors.append({"url": url, "head": head, "bundle": name})
+
+        manifest = {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "created_by": __version__,
+            "files": {
+                name: {"size": path.stat().st_size, "sha256": _digest(path)}
+                for path, name in members
+            },
+            "mirrors": mirrors,
+        }
+
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+        with tarfile.open(tmp_path, "w:gz") as archive:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(data)
+            info.mtime = int(datetime.now().timestamp())
+            archive.addfile(info, io.BytesIO(data))
+            for path, name in members:
+                archive.add(path, arcname=name, recursive=False)
+        os.replace(tmp_path, archive_path)
+
+    return {
+        "files": len(members) - len(mirrors),
+        "mirrors": len(mirrors),
+        "bytes": archive_path.stat().st_size,
+    }
+
+
+def _read_manifest(archive: tarfile.TarFile) -> dict:
+    """Read and validate the manifest, which must be the first member."""
+    member = archive.next()
+    if member is None or member.name != MANIFEST_NAME or not member.isfile():
+        raise ValueError("Not a git-reporter cache archive (no manifest)")
+    try:
+        manifest = json.load(archive.extractfile(member))
+    except ValueError as e:
+        raise ValueError(f"Corrupt cache archive manifest: {e}") from e
+    if manifest.get("format") != ARCHIVE_FORMAT:
+        raise ValueError("Not a git-reporter cache archive")
+    if manifest.get("version", 0) > ARCHIVE_VERSION:
+        raise ValueError(
+            f"Cache archive version {manifest['version']} is newer than the "
+            f"supported version {ARCHIVE_VERSION}; upgrade git-reporter"
+        )
+    return manifest
+
+
+def _safe_name(name: str) -> bool:
+    path = PurePosixPath(name)
+    return (
+        not path.is_absolute()
+        and ".." not in path.parts
+        and path.parts[:1] in (("state",), ("mirrors",))
+    )
+
+
+def import_cache(
+    archive_path: Path, state_dir: Optional[Path] = None
+) -> dict[str, int]:
+    """Unpack an archive written by :func:`export_cache`.
+
+    Every member is checked against the size and digest in the manifest
+    before anything is installed, so a truncated or corrupted archive leaves
+    the state directory untouched. State files replace existing files of the
+    same name; mirrors that already exist are kept, as they may be newer.
+
+    Args:
+        archive_path: Archive file to read
+        state_dir: State directory (default: see :func:`get_state_dir`)
+
+    Returns:
+        Counts of restored ``files``, restored ``mirrors`` and ``skipped``
+        mirrors that already existed
+
+    Raises:
+        ValueError: If the archive is not a valid, intact cache archive
+    """
+    state_dir = state_dir or get_state_dir()
+    state_dir.mkdir(parents=True, exist_ok=True)
+    mirrors_dir = state_dir / "cache" / "mirrors"
+
+    staging = Path(tempfile.mkdtemp(prefix=_STAGING_PREFIX, dir=state_dir))
+    try:
+        try:
+            with tarfile.open(archive_path, "r:*") as archive:
+                manifest = _read_manifest(archive)
+                expected = manifest.get("files", {})
+                seen = set()
+                for member in archive:
+                    if member.name == MANIFEST_NAME:
+                        continue
+                    if member.name not in expected or not _safe_name(member.name):
+                        raise ValueError(f"Unexpected archive member: {member.name}")
+                    if not member.isfile() or member.name in seen:
+                        raise ValueError(f"Invalid archive member: {member.name}")
+                    seen.add(member.name)
+
+                    target = staging / member.name
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    sha256 = hashlib.sha256()
+                    size = 0
+                    source = archive.extractfile(member)
+                    with open(target, "wb") as f:
+                        read = functools.partial(source.read, _CHUNK_SIZE)
+                        for chunk in iter(read, b""):
+                            sha256.update(chunk)
+                            size += len(chunk)
+                            f.write(chunk)
+                    entry = expected[member.name]
+                    if size != entry["size"] or sha256.hexdigest() != entry["sha256"]:
+                        raise ValueError(f"Checksum mismatch for {member.name}")
+        except (tarfile.TarError, EOFError, OSError) as e:
+            raise ValueError(f"Cannot read cache archive {archive_path}: {e}") from e
+
+        missing = set(expected) - seen
+        if missing:
+            raise ValueError(
+                f"Cache archive is incomplete: {len(missing)} member(s) missing"
+            )
+
+        restored = skipped = 0
+        mirrors_dir.mkdir(parents=True, exist_ok=True)
+        for mirror in manifest.get("mirrors", []):
+            if mirror.get("bundle") not in seen:
+                raise ValueError(f"Missing bundle for mirror of {mirror.get('url')}")
+            try:
+                created = restore_mirror(
+                    staging / mirror["bundle"],
+                    mirror["url"],
+                    mirror.get("head"),
+                    mirrors_dir,
+                )
+            except RuntimeError as e:
+                raise ValueError(
+                    f"Invalid bundle for mirror of {mirror['url']}: {e}"
+                ) from e
+            restored += created
+            skipped += not created
+
+        files = 0
+        staged_state = staging / "state"
+        for name in expected:
+            if not name.startswith("state/"):
+                continue
+            target = state_dir / name[len("state/") :]
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_state / name[len("state/") :], target)
+            files += 1
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return {"files": files, "mirrors": restored, "skipped": skipped}
@@ -0,0 +1,352 @@
+"""Checkpoints that let an interrupted report run resume where it failed."""
+
+import hashlib
+import json
+import os
+import shutil
+from contextlib import ExitStack
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config.paths import get_state_dir
+from .models import (
+    GitCommit,
+    IdentityConfig,
+    ReportPeriod,
+    ReportRequest,
+    RepositoryConfig,
+    TokenUsage,
+)
+from .watermarks import Watermark
+
+# Runs not touched for this long are deleted
+RUN_MAX_AGE = timedelta(days=7)
+
+
+def get_runs_dir() -> Path:
+    """Get the directory holding the run directories."""
+    return get_state_dir() / "runs"
+
+
+def prune_runs(
+    runs_dir: Optional[Path] = None, max_age: timedelta = RUN_MAX_AGE
+) -> None:
+    """Delete run directories that were not modified recently.
+
+    Args:
+        runs_dir: Directory holding all runs (default: ``runs`` in the state directory)
+        max_age: Age after which a run is deleted
+    """
+    runs_dir = runs_dir or get_runs_dir()
+    cutoff = (datetime.now() - max_age).timestamp()
+    try:
+        entries = list(os.scandir(runs_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def run_key(
+    request: ReportRequest,
+    repos: list[RepositoryConfig],
+    identities: Iterable[IdentityConfig] = (),
+) -> str:
+    """Derive the key of a report run.
+
+    Runs of the same request against the same repositories share a key.
+    Relative periods (weekly, monthly...) also include today's date, so a
+    rerun on the same day resumes while tomorrow's run starts fresh.
+
+    Args:
+        request: Report request
+        repos: Repositories the request covers
+        identities: Configured identities the author filters may refer to
+
+    Returns:
+        Hex key
+    """
+    identity = {
+        "period": request.period.value,
+        "start_date": request.start_date.isoformat() if request.start_date else None,
+        "end_date": request.end_date.isoformat() if request.end_date else None,
+        "day": None
+        if request.period == ReportPeriod.CUSTOM
+        else date.today().isoformat(),
+        "identities": [identity.model_dump() for identity in identities],
+        "repositories": sorted(
+            [
+                repo.name,
+                repo.get_repo_location(),
+                repo.author_email,
+                sorted(repo.author_emails),
+                repo.author,
+                repo.refs,
+                repo.exclude_refs,
+                repo.backend.value if repo.backend else None,
+            ]
+            for repo in repos
+        ),
+    }
+    encoded = json.dumps(identity, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:24]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class RunCheckpoint:
+    """Completed phases of one report run, stored in a run directory.
+
+    The run directory holds ``run.json`` with the resolved date range, one
+    NDJSON file per repository whose walk completed (with ``watermarks.json``
+    for ``since_last`` runs) and ``summary.json`` once the summary was
+    generated. Every file is written under a temporary name
+    and renamed when complete, so an interrupted phase is simply redone.
+
+    A deferred checkpoint writes nothing while the run goes well: it only
+    remembers which repositories were walked and holds the small files in
+    memory, and :meth:`flush` writes everything once the run fails.
+    """
+
+    def __init__(self, run_dir: Path, deferred: bool = False):
+        """Initialize the checkpoint.
+
+        Args:
+            run_dir: Directory of this run (created on first write)
+            deferred: Only write the checkpoint when :meth:`flush` is called
+        """
+        self.run_dir = run_dir
+        self.deferred = deferred
+        # Files held back by a deferred checkpoint, by name
+        self._pending: dict[str, dict] = {}
+        # Repositories whose walk completed, not yet written
+        self._walked: list[str] = []
+
+    @classmethod
+    def for_request(
+        cls,
+        request: ReportRequest,
+        repos: list[RepositoryConfig],
+        identities: Iterable[IdentityConfig] = (),
+        runs_dir: Optional[Path] = None,
+        deferred: bool = False,
+    ) -> "RunCheckpoint":
+        """Get the checkpoint of a request.
+
+        Args:
+            request: Report request
+            repos: Repositories the request covers
+            identities: Configured identities the author filters may refer to
+            runs_dir: Directory holding all runs (default: ``runs`` in the state directory)
+            deferred: Only write the checkpoint when :meth:`flush` is called
+
+        Returns:
+            Checkpoint for the run
+        """
+        return cls(
+            (runs_dir or get_runs_dir()) / run_key(request, repos, identities),
+            deferred=deferred,
+        )
+
+    def _repo_path(self, name: str) -> Path:
+        # Repository names may contain path separators (workspace repos)
+        digest = hashlib.sha256(name.encode()).hexdigest()[:16]
+        return self.run_dir / "repos" / f"{digest}.ndjson"
+
+    def _save(self, name: str, data: dict) -> None:
+        if self.deferred:
+            self._pending[name] = data
+            return
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(self.run_dir / name, data)
+
+    def reset(self) -> None:
+        """Discard everything recorded for this run."""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        self._pending.clear()
+        self._walked.clear()
+
+    def flush(self, commits: Iterable[GitCommit]) -> None:
+        """Write a deferred checkpoint, after the run failed.
+
+        Later phases are then written directly. Does nothing if the
+        checkpoint is not deferred.
+
+        Args:
+            commits: Commits collected so far; those of the repositories whose
+                walk completed are written
+        """
+        if not self.deferred:
+            return
+        self.deferred = False
+        for name, data in self._pending.items():
+            self._save(name, data)
+        self._pending.clear()
+        if not self._walked:
+            return
+
+        paths = {name: self._repo_path(name) for name in self._walked}
+        (self.run_dir / "repos").mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            files = {
+                name: stack.enter_context(
+                    open(path.with_suffix(".tmp"), "w", encoding="utf-8")
+                )
+                for name, path in paths.items()
+            }
+            for commit in commits:
+                f = files.get(commit.repository)
+                if f is not None:
+                    f.write(commit.model_dump_json())
+                    f.write("\n")
+        for path in paths.values():
+            os.replace(path.with_suffix(".tmp"), path)
+        self._walked.clear()
+
+    def load_date_range(self) -> Optional[tuple[datetime, datetime]]:
+        """Get the date range recorded by an earlier attempt.
+
+        Returns:
+            Tuple of (start_date, end_date), or None if not recorded
+        """
+        try:
+            with open(self.run_dir / "run.json", encoding="utf-8") as f:
+                data = json.load(f)
+            return (
+                datetime.fromisoformat(data["start_date"]),
+                datetime.fromisoformat(data["end_date"]),
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_date_range(self, start_date: datetime, end_date: datetime) -> None:
+        """Record the resolved date range of the run.
+
+        Args:
+            start_date: Start of the period
+            end_date: End of the period
+        """
+        self._save(
+            "run.json",
+            {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+        )
+
+    def has_repo(self, name: str) -> bool:
+        """Whether the commits of a repository were checkpointed."""
+        return self._repo_path(name).exists()
+
+    def read_repo(self, name: str) -> Iterator[GitCommit]:
+        """Stream the checkpointed commits of a repository.
+
+        Args:
+            name: Repository name
+
+        Yields:
+            Commits as collected by the earlier attempt
+        """
+        with open(self._repo_path(name), encoding="utf-8") as f:
+            for line in f:
+                yield GitCommit.model_validate_json(line)
+
+    def record_repo(
+        self, name: str, commits: Iterable[GitCommit]
+    ) -> Iterator[GitCommit]:
+        """Pass commits through while writing them to the checkpoint.
+
+        The checkpoint only becomes visible once the iterable is exhausted,
+        so a walk that fails halfway is not mistaken for a complete one. A
+        deferred checkpoint only notes that the walk completed.
+
+        Args:
+            name: Repository name
+            commits: Commits being collected
+
+        Yields:
+            The same commits
+        """
+        if self.deferred:
+            yield from commits
+            self._walked.append(name)
+            return
+
+        path = self._repo_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for commit in commits:
+                f.write(commit.model_dump_json())
+                f.write("\n")
+                yield commit
+        os.replace(tmp_path, path)
+
+    def load_watermarks(self) -> dict[str, Watermark]:
+        """Get the watermarks of the repositories walked by earlier attempts.
+
+        Returns:
+            Watermarks by repository name (empty if none were recorded)
+        """
+        try:
+            with open(self.run_dir / "watermarks.json", encoding="utf-8") as f:
+                data = json.load(f)
+            return {name: Watermark.from_dict(mark) for name, mark in data.items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def save_watermarks(self, watermarks: dict[str, Watermark]) -> None:
+        """Record the watermarks of the repositories walked so far.
+
+        Args:
+            watermarks: Watermarks by repository name
+        """
+        self._save(
+            "watermarks.json",
+            {name: mark.to_dict() for name, mark in watermarks.items()},
+        )
+
+    def load_summary(self, provider: str) -> Optional[tuple[str, Optional[TokenUsage]]]:
+        """Get the summary generated by an earlier attempt.
+
+        Args:
+            provider: Provider and model the summary must come from
+
+        Returns:
+            Tuple of (summary, token usage), or None if not recorded
+        """
+        try:
+            with open(self.run_dir / "summary.json", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("provider") != provider:
+            return None
+        usage = data.get("usage")
+        return data["summary"], TokenUsage(**usage) if usage else None
+
+    def save_summary(
+        self, provider: str, summary: str, usage: Optional[TokenUsage]
+    ) -> None:
+        """Record the generated summary.
+
+        Args:
+            provider: Provider and model that generated the summary
+            summary: Summary text
+            usage: Token usage of the summary
+        """
+        self._save(
+            "summary.json",
+            {
+                "provider": provider,
+                "summary": summary,
+                "usage": usage.model_dump() if usage else None,
+            },
+        )
@@ -8,14 +8,27 @@ from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.table import Table
 
-from .config import ConfigManager
-from .models import AIProvider, ReportPeriod, ReportRequest, RepositoryConfig
+from .analytics import GROUP_BY_OPTIONS, WEEKDAYS, CommitTable, export_columns
+from .cache_archive import export_cache, import_cache
+from .config import ConfigManager, RepositoryDiscovery
+from .ledger import GROUP_BY_OPTIONS as USAGE_GROUP_BY_OPTIONS
+from .ledger import UsageLedger, summarize_usage
+from .models import (
+    AIProvider,
+    ReportPeriod,
+    ReportRequest,
+    RepositoryConfig,
+    WorkspaceConfig,
+)
+from .progress import ProgressTracker
 from .report_generator import ReportGenerator
+from .writers import WRITERS, detect_format, get_writer
 
 console = Console()
 
@@ -155,7 +168,7 @@ def list_repos(config: Optional[Path]):
         config_manager = ConfigManager(config)
         config_obj = config_manager.load()
 
-        if not config_obj.repos:
+        if not config_obj.repos and not config_obj.workspaces:
             console.print("[yellow]No repositories configured.[/yellow]")
             console.print("Run 'git-reporter add-repo' to add repositories.")
             return
@@ -164,12 +177,20 @@ def list_repos(config: Optional[Path]):
         table.add_column("Name", style="cyan")
         table.add_column("Type", style="magenta")
         table.add_column("Location", style="green")
-        table.add_column("Author Email", style="yellow")
-
-        for repo in config_obj.repos:
-            repo_type = "Local" if repo.path else "Remote"
+        table.add_column("Author", style="yellow")
+
+        configured = {r.name for r in config_obj.repos}
+        for repo in config_manager.resolve_repositories(config_obj):
+            if repo.name not in configured:
+                repo_type = "Workspace"
+            else:
+                repo_type = "Local" if repo.path else "Remote"
             location = repo.path if repo.path else repo.repo
-            table.add_row(repo.name, repo_type, location, repo.author_email or "")
+            authors = [repo.author] if repo.author else []
+            if repo.author_email:
+                authors.append(repo.author_email)
+            authors += repo.author_emails
+            table.add_row(repo.name, repo_type, location, ", ".join(authors))
 
         console.print(table)
 
@@ -181,6 +202,220 @@ def list_repos(config: Optional[Path]):
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(path_type=Path),
+    help="Path to configuration file",
+)
+@click.argument(
+    "roots",
+    nargs=-1,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option("--exclude", "-x", multiple=True, help="Directory name pattern to skip")
+@click.option(
+    "--max-depth",
+    type=int,
+    default=4,
+    show_default=True,
+    help="Maximum directory depth below each root",
+)
+@click.option("--email", "-e", help="Filter commits by author email (with --save)")
+@click.option(
+    "--save", is_flag=True, help="Add the roots to the configuration as workspaces"
+)
+def discover(
+    config: Optional[Path],
+    roots: tuple[Path],
+    exclude: tuple[str],
+    max_depth: int,
+    email: Optional[str],
+    save: bool,
+):
+    """Discover git repositories below workspace directories.
+
+    Scans ROOTS in parallel, skipping vendored and dependency trees. Without
+    ROOTS, the workspaces from the configuration are scanned. Reports rescan
+    saved workspaces once the last scan is older than workspace_rescan_interval,
+    so new checkouts are picked up automatically.
+    """
+    try:
+        config_manager = ConfigManager(config)
+        discovery = RepositoryDiscovery()
+
+        if roots:
+            found = discovery.discover(
+                list(roots), max_depth=max_depth, exclude=list(exclude)
+            )
+        else:
+            config_obj = config_manager.load()
+            if not config_obj.workspaces:
+                console.print("[yellow]No workspaces configured.[/yellow]")
+                console.print("Run 'git-reporter discover <dir> --save' to add one.")
+                return
+            configured = {r.name for r in config_obj.repos}
+            found = [
+                Path(r.path)
+                for r in config_manager.resolve_repositories(
+                    config_obj, discovery, rescan=True
+                )
+                if r.name not in configured
+            ]
+
+        table = Table(title=f"Discovered Repositories ({len(found)})")
+        table.add_column("Path", style="green")
+        for repo_path in found:
+            table.add_row(str(repo_path))
+        console.print(table)
+        console.print(
+            f"Scanned {discovery.scanned} directories, "
+            f"reused {discovery.reused} unchanged from the index."
+        )
+
+        if save and roots:
+            config_obj = config_manager.load()
+            existing = {
+                Path(w.root).expanduser().resolve() for w in config_obj.workspaces
+            }
+            added = 0
+            for root in roots:
+                if root.resolve() in existing:
+                    continue
+                added += 1
+                config_obj.workspaces.append(
+                    WorkspaceConfig(
+                        root=str(root.resolve()),
+                        author_email=email,
+                        exclude=list(exclude),
+                        max_depth=max_depth,
+                    )
+                )
+            config_manager.save(config_obj)
+            console.print(
+                f"[green]✓[/green] Saved {added} new workspace(s) to "
+                f"{config_manager.config_path}"
+            )
+
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        console.print("Run 'git-reporter init' first.")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+def _build_request(
+    period: str,
+    start: Optional[str],
+    end: Optional[str],
+    repo: tuple[str],
+    since_last: bool = False,
+) -> ReportRequest:
+    """Build a report request from command-line options, exiting on bad dates."""
+    if since_last:
+        period = ReportPeriod.SINCE_LAST.value
+    # Parse dates for custom period
+    start_date = None
+    end_date = None
+    if period == "custom":
+        if not start or not end:
+            console.print(
+                "[red]Error:[/red] Custom period requires --start and --end dates."
+            )
+            sys.exit(1)
+        try:
+            start_date = datetime.strptime(start, "%Y-%m-%d")
+            end_date = datetime.strptime(end, "%Y-%m-%d")
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] Invalid date format: {e}")
+            console.print("Use YYYY-MM-DD format.")
+            sys.exit(1)
+
+    # Create report request
+    return ReportRequest(
+        period=ReportPeriod(period),
+        start_date=start_date,
+        end_date=end_date,
+        repositories=list(repo) if repo else None,
+    )
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count with a binary unit."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    """Format a duration as m:ss (or h:mm:ss), or '-' if unknown."""
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+def _progress_view(tracker: ProgressTracker) -> Group:
+    """Render the live progress of a report run."""
+    table = Table(box=None, padding=(0, 2), header_style="bold")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Status")
+    table.add_column("Received", justify="right")
+    table.add_column("Scanned", justify="right")
+    table.add_column("Kept", justify="right")
+    table.add_column("Commits/s", justify="right")
+    table.add_column("ETA", justify="right")
+
+    for repo in list(tracker.repos):
+        status = repo.phase
+        if repo.phase == "walking":
+            fraction = repo.fraction()
+            if fraction is not None:
+                status += f" {fraction:.0%}"
+        elif repo.phase == "failed":
+            status = "[red]failed[/red]"
+        elif repo.phase in ("done", "restored"):
+            status = f"[green]{repo.phase}[/green]"
+        table.add_row(
+            repo.name,
+            status,
+            _format_bytes(repo.received_bytes) if repo.received_bytes else "-",
+            str(repo.scanned) if repo.started_at is not None else "-",
+            str(repo.kept) if repo.started_at is not None else "-",
+            f"{repo.rate:.0f}" if repo.started_at is not None else "-",
+            _format_duration(repo.eta()),
+        )
+
+    llm = tracker.llm
+    if llm.phase == "idle":
+        llm_status = "[dim]LLM: waiting for commits[/dim]"
+    else:
+        calls = llm.ledger.calls if llm.ledger else 0
+        tokens = llm.ledger.tokens if llm.ledger else 0
+        llm_status = (
+            f"LLM {llm.label}: {llm.phase}, {llm.queued} queued, "
+            f"{llm.in_flight} in flight, {calls} completed"
+        )
+        if llm.retries:
+            llm_status += f", {llm.retries} retried"
+        llm_status += f", {tokens} tokens, {_format_duration(llm.elapsed)}"
+
+    if tracker.phase == "Done":
+        heading = "[green]✓[/green] Done"
+    else:
+        heading = f"[cyan]{tracker.phase}...[/cyan]"
+    return Group(heading, table, llm_status)
+
+
 @main.command()
 @click.option(
     "--config",
@@ -201,11 +436,33 @@ def list_repos(config: Optional[Path]):
 @click.option(
     "--output", "-o", type=click.Path(path_type=Path), help="Output file path"
 )
+@click.option(
+    "--format",
+    "-f",
+    "output_format",
+    type=click.Choice(list(WRITERS)),
+    help="Output file format (default: detected from the file extension)",
+)
 @click.option(
     "--provider",
-    type=click.Choice(["openai", "gemini"]),
+    type=click.Choice([p.value for p in AIProvider]),
     help="AI provider to use (overrides config)",
 )
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Reuse the work completed by a failed run of the same report",
+)
+@click.option(
+    "--since-last",
+    is_flag=True,
+    help="Only report the commits added since the last --since-last report",
+)
+@click.option(
+    "--no-progress",
+    is_flag=True,
+    help="Do not show the live progress view (always off when not in a terminal)",
+)
 def generate(
     config: Optional[Path],
     period: str,
@@ -213,7 +470,11 @@ def generate(
     end: Optional[str],
     repo: tuple[str],
     output: Optional[Path],
+    output_format: Optional[str],
     provider: Optional[str],
+    resume: bool,
+    since_last: bool,
+    no_progress: bool,
 ):
     """Generate a report from git commit history."""
     try:
@@ -224,80 +485,319 @@ def generate(
         if provider:
             config_obj.ai_provider = AIProvider(provider)
 
-        # Parse dates for custom period
-        start_date = None
-        end_date = None
-        if period == "custom":
-            if not start or not end:
-                console.print(
-                    "[red]Error:[/red] Custom period requires --start and --end dates."
-                )
-                sys.exit(1)
-            try:
-                start_date = datetime.strptime(start, "%Y-%m-%d")
-                end_date = datetime.strptime(end, "%Y-%m-%d")
-            except ValueError as e:
-                console.print(f"[red]Error:[/red] Invalid date format: {e}")
-                console.print("Use YYYY-MM-DD format.")
-                sys.exit(1)
-
-        # Create report request
-        request = ReportRequest(
-            period=ReportPeriod(period),
-            start_date=start_date,
-            end_date=end_date,
-            repositories=list(repo) if repo else None,
-        )
+        request = _build_request(period, start, end, repo, since_last)
 
         # Generate report
-        console.print("[cyan]Analyzing commit history...[/cyan]")
-        generator = ReportGenerator(config_manager)
-
-        # Run async generate function
-        report = asyncio.run(generator.generate(request))
+        tracker = ProgressTracker()
+        generator = ReportGenerator(config_manager, config_obj, progress=tracker)
+        if console.is_terminal and not no_progress:
+            # Rendered from the tracker's counters by Live's refresh thread
+            with Live(
+                console=console,
+                refresh_per_second=4,
+                get_renderable=lambda: _progress_view(tracker),
+            ):
+                report = asyncio.run(generator.generate(request, resume=resume))
+        else:
+            console.print("[cyan]Analyzing commit history...[/cyan]")
+            report = asyncio.run(generator.generate(request, resume=resume))
 
         # Display report
-        console.print("\n")
-        console.print(
-            Panel(
-                f"[bold]{request.period.value.upper()} REPORT[/bold]\n"
-                f"Period: {report.start_date.strftime('%Y-%m-%d')} to {report.end_date.strftime('%Y-%m-%d')}\n"
-                f"Commits: {len(report.commits)}\n"
-                f"Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}",
-                style="bold cyan",
-            )
+        details = (
+            f"[bold]{request.period.value.upper()} REPORT[/bold]\n"
+            f"Period: {report.start_date.strftime('%Y-%m-%d')} to {report.end_date.strftime('%Y-%m-%d')}\n"
+            f"Commits: {report.total_commits}\n"
+            f"Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}"
         )
+        if report.usage:
+            details += (
+                f"\nTokens: {report.usage.input_tokens} in "
+                f"({report.usage.cache_read_tokens} cached), "
+                f"{report.usage.output_tokens} out"
+            )
+        if config_obj.hedge_provider is not None:
+            hedge = generator.hedge_metrics
+            details += (
+                f"\nHedged: {hedge.hedged}/{hedge.requests} requests, "
+                f"{hedge.secondary_wins} won by {config_obj.hedge_provider.value}"
+            )
+        console.print("\n")
+        console.print(Panel(details, style="bold cyan"))
 
         console.print("\n[bold]Summary:[/bold]\n")
         console.print(Markdown(report.summary))
 
         # Save to file if requested
         if output:
-            output_text = f"""# {request.period.value.upper()} Report
+            with open(output, "w", encoding="utf-8") as f:
+                get_writer(output_format or detect_format(output), f).write(report)
+            console.print(f"\n[green]✓[/green] Report saved to: {output}")
 
-Period: {report.start_date.strftime("%Y-%m-%d")} to {report.end_date.strftime("%Y-%m-%d")}
-Commits: {len(report.commits)}
-Generated: {report.generated_at.strftime("%Y-%m-%d %H:%M:%S")}
+    except FileNotFoundError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        traceback.print_exc()
+        sys.exit(1)
 
-## Summary
 
-{report.summary}
+@main.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(path_type=Path),
+    help="Path to configuration file",
+)
+@click.option(
+    "--period",
+    "-p",
+    type=click.Choice(["daily", "weekly", "monthly", "quarterly", "yearly", "custom"]),
+    default="weekly",
+    help="Report period",
+)
+@click.option("--start", "-s", help="Start date for custom period (YYYY-MM-DD)")
+@click.option("--end", "-e", help="End date for custom period (YYYY-MM-DD)")
+@click.option("--repo", "-r", multiple=True, help="Specific repositories to include")
+@click.option(
+    "--by",
+    type=click.Choice(list(GROUP_BY_OPTIONS)),
+    default="repository",
+    help="Group activity by repository, author or day",
+)
+@click.option(
+    "--export",
+    type=click.Path(path_type=Path),
+    help="Export the grouped activity to a .csv or .parquet file",
+)
+@click.option(
+    "--export-commits",
+    type=click.Path(path_type=Path),
+    help="Export per-commit data to a .csv or .parquet file",
+)
+@click.option(
+    "--since-last",
+    is_flag=True,
+    help="Only include the commits added since the last --since-last report",
+)
+def stats(
+    config: Optional[Path],
+    period: str,
+    start: Optional[str],
+    end: Optional[str],
+    repo: tuple[str],
+    by: str,
+    export: Optional[Path],
+    export_commits: Optional[Path],
+    since_last: bool,
+):
+    """Show commit activity statistics without calling an AI provider."""
+    try:
+        request = _build_request(period, start, end, repo, since_last)
 
-## Commit Details
+        console.print("[cyan]Analyzing commit history...[/cyan]")
+        generator = ReportGenerator(ConfigManager(config))
+        start_date, end_date, commits = generator.collect_commits(request)
+        with commits:
+            table = CommitTable.from_commits(commits)
 
-"""
-            for commit in report.commits:
-                output_text += f"- [{commit.repository}] {commit.date.strftime('%Y-%m-%d %H:%M')}: {commit.message[:100]}\n"
+        totals = table.churn_totals()
+        percentiles = table.percentiles()
+        console.print(
+            Panel(
+                f"[bold]{request.period.value.upper()} STATISTICS[/bold]\n"
+                f"Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}\n"
+                f"Commits: {totals['commits']}\n"
+                f"Lines: +{totals['insertions']}/-{totals['deletions']} "
+                f"({totals['files_changed']} files changed)\n"
+                f"Churn per commit: p50 {percentiles[50]:.0f}, "
+                f"p90 {percentiles[90]:.0f}, p99 {percentiles[99]:.0f}",
+                style="bold cyan",
+            )
+        )
 
-            output.write_text(output_text)
-            console.print(f"\n[green]✓[/green] Report saved to: {output}")
+        activity = table.activity(by)
+        activity_table = Table(title=f"Activity by {by}")
+        activity_table.add_column(by.capitalize(), style="cyan")
+        activity_table.add_column("Commits", justify="right")
+        activity_table.add_column("Insertions", justify="right", style="green")
+        activity_table.add_column("Deletions", justify="right", style="red")
+        activity_table.add_column("Files", justify="right")
+        for row in zip(*(column.tolist() for column in activity.values())):
+            activity_table.add_row(*(str(value) for value in row))
+        console.print(activity_table)
+
+        weekday_table = Table(title="Commits by weekday")
+        for day in WEEKDAYS:
+            weekday_table.add_column(day, justify="right")
+        weekday_table.add_row(*(str(c) for c in table.weekday_histogram().tolist()))
+        console.print(weekday_table)
+
+        hour_table = Table(title="Commits by hour")
+        for hour in range(24):
+            hour_table.add_column(f"{hour:02d}", justify="right")
+        hour_table.add_row(*(str(c) for c in table.hour_histogram().tolist()))
+        console.print(hour_table)
+
+        if export:
+            export_columns(activity, export)
+            console.print(f"[green]✓[/green] Activity saved to: {export}")
+        if export_commits:
+            export_columns(table.to_columns(), export_commits)
+            console.print(f"[green]✓[/green] Commit data saved to: {export_commits}")
 
     except FileNotFoundError as e:
         console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
-        traceback.print_exc()
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(path_type=Path),
+    help="Path to configuration file (for model_prices)",
+)
+@click.option(
+    "--since", "-s", help="Only calls made on or after this date (YYYY-MM-DD)"
+)
+@click.option(
+    "--by",
+    type=click.Choice(list(USAGE_GROUP_BY_OPTIONS)),
+    default="run",
+    help="Group calls by report run, day or model",
+)
+@click.option(
+    "--limit",
+    "-n",
+    type=int,
+    default=20,
+    show_default=True,
+    help="Show only the most recent groups",
+)
+def usage(config: Optional[Path], since: Optional[str], by: str, limit: int):
+    """Show the tokens, latency and cost of recorded LLM calls."""
+    try:
+        since_date = None
+        if since:
+            try:
+                since_date = datetime.strptime(since, "%Y-%m-%d")
+            except ValueError as e:
+                console.print(f"[red]Error:[/red] Invalid date format: {e}")
+                console.print("Use YYYY-MM-DD format.")
+                sys.exit(1)
+        try:
+            prices = ConfigManager(config).load().model_prices
+        except FileNotFoundError:
+            prices = {}
+
+        ledger = UsageLedger()
+        rows = summarize_usage(ledger.read(since_date), by=by, prices=prices)
+        if not rows:
+            console.print(f"[yellow]No LLM calls recorded in {ledger.path}.[/yellow]")
+            return
+
+        table = Table(title=f"LLM usage by {by}")
+        table.add_column(by.capitalize(), style="cyan")
+        if by == "run":
+            table.add_column("Started")
+        table.add_column("Calls", justify="right")
+        table.add_column("Errors", justify="right", style="red")
+        table.add_column("Input", justify="right")
+        table.add_column("Cached", justify="right")
+        table.add_column("Output", justify="right")
+        table.add_column("p50 latency", justify="right")
+        table.add_column("Cost", justify="right", style="green")
+
+        def cost_text(cost: Optional[float]) -> str:
+            return "-" if cost is None else f"${cost:.4f}"
+
+        for row in rows[-limit:] if limit > 0 else rows:
+            cells = [str(row[by])]
+            if by == "run":
+                cells.append(row["started"].strftime("%Y-%m-%d %H:%M"))
+            cells += [
+                str(row["calls"]),
+                str(row["errors"]),
+                str(row["input_tokens"]),
+                str(row["cache_read_tokens"]),
+                str(row["output_tokens"]),
+                f"{row['latency']:.1f}s",
+                cost_text(row["cost"]),
+            ]
+            table.add_row(*cells)
+
+        costs = [row["cost"] for row in rows]
+        table.add_section()
+        total = ["Total"] + ([""] if by == "run" else [])
+        total += [
+            str(sum(row[column] for row in rows))
+            for column in (
+                "calls",
+                "errors",
+                "input_tokens",
+                "cache_read_tokens",
+                "output_tokens",
+            )
+        ]
+        total += ["", cost_text(None if None in costs else sum(costs))]
+        table.add_row(*total, style="bold")
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+@main.command("export-cache")
+@click.argument("archive", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--no-mirrors",
+    is_flag=True,
+    help="Leave out the mirrors of remote repositories",
+)
+def export_cache_command(archive: Path, no_mirrors: bool):
+    """Pack mirrors, indexes, caches and checkpoints into ARCHIVE.
+
+    Restore the archive with 'git-reporter import-cache' on a fresh machine,
+    e.g. a CI runner, so remote repositories are fetched incrementally
+    instead of cloned.
+    """
+    try:
+        counts = export_cache(archive, include_mirrors=not no_mirrors)
+        console.print(
+            f"[green]✓[/green] Exported {counts['files']} file(s) and "
+            f"{counts['mirrors']} mirror(s) to {archive} "
+            f"({counts['bytes'] / 1024 / 1024:.1f} MB)"
+        )
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+@main.command("import-cache")
+@click.argument("archive", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+def import_cache_command(archive: Path):
+    """Restore the state packed by 'git-reporter export-cache'.
+
+    The archive is verified before anything is restored. Existing files are
+    replaced, existing mirrors are kept.
+    """
+    try:
+        counts = import_cache(archive)
+        console.print(
+            f"[green]✓[/green] Imported {counts['files']} file(s) and "
+            f"{counts['mirrors']} mirror(s) from {archive}"
+        )
+        if counts["skipped"]:
+            console.print(
+                f"[yellow]Kept {counts['skipped']} existing mirror(s).[/yellow]"
+            )
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {e}")
         sys.exit(1)
 
 
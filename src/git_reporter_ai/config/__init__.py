@@ -1,5 +1,7 @@
 """Configuration management."""
 
+from .discovery import RepositoryDiscovery
 from .manager import ConfigManager
+from .paths import get_cache_dir, get_state_dir
 
-__all__ = ["ConfigManager"]
+__all__ = ["ConfigManager", "RepositoryDiscovery", "get_cache_dir", "get_state_dir"]
@@ -0,0 +1,205 @@
+"""Parallel discovery of git repositories below workspace roots."""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Optional
+
+from .paths import get_cache_dir
+
+# Directory names never descended into
+DEFAULT_EXCLUDES = [
+    "node_modules",
+    "vendor",
+    "third_party",
+    "bower_components",
+    "venv",
+    ".*",
+    "__pycache__",
+    "site-packages",
+    "build",
+    "dist",
+    "target",
+]
+
+
+class RepositoryDiscovery:
+    """Finds git repositories below one or more root directories.
+
+    Directories are scanned concurrently. The listing of every scanned
+    directory is remembered in an index together with its mtime; a directory
+    whose mtime is unchanged is not listed again on the next scan, so rescans
+    only read subtrees that actually changed. A change deep down only touches
+    the mtime of its parent, so a rescan still stats every directory; callers
+    that can live with a slightly stale list pass ``max_age`` to reuse the
+    result of a recent scan without walking the tree at all.
+    """
+
+    INDEX_VERSION = 2
+
+    def __init__(
+        self,
+        index_path: Optional[Path] = None,
+        exclude: Optional[list[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize the discovery.
+
+        Args:
+            index_path: Path of the directory index (default: in the cache directory)
+            exclude: Directory name patterns to skip (default: DEFAULT_EXCLUDES)
+            max_workers: Number of scanning threads
+        """
+        self.index_path = index_path or get_cache_dir() / "discovery-index.json"
+        self.exclude = DEFAULT_EXCLUDES if exclude is None else exclude
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        data = self._load_index()
+        self._index: dict[str, dict] = data.get("directories", {})
+        # Result of the last scan per roots, depth and exclusions
+        self._results: dict[str, dict] = data.get("results", {})
+        self.scanned = 0
+        self.reused = 0
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != self.INDEX_VERSION:
+            return {}
+        return data
+
+    def _save_index(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": self.INDEX_VERSION,
+                    "directories": self._index,
+                    "results": self._results,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.index_path)
+
+    def _is_excluded(self, name: str, patterns: list[str]) -> bool:
+        return any(fnmatch(name, pattern) for pattern in patterns)
+
+    def _scan(self, directory: str) -> tuple[str, dict]:
+        """List one directory, reusing the index entry if its mtime is unchanged."""
+        mtime = os.stat(directory).st_mtime_ns
+        cached = self._index.get(directory)
+        if cached and cached["mtime"] == mtime:
+            return directory, cached
+
+        is_repo = False
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name == ".git":
+                    # Directory for normal clones, file for worktrees and submodules
+                    is_repo = True
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+        return directory, {
+            "mtime": mtime,
+            "repo": is_repo,
+            "subdirs": subdirs,
+            "new": True,
+        }
+
+    def discover(
+        self,
+        roots: list[Path],
+        max_depth: int = 4,
+        exclude: Optional[list[str]] = None,
+        max_age: Optional[float] = None,
+    ) -> list[Path]:
+        """Find git repositories below the given roots.
+
+        Repositories are not descended into, so nested checkouts and
+        submodules are not reported separately.
+
+        Args:
+            roots: Directories to scan
+            max_depth: Maximum directory depth below each root
+            exclude: Additional directory name patterns to skip
+            max_age: Reuse the result of a scan of the same roots that is at
+                most this many seconds old, dropping repositories that no
+                longer exist (always rescan if None)
+
+        Returns:
+            Sorted list of repository paths
+        """
+        patterns = self.exclude + (exclude or [])
+        roots_resolved = sorted(
+            {
+                str(Path(root).expanduser().resolve())
+                for root in roots
+                if os.path.isdir(Path(root).expanduser())
+            }
+        )
+        key = json.dumps([roots_resolved, max_depth, patterns])
+        result = self._results.get(key)
+        if max_age is not None and result and time.time() - result["at"] <= max_age:
+            # Only the known repositories are checked; new ones wait for a rescan
+            return [
+                Path(path)
+                for path in result["repos"]
+                if os.path.lexists(os.path.join(path, ".git"))
+            ]
+
+        repos: list[Path] = []
+        seen: set[str] = set(roots_resolved)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            depths: dict[str, int] = dict.fromkeys(roots_resolved, 0)
+            pending = {executor.submit(self._scan, root) for root in roots_resolved}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        directory, entry = future.result()
+                    except OSError:
+                        # Vanished or unreadable directory
+                        continue
+
+                    if entry.pop("new", False):
+                        self.scanned += 1
+                    else:
+                        self.reused += 1
+                    self._index[directory] = entry
+
+                    if entry["repo"]:
+                        repos.append(Path(directory))
+                        continue
+                    depth = depths.pop(directory) + 1
+                    if depth > max_depth:
+                        continue
+                    for name in entry["subdirs"]:
+                        child = os.path.join(directory, name)
+                        if child in seen or self._is_excluded(name, patterns):
+                            continue
+                        seen.add(child)
+                        depths[child] = depth
+                        pending.add(executor.submit(self._scan, child))
+
+        # Forget directories below the scanned roots that were not reached
+        self._index = {
+            path: entry
+            for path, entry in self._index.items()
+            if path in seen
+            or not any(
+                path == root or path.startswith(root + os.sep)
+                for root in roots_resolved
+            )
+        }
+        repos.sort()
+        self._results[key] = {"at": time.time(), "repos": [str(r) for r in repos]}
+        self._save_index()
+        return repos
@@ -7,7 +7,8 @@ from typing import Optional
 import yaml
 from pydantic import ValidationError
 
-from ..models import Config
+from ..models import Config, RepositoryConfig
+from .discovery import RepositoryDiscovery
 
 
 class ConfigManager:
@@ -69,6 +70,12 @@ class ConfigManager:
         if "gemini_api_key" not in data or not data["gemini_api_key"]:
             data["gemini_api_key"] = os.environ.get("GEMINI_API_KEY")
 
+        if not data.get("github_token"):
+            data["github_token"] = os.environ.get("GITHUB_TOKEN")
+
+        if not data.get("gitlab_token"):
+            data["gitlab_token"] = os.environ.get("GITLAB_TOKEN")
+
         try:
             return Config(**data)
         except ValidationError as e:
@@ -83,32 +90,76 @@ class ConfigManager:
         # Create directory if it doesn't exist
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Convert to dict and remove None values and API keys (store in env instead)
-        data = config.model_dump(exclude_none=True, mode="python", by_alias=True)
+        # Convert to plain data (enums become their values) without None values
+        # and API keys (store in env instead)
+        data = config.model_dump(exclude_none=True, mode="json", by_alias=True)
 
         # Don't save API keys to file for security
-        if "openai_api_key" in data:
-            data.pop("openai_api_key")
-        if "gemini_api_key" in data:
-            data.pop("gemini_api_key")
-
-        # Convert enum to string value
-        if "ai_provider" in data:
-            data["ai_provider"] = (
-                data["ai_provider"].value
-                if hasattr(data["ai_provider"], "value")
-                else data["ai_provider"]
-            )
-        if "default_period" in data:
-            data["default_period"] = (
-                data["default_period"].value
-                if hasattr(data["default_period"], "value")
-                else data["default_period"]
-            )
+        data.pop("openai_api_key", None)
+        data.pop("gemini_api_key", None)
+        data.pop("github_token", None)
+        data.pop("gitlab_token", None)
 
         with open(self.config_path, "w") as f:
             yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
 
+    def resolve_repositories(
+        self,
+        config: Config,
+        discovery: Optional[RepositoryDiscovery] = None,
+        rescan: bool = False,
+    ) -> list[RepositoryConfig]:
+        """Get the configured repositories plus those found in workspaces.
+
+        Explicitly configured repositories take precedence over discovered
+        repositories with the same path or name. Discovered repositories are
+        named by their path relative to the workspace root. A workspace
+        scanned within ``workspace_rescan_interval`` is not scanned again.
+
+        Args:
+            config: Configuration object
+            discovery: Repository discovery to use (creates one if None)
+            rescan: Scan the workspaces even if a recent scan could be reused
+
+        Returns:
+            List of repository configurations
+        """
+        repos = list(config.repos)
+        if not config.workspaces:
+            return repos
+
+        names = {r.name for r in repos}
+        paths = {str(Path(r.path).expanduser().resolve()) for r in repos if r.path}
+        discovery = discovery or RepositoryDiscovery()
+
+        for workspace in config.workspaces:
+            root = Path(workspace.root).expanduser().resolve()
+            found = discovery.discover(
+                [root],
+                max_depth=workspace.max_depth,
+                exclude=workspace.exclude,
+                max_age=None if rescan else config.workspace_rescan_interval,
+            )
+            for repo_path in found:
+                name = repo_path.relative_to(root).as_posix()
+                if name == ".":
+                    name = repo_path.name
+                if str(repo_path) in paths or name in names:
+                    continue
+                names.add(name)
+                paths.add(str(repo_path))
+                repos.append(
+                    RepositoryConfig(
+                        name=name,
+                        path=str(repo_path),
+                        author_email=workspace.author_email,
+                        author_emails=workspace.author_emails,
+                        author=workspace.author,
+                    )
+                )
+
+        return repos
+
     def create_default(self) -> Config:
         """Create and save a default configuration.
 
@@ -0,0 +1,30 @@
+"""Locations of git-reporter's on-disk state."""
+
+import os
+from pathlib import Path
+
+
+def get_state_dir() -> Path:
+    """Get the directory holding git-reporter's indexes and caches.
+
+    Defaults to ``~/.git-reporter`` and can be moved with the
+    ``GIT_REPORTER_HOME`` environment variable.
+
+    Returns:
+        State directory path (not necessarily existing yet)
+    """
+    return Path(os.environ.get("GIT_REPORTER_HOME", Path.home() / ".git-reporter"))
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """Get (and create) a cache directory below the state directory.
+
+    Args:
+        parts: Path components below ``<state dir>/cache``
+
+    Returns:
+        Existing cache directory path
+    """
+    path = get_state_dir().joinpath("cache", *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
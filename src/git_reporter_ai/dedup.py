@@ -0,0 +1,131 @@
+"""Cross-repository commit deduplication."""
+
+import sys
+from typing import Callable, Iterable, Iterator, Optional
+
+from .models import GitCommit
+
+# Resolves patch-ids for a batch of SHAs in one repository: (repo name, shas) -> {sha: patch_id}
+PatchIdResolver = Callable[[str, list[str]], dict[str, str]]
+
+
+def _merge_into(survivor: GitCommit, duplicate: GitCommit) -> None:
+    """Record the repositories of a duplicate commit on the surviving one."""
+    for repo in duplicate.repositories or [duplicate.repository]:
+        if repo not in survivor.repositories:
+            survivor.repositories.append(repo)
+
+
+def _subject_key(commit: GitCommit) -> tuple[str, str]:
+    """Key used to find cherry-pick candidates without computing any diffs.
+
+    Cherry-picks keep the author and the subject line, so only commits sharing
+    both can possibly have the same patch-id.
+    """
+    subject = commit.message.split("\n", 1)[0].strip()
+    return commit.email.lower(), subject
+
+
+def deduplicate_commits(
+    commits: list[GitCommit],
+    patch_ids: Optional[PatchIdResolver] = None,
+) -> list[GitCommit]:
+    """Remove commits that were collected more than once.
+
+    Commits are first collapsed by SHA (forks, mirrors and branches of the same
+    project). If ``patch_ids`` is given, commits that share an author and subject
+    line are then compared by ``git patch-id`` so that cherry-picks of the same
+    change are collapsed as well. The oldest copy survives and its
+    ``repositories`` field lists every repository the change was found in.
+
+    Args:
+        commits: Commits collected from all repositories
+        patch_ids: Optional resolver used to compute patch-ids per repository
+
+    Returns:
+        Deduplicated commits, in the same order as the input
+    """
+    # Binary SHAs keep the index compact for millions of commits
+    by_sha: dict[bytes, GitCommit] = {}
+    for commit in commits:
+        key = bytes.fromhex(commit.sha)
+        survivor = by_sha.get(key)
+        if survivor is None:
+            if not commit.repositories:
+                commit.repositories = [commit.repository]
+            by_sha[key] = commit
+        else:
+            _merge_into(survivor, commit)
+
+    unique = list(by_sha.values())
+    if patch_ids is None:
+        return unique
+
+    # Only buckets with more than one distinct commit need a patch-id at all
+    buckets: dict[tuple[str, str], list[GitCommit]] = {}
+    for commit in unique:
+        buckets.setdefault(_subject_key(commit), []).append(commit)
+
+    candidates: dict[str, list[str]] = {}
+    for bucket in buckets.values():
+        if len(bucket) > 1:
+            for commit in bucket:
+                candidates.setdefault(commit.repository, []).append(commit.sha)
+
+    if not candidates:
+        return unique
+
+    sha_to_patch_id: dict[str, str] = {}
+    for repo, shas in candidates.items():
+        try:
+            sha_to_patch_id.update(patch_ids(repo, shas))
+        except Exception as e:
+            print(
+                f"Warning: Could not compute patch-ids for {repo}: {e}",
+                file=sys.stderr,
+            )
+
+    # Oldest copy of a change is the original; later ones are cherry-picks
+    by_patch_id: dict[bytes, GitCommit] = {}
+    duplicates: set[bytes] = set()
+    for commit in sorted(unique, key=lambda c: c.date):
+        patch_id = sha_to_patch_id.get(commit.sha)
+        if not patch_id:
+            continue
+        key = bytes.fromhex(patch_id)
+        survivor = by_patch_id.get(key)
+        if survivor is None:
+            by_patch_id[key] = commit
+        else:
+            _merge_into(survivor, commit)
+            duplicates.add(bytes.fromhex(commit.sha))
+
+    if not duplicates:
+        return unique
+    return [c for c in unique if bytes.fromhex(c.sha) not in duplicates]
+
+
+def deduplicate_sorted(commits: Iterable[GitCommit]) -> Iterator[GitCommit]:
+    """Collapse commits with the same SHA in a stream sorted by (date, SHA).
+
+    Copies of a commit are adjacent in such a stream, so duplicates are
+    removed in a single pass without an index. Cherry-picks are not detected.
+
+    Args:
+        commits: Commits sorted by date and SHA (either direction)
+
+    Yields:
+        Unique commits, in the same order as the input
+    """
+    previous: Optional[GitCommit] = None
+    for commit in commits:
+        if previous is not None and commit.sha == previous.sha:
+            _merge_into(previous, commit)
+            continue
+        if previous is not None:
+            yield previous
+        if not commit.repositories:
+            commit.repositories = [commit.repository]
+        previous = commit
+    if previous is not None:
+        yield previous
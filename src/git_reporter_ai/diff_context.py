@@ -0,0 +1,187 @@
+"""Size-capped diff excerpts that give the model context for vague commits."""
+
+import heapq
+import math
+import re
+from pathlib import Path
+from typing import IO, Iterable, Optional
+
+from .config.paths import get_cache_dir
+from .models import GitCommit
+
+# Lines longer than this (minified or generated code) are cut
+EXCERPT_LINE_CHARS = 200
+
+# Subjects that say little about the change itself
+VAGUE_SUBJECT = re.compile(
+    r"^(wip|fix(es|ed)?|update[sd]?|changes?|misc|cleanup|tweaks?|minor|stuff|"
+    r"refactor(ing)?|temp|test(ing)?|\.+)\b",
+    re.IGNORECASE,
+)
+_SHA_LINE = re.compile(rb"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+
+def context_priority(commit: GitCommit) -> float:
+    """Score how much a commit would benefit from a diff excerpt.
+
+    Larger changes score higher, and commits whose message is short or vague
+    score twice as high as well-described ones.
+
+    Args:
+        commit: Commit to score
+
+    Returns:
+        Priority (higher first)
+    """
+    subject = commit.message.split("\n", 1)[0].strip()
+    has_body = "\n" in commit.message.strip()
+    vague = len(subject) < 30 or bool(VAGUE_SUBJECT.match(subject))
+    weight = 2.0 if vague and not has_body else 1.0
+    return weight * math.log1p(commit.insertions + commit.deletions)
+
+
+def select_commits(
+    commits: Iterable[GitCommit], token_budget: int, max_chars: int
+) -> list[GitCommit]:
+    """Choose the commits that get a diff excerpt within a token budget.
+
+    Args:
+        commits: Candidate commits (consumed once)
+        token_budget: Estimated prompt tokens available for all excerpts
+        max_chars: Maximum size of a single excerpt in characters
+
+    Returns:
+        Selected commits, highest priority first
+    """
+
+    # About four characters per token; small changes produce small excerpts
+    def cost(commit: GitCommit) -> int:
+        return min(max_chars, (commit.insertions + commit.deletions) * 40) // 4 + 1
+
+    # Consider a few times as many commits as full-size excerpts would fit
+    limit = max(1, token_budget // (max_chars // 4 + 1)) * 4
+    candidates = heapq.nlargest(
+        limit,
+        (c for c in commits if c.insertions + c.deletions > 0),
+        key=context_priority,
+    )
+
+    selected = []
+    remaining = token_budget
+    for commit in candidates:
+        tokens = cost(commit)
+        if tokens <= remaining:
+            selected.append(commit)
+            remaining -= tokens
+    return selected
+
+
+def parse_diff_output(stream: IO[bytes], max_chars: int) -> dict[str, str]:
+    """Read ``git diff-tree --stdin -p`` output into capped excerpts.
+
+    Only the file headers, hunk headers and changed lines are kept; each
+    excerpt stops growing once it reaches ``max_chars``, so huge diffs are
+    skipped over without being held in memory.
+
+    Args:
+        stream: Binary stream of diff-tree output
+        max_chars: Maximum excerpt size in characters
+
+    Returns:
+        Mapping of the SHA of every commit header in the output to its
+        excerpt (empty when the commit has no diff, e.g. merges)
+    """
+    excerpts: dict[str, str] = {}
+    sha: Optional[str] = None
+    lines: list[str] = []
+    size = 0
+    truncated = False
+
+    def finish() -> None:
+        if sha is not None:
+            if truncated:
+                lines.append("...")
+            excerpts[sha] = "\n".join(lines)
+
+    for raw in stream:
+        raw = raw.rstrip(b"\n")
+        if _SHA_LINE.match(raw):
+            finish()
+            sha, lines, size, truncated = raw.decode(), [], 0, False
+            continue
+        if sha is None or truncated:
+            continue
+
+        if raw.startswith(b"diff --git "):
+            # "diff --git a/path b/path" -> "diff path"
+            line = "diff " + raw.decode(errors="replace").rsplit(" b/", 1)[-1]
+        elif raw.startswith((b"@@", b"+", b"-")) and not raw.startswith(
+            (b"+++", b"---")
+        ):
+            line = raw[:EXCERPT_LINE_CHARS].decode(errors="replace")
+        else:
+            continue
+
+        if size + len(line) + 1 > max_chars:
+            truncated = True
+            continue
+        lines.append(line)
+        size += len(line) + 1
+
+    finish()
+    return excerpts
+
+
+class DiffExcerptCache:
+    """On-disk cache of diff excerpts keyed by commit SHA and size cap.
+
+    A commit's diff never changes, so excerpts are reused across runs and
+    reports without running git again.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: ``diffs`` in the cache directory)
+        """
+        self.directory = directory or get_cache_dir("diffs")
+
+    def _path(self, sha: str, max_chars: int) -> Path:
+        return self.directory / sha[:2] / f"{sha}-{max_chars}.txt"
+
+    def get(self, sha: str, max_chars: int) -> Optional[str]:
+        """Get a cached excerpt.
+
+        Args:
+            sha: Commit SHA
+            max_chars: Size cap the excerpt was created with
+
+        Returns:
+            Excerpt, or None if not cached
+        """
+        try:
+            return self._path(sha, max_chars).read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def put(self, sha: str, max_chars: int, excerpt: str) -> None:
+        """Store an excerpt.
+
+        Args:
+            sha: Commit SHA
+            max_chars: Size cap the excerpt was created with
+            excerpt: Excerpt text
+        """
+        path = self._path(sha, max_chars)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(excerpt, encoding="utf-8")
+        except OSError:
+            # Caching is best effort
+            pass
+
+
+def indent_excerpt(excerpt: str) -> str:
+    """Indent an excerpt so it reads as part of the commit line above it."""
+    return "\n".join(f"    {line}" for line in excerpt.splitlines())
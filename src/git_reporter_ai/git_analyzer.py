@@ -1,44 +1,132 @@
 """Git repository analyzer."""
 
+import os
 import shutil
+import subprocess
 import tempfile
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
-from git import Repo
+from git import RemoteProgress, Repo
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
-from .models import GitCommit, RepositoryConfig
+from .backends import create_backend
+from .diff_context import parse_diff_output
+from .identity import AuthorFilter, IdentityIndex
+from .mirrors import mirror_path, update_mirror
+from .models import GitBackendType, GitCommit, IdentityConfig, RepositoryConfig
+from .progress import RepoProgress, parse_transfer_size
+from .refs import list_refs, select_tips
+
+
+class _CloneProgress(RemoteProgress):
+    """Reports the bytes received by a GitPython clone."""
+
+    def __init__(self, progress: RepoProgress):
+        super().__init__()
+        self.progress = progress
+
+    def update(self, op_code, cur_count, max_count=None, message=""):
+        if op_code & self.RECEIVING and message:
+            received = parse_transfer_size(message)
+            if received is not None:
+                self.progress.received_bytes = received
 
 
 class GitAnalyzer:
     """Analyzes git repositories and extracts commit history."""
 
-    def __init__(self, repo_config: RepositoryConfig):
+    def __init__(
+        self,
+        repo_config: RepositoryConfig,
+        backend: Optional[GitBackendType] = None,
+        identities: Optional[list[IdentityConfig]] = None,
+        skip_stale_refs: bool = True,
+        api_token: Optional[str] = None,
+        stats_workers: Optional[int] = 1,
+        mirror_remotes: bool = False,
+        progress: Optional[RepoProgress] = None,
+    ):
         """Initialize the analyzer with a repository configuration.
 
         Args:
             repo_config: Repository configuration
+            backend: Git backend used for the commit walk (defaults to the
+                repository's configured backend, then GitPython)
+            identities: Configured identities, used with the repository's
+                ``.mailmap`` to resolve commit authors
+            skip_stale_refs: Do not walk refs whose tip is older than the
+                start date of a walk
+            api_token: Access token for the REST API of the rest backend
+            stats_workers: Processes computing commit stats of large ranges
+                with the cli backend (None = one per CPU core)
+            mirror_remotes: Keep remote repositories as mirrors in the cache
+                and fetch them incrementally, instead of cloning them to a
+                temporary directory
+            progress: Progress of the repository, updated by the transfer
+                and the walks (tracked by no one if None)
 
         Raises:
             InvalidGitRepositoryError: If the path is not a valid git repository
+            ValueError: If the repository refers to an unknown identity
         """
+        self.author_filter = AuthorFilter.for_repository(repo_config, identities or [])
         self.config = repo_config
+        self.skip_stale_refs = skip_stale_refs
         self.is_temporary = False
         self.temp_dir = None
+        self.progress = progress or RepoProgress(repo_config.name)
+        backend = backend or repo_config.backend or GitBackendType.GITPYTHON
+
+        if backend == GitBackendType.REST and not repo_config.path:
+            # Read remote history through the hosting API instead of cloning
+            self.repo = None
+            self.repo_path = None
+            self.backend = create_backend(
+                backend,
+                None,
+                repo_config.name,
+                url=repo_config.repo,
+                api_url=repo_config.api_url,
+                api_token=api_token,
+                refs=repo_config.refs,
+            )
+            self.backend.progress = self.progress
+            self.identities = IdentityIndex(identities=identities or [])
+            return
+        if backend == GitBackendType.REST:
+            # Local checkouts are read directly
+            backend = GitBackendType.GITPYTHON
 
         # Handle remote repositories
-        if repo_config.repo and not repo_config.path:
+        if repo_config.repo and not repo_config.path and mirror_remotes:
+            # Fetch into the cached mirror, cloning only on first use
+            mirrored = (mirror_path(repo_config.repo) / "HEAD").is_file()
+            self.progress.phase = "fetching" if mirrored else "cloning"
+            try:
+                self.repo_path = update_mirror(
+                    repo_config.repo, on_received=self._on_received
+                )
+                self.repo = Repo(self.repo_path)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to mirror repository {repo_config.repo}: {e}"
+                ) from e
+        elif repo_config.repo and not repo_config.path:
             # Clone remote repository to a temporary directory
             self.temp_dir = tempfile.mkdtemp(prefix=f"git-reporter-{repo_config.name}-")
             self.repo_path = Path(self.temp_dir)
             self.is_temporary = True
 
+            self.progress.phase = "cloning"
             try:
                 print(f"Cloning remote repository: {repo_config.repo}")
                 self.repo = Repo.clone_from(
-                    repo_config.repo, self.repo_path, depth=None
+                    repo_config.repo,
+                    self.repo_path,
+                    depth=None,
+                    progress=_CloneProgress(self.progress),
                 )
             except Exception as e:
                 # Clean up temp directory if clone fails
@@ -61,6 +149,19 @@ class GitAnalyzer:
                     f"Not a valid git repository: {self.repo_path}"
                 ) from e
 
+        self.backend = create_backend(
+            backend,
+            self.repo_path,
+            repo_config.name,
+            repo=self.repo,
+            workers=stats_workers or os.cpu_count() or 1,
+        )
+        self.backend.progress = self.progress
+        self.identities = IdentityIndex.for_repository(self.repo_path, identities or [])
+
+    def _on_received(self, received: int) -> None:
+        self.progress.received_bytes = received
+
     def cleanup(self):
         """Clean up temporary directories if created."""
         if self.is_temporary and self.temp_dir and Path(self.temp_dir).exists():
@@ -75,73 +176,272 @@ class GitAnalyzer:
         """Destructor to ensure cleanup."""
         self.cleanup()
 
-    def get_commits(
+    def iter_commits(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         author_email: Optional[str] = None,
-    ) -> list[GitCommit]:
-        """Get commits from the repository within a date range.
+        tips: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Iterator[GitCommit]:
+        """Stream commits from the repository within a date range.
+
+        Commits are yielded in the order the backend walks them, without
+        collecting the whole history first. Authors are resolved through the
+        identity index, and the author filter is expanded to every address and
+        name of the wanted people before it is pushed down to the backend.
+        Scanned and kept commits are counted in :attr:`progress`.
 
         Args:
             start_date: Start date for filtering commits (inclusive)
             end_date: End date for filtering commits (inclusive)
             author_email: Filter by author email (uses config if not provided)
+            tips: Commits the walk starts from (selected from the configured
+                refs if None)
+            exclude: Skip commits reachable from these, e.g. the tips of an
+                earlier walk (see :meth:`existing_commits`)
 
-        Returns:
-            List of GitCommit objects
+        Yields:
+            GitCommit objects
         """
-        # Use config author_email if not provided
+        # Use the configured author filter if no email is provided
         if author_email is None:
-            author_email = self.config.author_email
+            author_filter = self.author_filter
+        else:
+            author_filter = AuthorFilter([author_email])
+        if author_filter:
+            author_filter = self.identities.expand(author_filter)
 
-        commits = []
+        progress = self.progress
+        progress.start_walk(start_date, end_date)
+        canonicalize = self.identities.canonicalize if self.identities else None
         try:
-            # Get all commits from all branches
-            for commit in self.repo.iter_commits(all=True):
-                commit_date = datetime.fromtimestamp(commit.committed_date)
-
-                # Filter by date range
-                if start_date and commit_date < start_date:
-                    continue
-                if end_date and commit_date > end_date:
-                    continue
-
-                # Filter by author email
-                if author_email and commit.author.email != author_email:
-                    continue
-
-                # Get stats
-                try:
-                    stats = commit.stats.total
-                    files_changed = stats.get("files", 0)
-                    insertions = stats.get("insertions", 0)
-                    deletions = stats.get("deletions", 0)
-                except (AttributeError, GitCommandError):
-                    files_changed = insertions = deletions = 0
-
-                git_commit = GitCommit(
-                    sha=commit.hexsha,
-                    author=commit.author.name,
-                    email=commit.author.email,
-                    date=commit_date,
-                    message=commit.message.strip(),
-                    repository=self.config.name,
-                    files_changed=files_changed,
-                    insertions=insertions,
-                    deletions=deletions,
-                )
-                commits.append(git_commit)
-
+            commits = self.backend.iter_commits(
+                start_date=start_date,
+                end_date=end_date,
+                author=author_filter,
+                tips=self.select_tips(start_date) if tips is None else tips,
+                exclude=exclude,
+            )
+            for commit in commits:
+                progress.kept += 1
+                yield canonicalize(commit) if canonicalize else commit
         except GitCommandError as e:
             raise RuntimeError(
                 f"Error reading commits from {self.config.name}: {e}"
             ) from e
 
+    def select_tips(self, start_date: Optional[datetime] = None) -> Optional[list[str]]:
+        """Choose the commits the history walk starts from.
+
+        The configured ``refs`` and ``exclude_refs`` patterns select refs by
+        name, and refs whose tip is older than ``start_date`` are skipped, as
+        nothing reachable from them can fall in the period.
+
+        Args:
+            start_date: Start of the walked period
+
+        Returns:
+            Tip SHAs, or None to walk all refs (or let the REST backend
+            choose its branches)
+        """
+        if self.repo_path is None:
+            return None
+        since = start_date if self.skip_stale_refs else None
+        if not self.config.refs and not self.config.exclude_refs and since is None:
+            return None
+        return select_tips(
+            list_refs(self.repo_path),
+            include=self.config.refs,
+            exclude=self.config.exclude_refs,
+            since=since,
+        )
+
+    def current_tips(self) -> Optional[list[str]]:
+        """Get the tips of the configured refs, including stale ones.
+
+        Returns:
+            Tip SHAs, or None for repositories read through the REST API
+        """
+        if self.repo_path is None:
+            return None
+        return select_tips(
+            list_refs(self.repo_path),
+            include=self.config.refs,
+            exclude=self.config.exclude_refs,
+        )
+
+    def existing_commits(self, shas: list[str]) -> list[str]:
+        """Keep the SHAs that name commits present in the repository.
+
+        Args:
+            shas: Commit SHAs, e.g. recorded tips of deleted branches
+
+        Returns:
+            The SHAs git can resolve to commits, in the given order
+
+        Raises:
+            RuntimeError: If git fails (missing objects are not a failure)
+        """
+        if self.repo_path is None or not shas:
+            return []
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            cwd=self.repo_path,
+            input="".join(f"{sha}\n" for sha in shas).encode(),
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git cat-file failed in {self.repo_path}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+        found = {
+            line.split(" ")[0]
+            for line in result.stdout.decode(errors="replace").splitlines()
+            if line.endswith(" commit")
+        }
+        return [sha for sha in shas if sha in found]
+
+    def get_commits(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        author_email: Optional[str] = None,
+    ) -> list[GitCommit]:
+        """Get commits from the repository within a date range.
+
+        Args:
+            start_date: Start date for filtering commits (inclusive)
+            end_date: End date for filtering commits (inclusive)
+            author_email: Filter by author email (uses config if not provided)
+
+        Returns:
+            List of GitCommit objects
+        """
+        commits = list(self.iter_commits(start_date, end_date, author_email))
+
         # Sort by date descending (newest first)
         commits.sort(key=lambda c: c.date, reverse=True)
         return commits
 
+    def get_patch_ids(self, shas: list[str]) -> dict[str, str]:
+        """Compute stable patch-ids for a batch of commits.
+
+        All commits are diffed by a single ``git diff-tree --stdin`` process whose
+        output is piped straight into ``git patch-id --stable``.
+
+        Args:
+            shas: Commit SHAs to compute patch-ids for
+
+        Returns:
+            Mapping of commit SHA to patch-id (merge and empty commits are
+            omitted; empty without a local repository)
+
+        Raises:
+            RuntimeError: If git fails
+        """
+        if not shas or self.repo_path is None:
+            return {}
+
+        with tempfile.TemporaryFile() as sha_file, tempfile.TemporaryFile() as stderr:
+            sha_file.write(("\n".join(shas) + "\n").encode())
+            sha_file.seek(0)
+            diff_proc = subprocess.Popen(
+                ["git", "diff-tree", "--stdin", "-p", "--root"],
+                cwd=self.repo_path,
+                stdin=sha_file,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+            try:
+                result = subprocess.run(
+                    ["git", "patch-id", "--stable"],
+                    cwd=self.repo_path,
+                    stdin=diff_proc.stdout,
+                    capture_output=True,
+                    check=False,
+                )
+            finally:
+                diff_proc.stdout.close()
+                returncode = diff_proc.wait()
+
+            # Patch-ids of a partial diff would miss some cherry-picks
+            if returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(
+                    f"git diff-tree failed in {self.repo_path}: "
+                    f"{stderr.read().decode(errors='replace').strip()}"
+                )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"git patch-id failed in {self.repo_path}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+
+        patch_ids = {}
+        for line in result.stdout.decode().splitlines():
+            patch_id, _, sha = line.partition(" ")
+            if sha:
+                patch_ids[sha] = patch_id
+        return patch_ids
+
+    def get_diff_excerpts(self, shas: list[str], max_chars: int) -> dict[str, str]:
+        """Extract size-capped diff excerpts for a batch of commits.
+
+        All commits are diffed by a single ``git diff-tree --stdin`` process
+        whose output is streamed and cut down to ``max_chars`` per commit.
+
+        Args:
+            shas: Commit SHAs to extract excerpts for
+            max_chars: Maximum excerpt size in characters
+
+        Returns:
+            Mapping of commit SHA to excerpt for every commit git could diff
+            (empty excerpt for merge and empty commits; unknown commits are
+            omitted; empty without a local repository)
+
+        Raises:
+            RuntimeError: If git fails
+        """
+        if not shas or self.repo_path is None:
+            return {}
+
+        with tempfile.TemporaryFile() as sha_file, tempfile.TemporaryFile() as stderr:
+            sha_file.write(("\n".join(shas) + "\n").encode())
+            sha_file.seek(0)
+            process = subprocess.Popen(
+                [
+                    "git",
+                    "diff-tree",
+                    "--stdin",
+                    "-p",
+                    "--root",
+                    "--always",
+                    "--no-color",
+                    "--no-renames",
+                    "--unified=0",
+                ],
+                cwd=self.repo_path,
+                stdin=sha_file,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+            )
+            try:
+                excerpts = parse_diff_output(process.stdout, max_chars)
+            finally:
+                process.stdout.close()
+                returncode = process.wait()
+
+            if returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(
+                    f"git diff-tree failed in {self.repo_path}: "
+                    f"{stderr.read().decode(errors='replace').strip()}"
+                )
+        return excerpts
+
     def get_branch_name(self) -> str:
         """Get the current branch name.
 
@@ -164,4 +464,4 @@ class GitAnalyzer:
                 return self.repo.remotes[0].url
         except (AttributeError, IndexError):
             pass
-        return None
+        return self.config.repo
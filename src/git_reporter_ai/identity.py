@@ -0,0 +1,323 @@
+"""Resolution of commit author identities through .mailmap and configured identities.
+
+A person often commits from several addresses and under several spellings of
+their name. The identity index maps each raw ``(name, email)`` pair to one
+canonical identity, following git's ``.mailmap`` rules, and expands an author
+filter into every raw identity that resolves to it. The expanded filter is
+pushed down to the backends, so a filter covering several addresses still
+costs a single history walk.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .models import GitCommit, IdentityConfig, RepositoryConfig
+
+_MAILMAP_IDENT = re.compile(r"([^<]*)<([^>]*)>")
+
+
+class MailmapEntry:
+    """One ``.mailmap`` line: a commit identity and what it maps to."""
+
+    def __init__(
+        self,
+        proper_name: Optional[str],
+        proper_email: Optional[str],
+        commit_name: Optional[str],
+        commit_email: str,
+    ):
+        """Initialize the entry.
+
+        Args:
+            proper_name: Canonical name (None keeps the commit's name)
+            proper_email: Canonical email (None keeps the commit's email)
+            commit_name: Only map commits with this name (any name if None)
+            commit_email: Email of the commits to map
+        """
+        self.proper_name = proper_name
+        self.proper_email = proper_email
+        self.commit_name = commit_name
+        self.commit_email = commit_email
+
+
+def parse_mailmap(text: str) -> list[MailmapEntry]:
+    """Parse the contents of a ``.mailmap`` file.
+
+    Supports the four forms documented in gitmailmap(5)::
+
+        Proper Name <commit@email>
+        <proper@email> <commit@email>
+        Proper Name <proper@email> <commit@email>
+        Proper Name <proper@email> Commit Name <commit@email>
+
+    Args:
+        text: File contents
+
+    Returns:
+        Entries in file order (malformed lines are skipped)
+    """
+    entries = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        idents = [
+            (name.strip() or None, email.strip())
+            for name, email in _MAILMAP_IDENT.findall(line)
+        ]
+        if len(idents) == 1:
+            name, email = idents[0]
+            if name:
+                entries.append(MailmapEntry(name, None, None, email))
+        elif len(idents) == 2:
+            (proper_name, proper_email), (commit_name, commit_email) = idents
+            entries.append(
+                MailmapEntry(proper_name, proper_email, commit_name, commit_email)
+            )
+    return entries
+
+
+class AuthorFilter:
+    """Set of author emails and names whose commits are included.
+
+    Emails and names are compared case-insensitively, as git does for
+    ``.mailmap`` lookups.
+    """
+
+    def __init__(self, emails: Iterable[str] = (), names: Iterable[str] = ()):
+        """Initialize the filter.
+
+        Args:
+            emails: Author emails to include
+            names: Author names to include
+        """
+        self.emails = frozenset(e.lower() for e in emails)
+        self.names = frozenset(n.lower() for n in names)
+
+    @classmethod
+    def for_repository(
+        cls, repo_config: RepositoryConfig, identities: Iterable[IdentityConfig] = ()
+    ) -> Optional["AuthorFilter"]:
+        """Build the filter configured for a repository.
+
+        Args:
+            repo_config: Repository configuration
+            identities: Configured identities that ``author`` may refer to
+
+        Returns:
+            Author filter, or None if the repository includes all commits
+
+        Raises:
+            ValueError: If ``author`` names an identity that is not configured
+        """
+        emails = list(repo_config.author_emails)
+        if repo_config.author_email:
+            emails.append(repo_config.author_email)
+        names: list[str] = []
+
+        if repo_config.author:
+            identity = next(
+                (i for i in identities if i.name == repo_config.author), None
+            )
+            if identity is None:
+                raise ValueError(
+                    f"Repository '{repo_config.name}' refers to unknown identity "
+                    f"'{repo_config.author}'"
+                )
+            emails += identity.emails
+            names += [identity.name, *identity.aliases]
+
+        if not emails and not names:
+            return None
+        return cls(emails, names)
+
+    def matches(self, name: str, email: str) -> bool:
+        """Whether a commit author is included."""
+        return email.lower() in self.emails or name.lower() in self.names
+
+    def __bool__(self) -> bool:
+        return bool(self.emails or self.names)
+
+
+class IdentityIndex:
+    """Maps raw commit identities of one repository to canonical identities.
+
+    The index combines the repository's ``.mailmap`` with the configured
+    identities; configured identities win, as they are the more specific
+    statement of who is who. Build it with :meth:`for_repository`, which
+    reuses the index of a repository until its ``.mailmap`` changes.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[MailmapEntry] = (),
+        identities: Iterable[IdentityConfig] = (),
+    ):
+        """Initialize the index.
+
+        Args:
+            entries: Parsed ``.mailmap`` entries
+            identities: Configured identities
+        """
+        entries = list(entries)
+        for identity in identities:
+            if not identity.emails:
+                continue
+            primary = identity.emails[0]
+            entries += [
+                MailmapEntry(identity.name, primary, None, email)
+                for email in identity.emails
+            ]
+            entries += [
+                MailmapEntry(identity.name, primary, alias, email)
+                for alias in identity.aliases
+                for email in identity.emails
+            ]
+
+        # Later entries override earlier ones, like later .mailmap lines
+        self._by_email: dict[str, MailmapEntry] = {}
+        self._by_name_email: dict[tuple[str, str], MailmapEntry] = {}
+        for entry in entries:
+            email = entry.commit_email.lower()
+            if entry.commit_name:
+                self._by_name_email[(entry.commit_name.lower(), email)] = entry
+            else:
+                self._by_email[email] = entry
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def resolve(self, name: str, email: str) -> tuple[str, str]:
+        """Get the canonical identity of a commit author.
+
+        Args:
+            name: Author name as recorded in the commit
+            email: Author email as recorded in the commit
+
+        Returns:
+            Tuple of (name, email) after mapping
+        """
+        lowered = email.lower()
+        entry = self._by_name_email.get((name.lower(), lowered)) or self._by_email.get(
+            lowered
+        )
+        if entry is None:
+            return name, email
+        return entry.proper_name or name, entry.proper_email or email
+
+    def canonicalize(self, commit: GitCommit) -> GitCommit:
+        """Replace a commit's author with the canonical identity (in place)."""
+        commit.author, commit.email = self.resolve(commit.author, commit.email)
+        return commit
+
+    def expand(self, author_filter: AuthorFilter) -> AuthorFilter:
+        """Expand a filter to every raw identity that resolves to it.
+
+        A commit is included if its raw or canonical email or name is in the
+        filter. Only emails are added: entries that only map a specific name at
+        an address include all commits from that address, so the expanded
+        filter can be checked on raw commit headers alone, while the names
+        stay those of the filter, as a name alone does not identify anyone.
+
+        Args:
+            author_filter: Filter on canonical or raw identities
+
+        Returns:
+            Filter on raw commit identities
+        """
+        emails = set(author_filter.emails)
+        names = author_filter.names
+        # Addresses that map to a wanted address are wanted too
+        canonical = {self.resolve("", email)[1].lower() for email in emails}
+        emails |= canonical
+        for entry in self._entries:
+            proper_email = (entry.proper_email or entry.commit_email).lower()
+            if proper_email in emails or (
+                entry.proper_name and entry.proper_name.lower() in names
+            ):
+                emails.add(entry.commit_email.lower())
+        return AuthorFilter(emails, author_filter.names)
+
+    @classmethod
+    def for_repository(
+        cls, repo_path: Path, identities: Iterable[IdentityConfig] = ()
+    ) -> "IdentityIndex":
+        """Get the index of a repository, building it on first use.
+
+        Indexes are cached per process and keyed by the repository, the
+        modification time and size of its ``.mailmap`` (the blob of
+        ``HEAD:.mailmap`` for bare mirrors) and the configured identities, so
+        every walk, patch-id and diff phase of a run shares one index.
+
+        Args:
+            repo_path: Path to the repository work tree (or bare repository)
+            identities: Configured identities
+
+        Returns:
+            Identity index
+
+        Raises:
+            RuntimeError: If git fails to read the ``.mailmap`` of a bare repository
+        """
+        identities = list(identities)
+        mailmap_path = Path(repo_path) / ".mailmap"
+        mailmap_blob = None
+        try:
+            stat = mailmap_path.stat()
+            mailmap_key: Optional[tuple] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            mailmap_key = None
+            if (Path(repo_path) / "HEAD").is_file():
+                # Bare repositories (mirrors) use the .mailmap of HEAD, as git does
+                mailmap_blob = _mailmap_blob(Path(repo_path))
+                mailmap_key = (mailmap_blob,) if mailmap_blob else None
+
+        key = (
+            str(repo_path),
+            mailmap_key,
+            tuple(identity.model_dump_json() for identity in identities),
+        )
+        index = _INDEX_CACHE.get(key)
+        if index is None:
+            entries: list[MailmapEntry] = []
+            if mailmap_blob is not None:
+                result = subprocess.run(
+                    ["git", "cat-file", "blob", mailmap_blob],
+                    cwd=repo_path,
+                    capture_output=True,
+                    check=False,
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(
+                        f"git cat-file failed in {repo_path}: "
+                        f"{result.stderr.decode(errors='replace').strip()}"
+                    )
+                entries = parse_mailmap(result.stdout.decode("utf-8", errors="replace"))
+            elif mailmap_key is not None:
+                try:
+                    entries = parse_mailmap(
+                        mailmap_path.read_text(encoding="utf-8", errors="replace")
+                    )
+                except OSError:
+                    pass
+            index = cls(entries, identities)
+            _INDEX_CACHE[key] = index
+        return index
+
+
+def _mailmap_blob(repo_path: Path) -> Optional[str]:
+    """Get the object id of ``HEAD:.mailmap`` in a bare repository, if any."""
+    result = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", "HEAD:.mailmap"],
+        cwd=repo_path,
+        capture_output=True,
+        check=False,
+    )
+    # Fails when HEAD has no .mailmap
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode().strip() or None
+
+
+_INDEX_CACHE: dict[tuple, IdentityIndex] = {}
@@ -0,0 +1,170 @@
+"""Ledger of LLM calls, kept across runs to see what each report costs."""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config.paths import get_state_dir
+from .models import ModelPrice, UsageRecord
+
+GROUP_BY_OPTIONS = ("run", "day", "model")
+
+
+def get_ledger_path() -> Path:
+    """Get the path of the usage ledger."""
+    return get_state_dir() / "usage.ndjson"
+
+
+class UsageLedger:
+    """Append-only NDJSON file with one line per LLM call."""
+
+    def __init__(self, path: Optional[Path] = None, run_id: Optional[str] = None):
+        """Initialize the ledger.
+
+        Args:
+            path: Ledger file (default: ``usage.ndjson`` in the state directory)
+            run_id: Report run recorded on every call
+        """
+        self.path = path or get_ledger_path()
+        self.run_id = run_id
+        # Calls and tokens recorded through this instance
+        self.calls = 0
+        self.tokens = 0
+        self._warned = False
+
+    def record(self, record: UsageRecord) -> None:
+        """Append a call to the ledger.
+
+        Each record is written with a single append, so concurrent runs do not
+        interleave lines. Write errors are reported once and otherwise ignored,
+        as the ledger must never fail a report.
+
+        Args:
+            record: Call to record (``run_id`` is filled in if missing)
+        """
+        if record.run_id is None:
+            record.run_id = self.run_id
+        self.calls += 1
+        self.tokens += record.input_tokens + record.output_tokens
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(record.model_dump_json() + "\n")
+        except OSError as e:
+            if not self._warned:
+                self._warned = True
+                print(
+                    f"Warning: Could not write usage ledger {self.path}: {e}",
+                    file=sys.stderr,
+                )
+
+    def read(self, since: Optional[datetime] = None) -> Iterator[UsageRecord]:
+        """Stream the recorded calls, oldest first.
+
+        Args:
+            since: Only calls made at or after this time
+
+        Yields:
+            Recorded calls (malformed lines are skipped)
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = UsageRecord.model_validate_json(line)
+                    except ValueError:
+                        continue
+                    if since and record.timestamp < since:
+                        continue
+                    yield record
+        except OSError:
+            return
+
+
+def usage_cost(record: UsageRecord, prices: dict[str, ModelPrice]) -> Optional[float]:
+    """Compute the cost of a call in US dollars.
+
+    Args:
+        record: Recorded call
+        prices: Token prices by model name
+
+    Returns:
+        Cost, or None if the model has no price
+    """
+    price = prices.get(record.model or "")
+    if price is None:
+        return None
+    cached_price = price.input if price.cached_input is None else price.cached_input
+    uncached = max(0, record.input_tokens - record.cache_read_tokens)
+    return (
+        uncached * price.input
+        + record.cache_read_tokens * cached_price
+        + record.output_tokens * price.output
+    ) / 1_000_000
+
+
+def summarize_usage(
+    records: Iterable[UsageRecord],
+    by: str = "run",
+    prices: Optional[dict[str, ModelPrice]] = None,
+) -> list[dict]:
+    """Aggregate recorded calls.
+
+    Args:
+        records: Recorded calls, oldest first
+        by: Group by ``run``, ``day`` or ``model``
+        prices: Token prices by model name
+
+    Returns:
+        One row per group in order of first appearance, with the number of
+        ``calls`` and ``errors``, token totals, the median ``latency`` and the
+        ``cost`` (None if a model in the group has no price)
+    """
+    if by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"Unknown grouping: {by}")
+    prices = prices or {}
+
+    groups: dict[str, dict] = {}
+    latencies: dict[str, list[float]] = {}
+    for record in records:
+        if by == "run":
+            key = record.run_id or "-"
+        elif by == "day":
+            key = record.timestamp.date().isoformat()
+        else:
+            key = (
+                f"{record.provider}:{record.model}" if record.model else record.provider
+            )
+
+        row = groups.get(key)
+        if row is None:
+            row = groups[key] = {
+                by: key,
+                "started": record.timestamp,
+                "calls": 0,
+                "errors": 0,
+                "input_tokens": 0,
+                "cache_read_tokens": 0,
+                "output_tokens": 0,
+                "cost": 0.0,
+            }
+            latencies[key] = []
+        row["calls"] += 1
+        row["errors"] += record.status != "ok"
+        row["input_tokens"] += record.input_tokens
+        row["cache_read_tokens"] += record.cache_read_tokens
+        row["output_tokens"] += record.output_tokens
+        latencies[key].append(record.latency)
+
+        cost = usage_cost(record, prices)
+        if cost is None:
+            if record.input_tokens or record.output_tokens:
+                row["cost"] = None
+        elif row["cost"] is not None:
+            row["cost"] += cost
+
+    for key, row in groups.items():
+        values = sorted(latencies[key])
+        row["latency"] = values[len(values) // 2] if values else 0.0
+    return list(groups.values())
@@ -0,0 +1,220 @@
+"""Bare mirrors of remote repositories, kept in the cache between runs."""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+
+from .config.paths import get_cache_dir
+from .progress import parse_transfer_size
+
+# Branches and tags only; hosting-specific refs (e.g. refs/pull/*) are skipped
+FETCH_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+
+def get_mirrors_dir() -> Path:
+    """Get (and create) the directory holding the mirrors."""
+    return get_cache_dir("mirrors")
+
+
+def mirror_path(url: str, mirrors_dir: Optional[Path] = None) -> Path:
+    """Get the mirror directory of a remote repository.
+
+    Args:
+        url: Remote repository URL
+        mirrors_dir: Directory holding all mirrors (default: ``cache/mirrors``)
+
+    Returns:
+        Path of the bare mirror (not necessarily existing yet)
+    """
+    name = url.rstrip("/").rsplit("/", 1)[-1].removesuffix(".git")
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name) or "repo"
+    digest = hashlib.sha256(url.encode()).hexdigest()[:12]
+    return (mirrors_dir or get_mirrors_dir()) / f"{name}-{digest}.git"
+
+
+def _git(args: list[str], cwd: Optional[Path] = None) -> str:
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git {args[0]} failed: {result.stderr.decode(errors='replace').strip()}"
+        )
+    return result.stdout.decode(errors="replace").strip()
+
+
+def _transfer(
+    args: list[str],
+    cwd: Optional[Path] = None,
+    on_received: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Run a clone or fetch, reporting the bytes received so far.
+
+    Args:
+        args: git command and arguments
+        cwd: Working directory
+        on_received: Called with the bytes received whenever git reports them
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    if on_received is None:
+        _git([args[0], "--quiet", *args[1:]], cwd=cwd)
+        return
+
+    process = subprocess.Popen(
+        ["git", args[0], "--progress", *args[1:]],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    # Progress lines end in carriage returns; other lines are kept for errors
+    messages: deque[str] = deque(maxlen=20)
+    buffer = b""
+    for chunk in iter(lambda: process.stderr.read1(4096), b""):
+        *lines, buffer = re.split(rb"[\r\n]", buffer + chunk)
+        for line in lines:
+            text = line.decode(errors="replace")
+            if text.startswith("Receiving objects:"):
+                received = parse_transfer_size(text)
+                if received is not None:
+                    on_received(received)
+            elif text and "%" not in text:
+                messages.append(text)
+    process.stderr.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"git {args[0]} failed: {' '.join(messages).strip()}")
+
+
+def _configure_origin(path: Path, url: str) -> None:
+    _git(["remote", "add", "origin", url], cwd=path)
+    _git(["config", "--unset-all", "remote.origin.fetch"], cwd=path)
+    for refspec in FETCH_REFSPECS:
+        _git(["config", "--add", "remote.origin.fetch", refspec], cwd=path)
+
+
+def update_mirror(
+    url: str,
+    mirrors_dir: Optional[Path] = None,
+    on_received: Optional[Callable[[int], None]] = None,
+) -> Path:
+    """Create or refresh the mirror of a remote repository.
+
+    The first use clones the repository; later uses only fetch what changed.
+    If the remote cannot be reached, an existing mirror is used as it is.
+
+    Args:
+        url: Remote repository URL
+        mirrors_dir: Directory holding all mirrors (default: ``cache/mirrors``)
+        on_received: Called with the bytes received so far during the transfer
+
+    Returns:
+        Path of the bare mirror
+
+    Raises:
+        RuntimeError: If the repository cannot be cloned
+    """
+    path = mirror_path(url, mirrors_dir)
+    if (path / "HEAD").is_file():
+        try:
+            _transfer(["fetch", "--prune", "origin"], cwd=path, on_received=on_received)
+        except RuntimeError as e:
+            print(f"Warning: Using cached mirror of {url}: {e}", file=sys.stderr)
+        return path
+
+    # Clone next to the mirror and rename, so an interrupted clone leaves
+    # no half-populated mirror behind
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    try:
+        _transfer(["clone", "--bare", url, str(tmp_path)], on_received=on_received)
+        _git(["remote", "remove", "origin"], cwd=tmp_path)
+        _configure_origin(tmp_path, url)
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return path
+
+
+def list_mirrors(mirrors_dir: Optional[Path] = None) -> list[tuple[Path, str]]:
+    """List the mirrors in the cache.
+
+    Args:
+        mirrors_dir: Directory holding all mirrors (default: ``cache/mirrors``)
+
+    Returns:
+        Tuples of (mirror path, remote URL)
+    """
+    mirrors = []
+    for path in sorted((mirrors_dir or get_mirrors_dir()).glob("*.git")):
+        try:
+            url = _git(["config", "--get", "remote.origin.url"], cwd=path)
+        except RuntimeError:
+            continue
+        mirrors.append((path, url))
+    return mirrors
+
+
+def bundle_mirror(path: Path, bundle_path: Path) -> Optional[str]:
+    """Write every branch and tag of a mirror to a git bundle.
+
+    Args:
+        path: Mirror path
+        bundle_path: Bundle file to create
+
+    Returns:
+        The ref HEAD points at, or None if the mirror has no refs to bundle
+    """
+    if not _git(["for-each-ref", "--count=1"], cwd=path):
+        return None
+    _git(
+        ["bundle", "create", "--quiet", str(bundle_path), "--branches", "--tags"],
+        cwd=path,
+    )
+    return _git(["symbolic-ref", "-q", "HEAD"], cwd=path) or None
+
+
+def restore_mirror(
+    bundle_path: Path,
+    url: str,
+    head: Optional[str],
+    mirrors_dir: Optional[Path] = None,
+) -> bool:
+    """Create the mirror of a remote repository from a bundle.
+
+    The bundle is verified first. Existing mirrors are kept, as they may be
+    newer than the bundle.
+
+    Args:
+        bundle_path: Bundle written by :func:`bundle_mirror`
+        url: Remote repository URL the mirror fetches from
+        head: Ref HEAD points at
+        mirrors_dir: Directory holding all mirrors (default: ``cache/mirrors``)
+
+    Returns:
+        Whether the mirror was created
+
+    Raises:
+        RuntimeError: If the bundle is invalid
+    """
+    path = mirror_path(url, mirrors_dir)
+    if (path / "HEAD").is_file():
+        return False
+
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    try:
+        _git(["init", "--bare", "--quiet", str(tmp_path)])
+        _git(["bundle", "verify", "--quiet", str(bundle_path)], cwd=tmp_path)
+        _git(["fetch", "--quiet", str(bundle_path), *FETCH_REFSPECS], cwd=tmp_path)
+        if head:
+            _git(["symbolic-ref", "HEAD", head], cwd=tmp_path)
+        _configure_origin(tmp_path, url)
+        os.replace(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return True
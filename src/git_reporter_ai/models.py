@@ -2,9 +2,9 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ReportPeriod(str, Enum):
@@ -16,6 +16,7 @@ class ReportPeriod(str, Enum):
     QUARTERLY = "quarterly"
     YEARLY = "yearly"
     CUSTOM = "custom"
+    SINCE_LAST = "since_last"
 
 
 class AIProvider(str, Enum):
@@ -23,6 +24,19 @@ class AIProvider(str, Enum):
 
     OPENAI = "openai"
     GEMINI = "gemini"
+    LOCAL = "local"
+
+
+class GitBackendType(str, Enum):
+    """Backends used to walk a repository's commit history."""
+
+    GITPYTHON = "gitpython"
+    CLI = "cli"
+    REST = "rest"
+
+
+# Changed file paths recorded per commit; huge commits keep only the first ones
+MAX_COMMIT_PATHS = 32
 
 
 class GitCommit(BaseModel):
@@ -37,6 +51,31 @@ class GitCommit(BaseModel):
     files_changed: int = Field(default=0, description="Number of files changed")
     insertions: int = Field(default=0, description="Number of insertions")
     deletions: int = Field(default=0, description="Number of deletions")
+    paths: list[str] = Field(
+        default_factory=list,
+        description="Paths of changed files (at most MAX_COMMIT_PATHS)",
+    )
+    repositories: list[str] = Field(
+        default_factory=list,
+        description="All repositories this commit was found in (set by deduplication)",
+    )
+    diff_excerpt: Optional[str] = Field(
+        default=None,
+        description="Size-capped excerpt of the diff (set when diff context is enabled)",
+    )
+
+
+class IdentityConfig(BaseModel):
+    """A person who commits under several emails or names."""
+
+    name: str = Field(..., description="Canonical name of the person")
+    emails: list[str] = Field(
+        default_factory=list,
+        description="Emails the person commits from; the first one is canonical",
+    )
+    aliases: list[str] = Field(
+        default_factory=list, description="Other names the person commits under"
+    )
 
 
 class RepositoryConfig(BaseModel):
@@ -48,6 +87,27 @@ class RepositoryConfig(BaseModel):
     author_email: Optional[str] = Field(
         None, description="Filter commits by author email"
     )
+    author_emails: list[str] = Field(
+        default_factory=list, description="Further author emails to include"
+    )
+    author: Optional[str] = Field(
+        None, description="Filter commits by a person defined in 'identities'"
+    )
+    refs: list[str] = Field(
+        default_factory=list,
+        description="Ref patterns whose history is walked, e.g. 'main' or "
+        "'release/*' (all refs if empty)",
+    )
+    exclude_refs: list[str] = Field(
+        default_factory=list, description="Ref patterns that are not walked"
+    )
+    backend: Optional[GitBackendType] = Field(
+        None, description="Git backend for this repository (uses git_backend if None)"
+    )
+    api_url: Optional[str] = Field(
+        None,
+        description="REST API base URL for the rest backend (derived from 'repo' if None)",
+    )
 
     def get_repo_location(self) -> str:
         """Get the repository location (either local path or remote URL)."""
@@ -61,6 +121,38 @@ class RepositoryConfig(BaseModel):
             )
 
 
+class WorkspaceConfig(BaseModel):
+    """A directory scanned for git repositories."""
+
+    root: str = Field(..., description="Directory containing repository checkouts")
+    author_email: Optional[str] = Field(
+        None, description="Filter commits of discovered repositories by author email"
+    )
+    author_emails: list[str] = Field(
+        default_factory=list, description="Further author emails to include"
+    )
+    author: Optional[str] = Field(
+        None, description="Filter commits by a person defined in 'identities'"
+    )
+    exclude: list[str] = Field(
+        default_factory=list,
+        description="Additional directory name patterns to skip while scanning",
+    )
+    max_depth: int = Field(
+        default=4, ge=0, description="Maximum directory depth below the root"
+    )
+
+
+class ModelPrice(BaseModel):
+    """Price of a model's tokens, in US dollars per million tokens."""
+
+    input: float = Field(..., ge=0, description="Price of prompt tokens")
+    cached_input: Optional[float] = Field(
+        None, ge=0, description="Price of prompt cache hits (defaults to input)"
+    )
+    output: float = Field(..., ge=0, description="Price of generated tokens")
+
+
 class Config(BaseModel):
     """Main configuration for git-reporter."""
 
@@ -71,18 +163,145 @@ class Config(BaseModel):
         description="List of repositories to analyze",
         alias="repositories",  # Support both 'repos' and 'repositories' for backwards compatibility
     )
+    workspaces: list[WorkspaceConfig] = Field(
+        default_factory=list,
+        description="Directories scanned for repositories in addition to 'repos'",
+    )
+    workspace_rescan_interval: float = Field(
+        default=600.0,
+        ge=0,
+        description="Seconds a workspace scan is reused before reports scan the "
+        "workspaces again ('discover' always rescans)",
+    )
+    identities: list[IdentityConfig] = Field(
+        default_factory=list,
+        description="People committing under several emails or names",
+    )
     ai_provider: AIProvider = Field(
         default=AIProvider.OPENAI, description="AI provider to use"
     )
     openai_api_key: Optional[str] = Field(None, description="OpenAI API key")
     openai_model: str = Field(default="gpt-4o-mini", description="OpenAI model to use")
+    openai_base_url: Optional[str] = Field(
+        None, description="OpenAI-compatible API endpoint (defaults to OpenAI)"
+    )
     gemini_api_key: Optional[str] = Field(None, description="Google Gemini API key")
     gemini_model: str = Field(
         default="gemini-2.0-flash-exp", description="Gemini model to use"
     )
+    github_token: Optional[str] = Field(
+        None, description="GitHub token for the rest backend"
+    )
+    gitlab_token: Optional[str] = Field(
+        None, description="GitLab token for the rest backend"
+    )
     default_period: ReportPeriod = Field(
         default=ReportPeriod.WEEKLY, description="Default report period"
     )
+    llm_requests_per_minute: Optional[int] = Field(
+        None, description="Maximum LLM requests per minute (None = unlimited)"
+    )
+    llm_tokens_per_minute: Optional[int] = Field(
+        None, description="Maximum estimated LLM tokens per minute (None = unlimited)"
+    )
+    llm_max_in_flight: int = Field(
+        default=4, ge=1, description="Maximum concurrent LLM requests"
+    )
+    llm_max_retries: int = Field(
+        default=5, ge=0, description="Retries for rate-limited or failed LLM requests"
+    )
+    llm_timeout: Optional[float] = Field(
+        default=300.0, description="Timeout in seconds for a single LLM request"
+    )
+    max_tokens_per_run: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Maximum LLM tokens (prompt and output) spent by one report run; "
+        "prompts are shrunk to fit (None = unlimited)",
+    )
+    model_prices: dict[str, ModelPrice] = Field(
+        default_factory=dict,
+        description="Token prices by model name, used to show costs in 'usage'",
+    )
+    hedge_provider: Optional[AIProvider] = Field(
+        None,
+        description="Secondary provider sent the request when ai_provider is slow "
+        "(None = no hedging)",
+    )
+    hedge_model: Optional[str] = Field(
+        None, description="Model of the secondary provider (uses its configured model)"
+    )
+    hedge_base_url: Optional[str] = Field(
+        None, description="OpenAI-compatible endpoint of an OpenAI secondary provider"
+    )
+    hedge_delay: float = Field(
+        default=10.0,
+        ge=0,
+        description="Seconds to wait for ai_provider before sending the hedge request",
+    )
+    git_backend: GitBackendType = Field(
+        default=GitBackendType.GITPYTHON,
+        description="Default git backend used to walk commit history",
+    )
+    stats_workers: Optional[int] = Field(
+        default=1,
+        ge=1,
+        description="Processes computing commit stats for large ranges in the cli "
+        "backend (1 = single process, None = one per CPU core); opt-in because "
+        "workers start from a fork server or a fresh interpreter, not a fork",
+    )
+    skip_stale_refs: bool = Field(
+        default=True,
+        description="Do not walk refs whose tip is older than the report period",
+    )
+    mirror_remotes: bool = Field(
+        default=False,
+        description="Keep remote repositories as mirrors in the cache and fetch "
+        "them incrementally (False clones them to a temporary directory per run)",
+    )
+    deduplicate_commits: bool = Field(
+        default=True,
+        description="Collapse commits that appear in several repositories (same SHA)",
+    )
+    detect_cherry_picks: bool = Field(
+        default=True,
+        description="Also collapse equivalent changes by git patch-id",
+    )
+    cluster_themes: bool = Field(
+        default=True,
+        description="Group large commit sets into themes locally before summarizing",
+    )
+    theme_min_commits: int = Field(
+        default=50,
+        ge=2,
+        description="Minimum number of commits before themes are clustered",
+    )
+    theme_max_commits: Optional[int] = Field(
+        default=20,
+        ge=1,
+        description="Largest commits listed per theme; the rest are counted "
+        "(None = list every commit)",
+    )
+    diff_context: bool = Field(
+        default=False,
+        description="Add diff excerpts of selected commits to LLM prompts",
+    )
+    diff_context_tokens: int = Field(
+        default=4000,
+        ge=0,
+        description="Estimated prompt tokens available for all diff excerpts",
+    )
+    diff_excerpt_chars: int = Field(
+        default=1200,
+        gt=0,
+        description="Maximum size of a single diff excerpt in characters",
+    )
+    commit_memory_budget_mb: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Memory budget for collected commits in MiB; "
+        "larger histories are spilled to temporary files (unlimited if None)",
+    )
 
 
 class ReportRequest(BaseModel):
@@ -98,6 +317,51 @@ class ReportRequest(BaseModel):
     )
 
 
+class TokenUsage(BaseModel):
+    """Token usage of LLM requests."""
+
+    requests: int = Field(default=0, description="Number of model requests")
+    input_tokens: int = Field(default=0, description="Prompt tokens sent")
+    cache_read_tokens: int = Field(
+        default=0, description="Prompt tokens served from the provider's prompt cache"
+    )
+    output_tokens: int = Field(default=0, description="Tokens generated")
+
+    def add(
+        self,
+        requests: int = 0,
+        input_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """Add the usage of further requests."""
+        self.requests += requests
+        self.input_tokens += input_tokens
+        self.cache_read_tokens += cache_read_tokens
+        self.output_tokens += output_tokens
+
+
+class UsageRecord(BaseModel):
+    """One LLM call recorded in the usage ledger."""
+
+    timestamp: datetime = Field(
+        default_factory=datetime.now, description="When the call finished"
+    )
+    run_id: Optional[str] = Field(None, description="Report run that made the call")
+    provider: str = Field(..., description="AI provider")
+    model: Optional[str] = Field(None, description="Model name")
+    status: str = Field(
+        default="ok", description="Outcome: 'ok', 'error' or 'cancelled'"
+    )
+    latency: float = Field(default=0.0, description="Duration of the call in seconds")
+    requests: int = Field(default=0, description="Number of model requests")
+    input_tokens: int = Field(default=0, description="Prompt tokens sent")
+    cache_read_tokens: int = Field(
+        default=0, description="Prompt tokens served from the provider's prompt cache"
+    )
+    output_tokens: int = Field(default=0, description="Tokens generated")
+
+
 class Report(BaseModel):
     """Generated report."""
 
@@ -109,3 +373,30 @@ class Report(BaseModel):
     generated_at: datetime = Field(
         default_factory=datetime.now, description="When the report was generated"
     )
+    usage: Optional[TokenUsage] = Field(
+        default=None, description="LLM token usage (None for the local provider)"
+    )
+
+    # Streaming source of the commits when they are not held in ``commits``
+    _commit_source: Optional[Iterable[GitCommit]] = PrivateAttr(default=None)
+
+    def set_commit_source(self, source: Iterable[GitCommit]) -> None:
+        """Stream commits from a re-iterable source instead of ``commits``.
+
+        Args:
+            source: Re-iterable, sized collection of commits (e.g. a spool)
+        """
+        self._commit_source = source
+
+    def iter_commits(self) -> Iterator[GitCommit]:
+        """Iterate over the commits of the report, newest first."""
+        if self._commit_source is not None:
+            return iter(self._commit_source)
+        return iter(self.commits)
+
+    @property
+    def total_commits(self) -> int:
+        """Number of commits in the report."""
+        if self._commit_source is not None:
+            return len(self._commit_source)
+        return len(self.commits)
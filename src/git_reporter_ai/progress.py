@@ -0,0 +1,207 @@
+"""Live progress of a report run, read by the terminal dashboard.
+
+The analyzer, its backend and the report generator update plain counters on
+these objects; the dashboard reads them a few times per second from its own
+thread. Walks therefore pay a few attribute updates per commit, and nothing is
+rendered or dispatched from the hot loops.
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .ai.scheduler import RequestScheduler
+    from .ledger import UsageLedger
+
+_SIZE_PATTERN = re.compile(r"([\d.]+) (bytes|KiB|MiB|GiB)")
+_SIZE_UNITS = {"bytes": 1, "KiB": 1 << 10, "MiB": 1 << 20, "GiB": 1 << 30}
+
+
+def parse_transfer_size(text: str) -> Optional[int]:
+    """Read the amount received from a git transfer progress line.
+
+    Args:
+        text: Progress text, e.g. ``Receiving objects:  45% (450/1000),
+            1.20 MiB | 2.00 MiB/s``
+
+    Returns:
+        Bytes received, or None if the text has no size
+    """
+    match = _SIZE_PATTERN.search(text)
+    if match is None:
+        return None
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+class RepoProgress:
+    """Progress of one repository: transfer, walk and outcome."""
+
+    def __init__(self, name: str):
+        """Initialize the progress of a repository that has not started.
+
+        Args:
+            name: Repository name
+        """
+        self.name = name
+        # queued, cloning, fetching, walking, restored, done or failed
+        self.phase = "queued"
+        self.received_bytes = 0
+        # Commits read from the history, and those passing every filter
+        self.scanned = 0
+        self.kept = 0
+        # Commit time (Unix seconds) the walk has reached
+        self.cursor: Optional[float] = None
+        # Commits the walk will keep, when known in advance (sharded walks)
+        self.total: Optional[int] = None
+        self.since: Optional[float] = None
+        self.until: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def start_walk(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> None:
+        """Mark the start of the history walk.
+
+        Args:
+            start_date: Start of the walked period, if bounded
+            end_date: End of the walked period (now if None)
+        """
+        self.phase = "walking"
+        self.started_at = time.monotonic()
+        self.since = start_date.timestamp() if start_date else None
+        self.until = end_date.timestamp() if end_date else time.time()
+
+    def finish(self, error: Optional[str] = None) -> None:
+        """Mark the repository as done, or failed with an error."""
+        if self.phase != "restored":
+            self.phase = "failed" if error else "done"
+        self.error = error
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent walking so far."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Commits processed per second (kept ones once a total is known)."""
+        elapsed = self.elapsed
+        processed = self.kept if self.total is not None else self.scanned
+        return processed / elapsed if elapsed > 0 else 0.0
+
+    def fraction(self) -> Optional[float]:
+        """Estimate the completed fraction of the walk.
+
+        Sharded walks know how many commits they will keep. Other walks go
+        newest first, so the commit time reached tells how much of the
+        period is left.
+
+        Returns:
+            Fraction between 0 and 1, or None if it cannot be estimated
+        """
+        if self.phase in ("done", "restored"):
+            return 1.0
+        if self.total:
+            return min(1.0, self.kept / self.total)
+        if self.cursor is None or self.since is None or self.until is None:
+            return None
+        span = self.until - self.since
+        if span <= 0:
+            return None
+        return min(1.0, max(0.0, (self.until - self.cursor) / span))
+
+    def eta(self) -> Optional[float]:
+        """Estimate the seconds left in the walk, or None if unknown."""
+        if self.phase != "walking":
+            return None
+        fraction = self.fraction()
+        if not fraction:
+            return None
+        return self.elapsed * (1 - fraction) / fraction
+
+
+class LLMProgress:
+    """Status of the summary requests, read from their schedulers and ledger."""
+
+    def __init__(self):
+        """Initialize the status of a run that has made no requests."""
+        # idle, running, done or failed
+        self.phase = "idle"
+        self.label: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.schedulers: list[RequestScheduler] = []
+        self.ledger: Optional[UsageLedger] = None
+
+    def start(self, label: str, ledger: Optional["UsageLedger"] = None) -> None:
+        """Mark the start of the summary.
+
+        Args:
+            label: Provider and model generating the summary
+            ledger: Usage ledger of the run, counting completed calls
+        """
+        self.phase = "running"
+        self.label = label
+        self.ledger = ledger
+        self.started_at = time.monotonic()
+
+    def finish(self, failed: bool = False) -> None:
+        """Mark the summary as generated, or failed."""
+        self.phase = "failed" if failed else "done"
+        self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent on the summary so far."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot or for the rate limits."""
+        return sum(scheduler.queued for scheduler in self.schedulers)
+
+    @property
+    def in_flight(self) -> int:
+        """Requests sent and awaiting their response."""
+        return sum(scheduler.in_flight for scheduler in self.schedulers)
+
+    @property
+    def retries(self) -> int:
+        """Requests retried after a rate limit, timeout or error."""
+        return sum(scheduler.metrics.retries for scheduler in self.schedulers)
+
+
+class ProgressTracker:
+    """Progress of a report run, shared by the generator and the dashboard."""
+
+    def __init__(self):
+        """Initialize an empty tracker."""
+        self.phase = "Starting"
+        # Appended in order; read as a snapshot by the dashboard thread
+        self.repos: list[RepoProgress] = []
+        self._by_name: dict[str, RepoProgress] = {}
+        self.llm = LLMProgress()
+
+    def repo(self, name: str) -> RepoProgress:
+        """Get the progress of a repository, adding it if needed.
+
+        Args:
+            name: Repository name
+
+        Returns:
+            Progress of the repository
+        """
+        progress = self._by_name.get(name)
+        if progress is None:
+            progress = self._by_name[name] = RepoProgress(name)
+            self.repos.append(progress)
+        return progress
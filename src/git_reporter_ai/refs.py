@@ -0,0 +1,130 @@
+"""Selection of the refs whose history is walked."""
+
+import fnmatch
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Peeled values (%(*...)) are set for annotated tags and point at the commit
+REF_FORMAT = (
+    "%(objectname)%00%(objecttype)%00%(committerdate:unix)%00"
+    "%(*objectname)%00%(*objecttype)%00%(*committerdate:unix)%00%(refname)"
+)
+_SHORT_PREFIXES = ("refs/heads/", "refs/remotes/", "refs/tags/", "refs/")
+
+
+class Ref:
+    """A ref pointing at a commit."""
+
+    def __init__(self, name: str, sha: str, timestamp: int):
+        """Initialize the ref.
+
+        Args:
+            name: Full ref name (e.g. ``refs/heads/main``) or ``HEAD``
+            sha: Commit the ref points at (annotated tags are peeled)
+            timestamp: Committer time of that commit (Unix seconds)
+        """
+        self.name = name
+        self.sha = sha
+        self.timestamp = timestamp
+
+    @property
+    def short_name(self) -> str:
+        """Name without its ``refs/...`` prefix, e.g. ``main`` or ``origin/main``."""
+        for prefix in _SHORT_PREFIXES:
+            if self.name.startswith(prefix):
+                return self.name[len(prefix) :]
+        return self.name
+
+    def matches(self, patterns: Iterable[str]) -> bool:
+        """Whether the full or short name matches any shell-style pattern."""
+        return any(
+            fnmatch.fnmatchcase(self.name, pattern)
+            or fnmatch.fnmatchcase(self.short_name, pattern)
+            for pattern in patterns
+        )
+
+
+def list_refs(repo_path: Path) -> list[Ref]:
+    """List the refs of a repository that point at commits, plus ``HEAD``.
+
+    A single ``git for-each-ref`` reads every ref with its tip date, so even
+    repositories with thousands of refs are listed without walking history.
+
+    Args:
+        repo_path: Path to the repository
+
+    Returns:
+        Refs pointing at commits (refs to trees or blobs are skipped)
+
+    Raises:
+        RuntimeError: If git fails
+    """
+    result = subprocess.run(
+        ["git", "for-each-ref", f"--format={REF_FORMAT}"],
+        cwd=repo_path,
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git for-each-ref failed in {repo_path}: "
+            f"{result.stderr.decode(errors='replace').strip()}"
+        )
+
+    refs = []
+    for line in result.stdout.decode(errors="replace").splitlines():
+        sha, kind, timestamp, peeled, peeled_kind, peeled_timestamp, name = line.split(
+            "\0"
+        )
+        if kind == "commit":
+            refs.append(Ref(name, sha, int(timestamp)))
+        elif peeled_kind == "commit":
+            refs.append(Ref(name, peeled, int(peeled_timestamp)))
+
+    # Fails on an unborn HEAD (no commits yet), which then has no tip
+    head = subprocess.run(
+        ["git", "show", "-s", "--format=%H%x00%ct", "HEAD"],
+        cwd=repo_path,
+        capture_output=True,
+        check=False,
+    )
+    if head.returncode == 0 and head.stdout.strip():
+        sha, timestamp = head.stdout.decode().strip().split("\0")
+        refs.append(Ref("HEAD", sha, int(timestamp)))
+    return refs
+
+
+def select_tips(
+    refs: Iterable[Ref],
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = (),
+    since: Optional[datetime] = None,
+) -> list[str]:
+    """Choose the commits the history walk starts from.
+
+    Args:
+        refs: Refs of the repository
+        include: Ref patterns to walk (all refs if empty)
+        exclude: Ref patterns to skip
+        since: Skip stale refs whose tip was committed before this time;
+            everything reachable from them is older as well
+
+    Returns:
+        Distinct tip SHAs, in ref order
+    """
+    include = list(include)
+    exclude = list(exclude)
+    since_ts = since.timestamp() if since else None
+
+    tips: dict[str, None] = {}
+    for ref in refs:
+        if include and not ref.matches(include):
+            continue
+        if exclude and ref.matches(exclude):
+            continue
+        if since_ts is not None and ref.timestamp < since_ts:
+            continue
+        tips[ref.sha] = None
+    return list(tips)
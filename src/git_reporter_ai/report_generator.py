@@ -1,25 +1,89 @@
 """Report generator that coordinates git analysis and AI generation."""
 
+import sys
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
-
-from .ai import GeminiProvider, OpenAIProvider
+from typing import Collection, Iterable, Iterator, Optional
+
+from .ai import (
+    GeminiProvider,
+    HedgedProvider,
+    HedgeMetrics,
+    LocalProvider,
+    OpenAIProvider,
+    RequestScheduler,
+    TokenBudget,
+)
+from .ai.base import AIProvider as BaseAIProvider
+from .backends import resolve_api
+from .checkpoint import RunCheckpoint, prune_runs
 from .config import ConfigManager
+from .dedup import deduplicate_commits, deduplicate_sorted
+from .diff_context import DiffExcerptCache, select_commits
 from .git_analyzer import GitAnalyzer
-from .models import AIProvider, Report, ReportPeriod, ReportRequest
+from .ledger import UsageLedger
+from .models import (
+    AIProvider,
+    Config,
+    GitCommit,
+    Report,
+    ReportPeriod,
+    ReportRequest,
+    RepositoryConfig,
+    TokenUsage,
+)
+from .progress import ProgressTracker
+from .spill import CommitSpool
+from .themes import ThemeClusterer
+from .watermarks import Watermark, WatermarkStore
 
 
 class ReportGenerator:
     """Generates reports from git commit history using AI."""
 
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        config: Optional[Config] = None,
+        progress: Optional[ProgressTracker] = None,
+    ):
         """Initialize the report generator.
 
         Args:
             config_manager: Configuration manager instance
+            config: Already loaded (and possibly overridden) configuration;
+                loaded from the config manager if None
+            progress: Progress tracker updated as the run goes, e.g. for a
+                live dashboard (a private one if None)
         """
         self.config_manager = config_manager
-        self.config = config_manager.load()
+        self.config = config or config_manager.load()
+        self.repos = config_manager.resolve_repositories(self.config)
+        self.progress = progress or ProgressTracker()
+        # One scheduler per provider, shared by every request made through it
+        self._schedulers: dict[AIProvider, RequestScheduler] = {}
+        # Hedge rate and latency wins across every report of this generator
+        self.hedge_metrics = HedgeMetrics()
+
+    def _get_scheduler(self, provider: AIProvider) -> RequestScheduler:
+        """Get the shared request scheduler for an AI provider.
+
+        Args:
+            provider: AI provider
+
+        Returns:
+            Request scheduler configured from the rate limit settings
+        """
+        if provider not in self._schedulers:
+            self._schedulers[provider] = RequestScheduler(
+                requests_per_minute=self.config.llm_requests_per_minute,
+                tokens_per_minute=self.config.llm_tokens_per_minute,
+                max_in_flight=self.config.llm_max_in_flight,
+                max_retries=self.config.llm_max_retries,
+                timeout=self.config.llm_timeout,
+            )
+            self.progress.llm.schedulers.append(self._schedulers[provider])
+        return self._schedulers[provider]
 
     def _get_date_range(
         self,
@@ -31,7 +95,8 @@ class ReportGenerator:
 
         Args:
             period: Report period
-            start_date: Override start date
+            start_date: Override start date (for ``since_last``, the end of
+                the last report)
             end_date: Override end date
 
         Returns:
@@ -44,6 +109,12 @@ class ReportGenerator:
                 raise ValueError("Custom period requires both start_date and end_date")
             return start_date, end_date
 
+        elif period == ReportPeriod.SINCE_LAST:
+            # Continue from the last report; the first one covers this week
+            if start_date is None:
+                start_date, _ = self._get_date_range(ReportPeriod.WEEKLY)
+            return start_date, now
+
         elif period == ReportPeriod.DAILY:
             start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             end = now
@@ -87,11 +158,24 @@ class ReportGenerator:
 
         return start, end
 
-    async def generate(self, request: ReportRequest) -> Report:
+    async def generate(self, request: ReportRequest, resume: bool = False) -> Report:
         """Generate a report based on the request.
 
+        Completed phases (the commits of every repository, the summary) are
+        checkpointed to a run directory keyed by the request when the run
+        fails. With ``resume``, phases completed by an earlier attempt of the
+        same request are reused, so a retry only redoes the work that failed,
+        and every phase is checkpointed as soon as it completes. The
+        checkpoint is deleted once the report has been generated.
+
+        A ``since_last`` report only covers the commits added since the last
+        ``since_last`` report of the same repositories and authors. The
+        watermarks recording how far each repository was reported move once
+        the report has been generated.
+
         Args:
             request: Report request
+            resume: Reuse the checkpoints of an earlier attempt
 
         Returns:
             Generated report
@@ -99,86 +183,515 @@ class ReportGenerator:
         Raises:
             ValueError: If configuration is invalid
         """
-        # Get date range
-        start_date, end_date = self._get_date_range(
-            request.period, request.start_date, request.end_date
+        prune_runs()
+        # Without resume, the checkpoint is only written if the run fails
+        checkpoint = RunCheckpoint.for_request(
+            request,
+            self._requested_repos(request),
+            self.config.identities,
+            deferred=not resume,
+        )
+        if not resume:
+            checkpoint.reset()
+
+        watermarks: dict[str, Watermark] = {}
+        start_date, end_date, commits = self.collect_commits(
+            request,
+            diff_context=self.config.diff_context
+            and self.config.ai_provider != AIProvider.LOCAL,
+            checkpoint=checkpoint,
+            watermarks=watermarks,
         )
 
-        # Collect commits from all configured repositories
-        all_commits = []
-        repos_to_analyze = request.repositories or [r.name for r in self.config.repos]
+        # Generate AI summary
+        provider_id = self._provider_id()
+        restored = checkpoint.load_summary(provider_id) if resume else None
+        self.progress.phase = "Generating summary"
+        if restored:
+            summary, usage = restored
+        else:
+            try:
+                summary, usage = await self._generate_summary(
+                    commits,
+                    request.period,
+                    ledger=UsageLedger(run_id=uuid.uuid4().hex[:12]),
+                    budget=TokenBudget(self.config.max_tokens_per_run)
+                    if self.config.max_tokens_per_run
+                    else None,
+                )
+            except BaseException:
+                checkpoint.flush(commits)
+                raise
+            checkpoint.save_summary(provider_id, summary, usage)
+
+        if request.period == ReportPeriod.SINCE_LAST:
+            # The delta is reported; the next run starts from the new watermarks
+            self._watermark_store(request).save(watermarks)
+        checkpoint.reset()
+        self.progress.phase = "Done"
+
+        if not commits.spilled:
+            return Report(
+                period=request.period,
+                start_date=start_date,
+                end_date=end_date,
+                commits=list(commits),
+                summary=summary,
+                usage=usage,
+            )
 
-        for repo_config in self.config.repos:
-            if repo_config.name not in repos_to_analyze:
-                continue
+        # Too large to hold in memory: the report streams from the spool
+        report = Report(
+            period=request.period,
+            start_date=start_date,
+            end_date=end_date,
+            commits=[],
+            summary=summary,
+            usage=usage,
+        )
+        report.set_commit_source(commits)
+        return report
+
+    def _requested_repos(self, request: ReportRequest) -> list[RepositoryConfig]:
+        """Get the configured repositories a request covers."""
+        if not request.repositories:
+            return self.repos
+        return [r for r in self.repos if r.name in request.repositories]
+
+    def _watermark_store(self, request: ReportRequest) -> WatermarkStore:
+        """Get the watermarks of the repositories and authors of a request."""
+        return WatermarkStore.for_repositories(
+            self._requested_repos(request), self.config.identities
+        )
 
+    def _provider_id(self) -> str:
+        """Identify the configured providers and models, to validate checkpoints."""
+        provider_id = self._describe_provider(self.config.ai_provider, None, None)
+        if self.config.hedge_provider is not None:
+            provider_id += "|" + self._describe_provider(
+                self.config.hedge_provider,
+                self.config.hedge_model,
+                self.config.hedge_base_url,
+            )
+        return provider_id
+
+    def _describe_provider(
+        self, provider: AIProvider, model: Optional[str], base_url: Optional[str]
+    ) -> str:
+        """Describe a provider and its model, overriding the configured ones."""
+        if provider == AIProvider.OPENAI:
+            return (
+                f"openai:{model or self.config.openai_model}:"
+                f"{base_url or self.config.openai_base_url or ''}"
+            )
+        if provider == AIProvider.GEMINI:
+            return f"gemini:{model or self.config.gemini_model}"
+        return provider.value
+
+    def _get_analyzer(
+        self, analyzers: dict[str, GitAnalyzer], name: str
+    ) -> GitAnalyzer:
+        """Get the open analyzer of a repository, opening it if needed.
+
+        Repositories restored from a checkpoint are only opened when a later
+        phase (patch-ids, diff excerpts) actually needs them.
+
+        Args:
+            analyzers: Open analyzers by repository name
+            name: Repository name
+
+        Returns:
+            Git analyzer
+        """
+        if name not in analyzers:
+            repo_config = next(r for r in self.repos if r.name == name)
+            analyzers[name] = GitAnalyzer(
+                repo_config,
+                backend=repo_config.backend or self.config.git_backend,
+                identities=self.config.identities,
+                skip_stale_refs=self.config.skip_stale_refs,
+                api_token=self._api_token(repo_config),
+                stats_workers=self.config.stats_workers,
+                mirror_remotes=self.config.mirror_remotes,
+                progress=self.progress.repo(name),
+            )
+        return analyzers[name]
+
+    def _api_token(self, repo_config: RepositoryConfig) -> Optional[str]:
+        """Get the REST API token for a remote repository, if any."""
+        if not repo_config.repo:
+            return None
+        try:
+            _, gitlab = resolve_api(repo_config.repo, repo_config.api_url)
+        except ValueError:
+            return None
+        return self.config.gitlab_token if gitlab else self.config.github_token
+
+    def collect_commits(
+        self,
+        request: ReportRequest,
+        diff_context: bool = False,
+        checkpoint: Optional[RunCheckpoint] = None,
+        watermarks: Optional[dict[str, Watermark]] = None,
+    ) -> tuple[datetime, datetime, CommitSpool]:
+        """Collect, deduplicate and sort commits for a request.
+
+        Commits are streamed from every repository into a spool that stays
+        within ``commit_memory_budget_mb`` by spilling sorted runs to disk.
+
+        Args:
+            request: Report request
+            diff_context: Attach diff excerpts to the commits selected within
+                ``diff_context_tokens``
+            checkpoint: Run checkpoint; repositories it already holds are
+                restored instead of walked, and new walks are recorded in it
+                (a deferred checkpoint is written if the walks are interrupted)
+            watermarks: Filled with the new watermark of every repository
+                walked for a ``since_last`` request
+
+        Returns:
+            Tuple of (start_date, end_date, commits newest first)
+        """
+        since_last = request.period == ReportPeriod.SINCE_LAST
+        last_marks = self._watermark_store(request).load() if since_last else {}
+        if watermarks is None:
+            watermarks = {}
+        if since_last and checkpoint:
+            watermarks.update(checkpoint.load_watermarks())
+
+        # Get date range; a resumed run keeps the range of its first attempt
+        date_range = checkpoint.load_date_range() if checkpoint else None
+        if date_range:
+            start_date, end_date = date_range
+        else:
+            last_reported = [mark.reported_at for mark in last_marks.values()]
+            start_date, end_date = self._get_date_range(
+                request.period,
+                min(last_reported) if last_reported else request.start_date,
+                request.end_date,
+            )
+            if checkpoint:
+                checkpoint.save_date_range(start_date, end_date)
+
+        budget_mb = self.config.commit_memory_budget_mb
+        spool = CommitSpool(budget_mb * 1024 * 1024 if budget_mb else None)
+
+        repos = self._requested_repos(request)
+        for repo_config in repos:
+            self.progress.repo(repo_config.name)
+        self.progress.phase = "Analyzing commit history"
+
+        # Analyzers stay open until deduplication has computed any patch-ids
+        analyzers: dict[str, GitAnalyzer] = {}
+        try:
             try:
-                analyzer = GitAnalyzer(repo_config)
-                commits = analyzer.get_commits(
-                    start_date=start_date,
-                    end_date=end_date,
-                    author_email=repo_config.author_email,
-                )
-                all_commits.extend(commits)
-                # Clean up temporary directories for remote repos
+                for repo_config in repos:
+                    repo_progress = self.progress.repo(repo_config.name)
+                    if checkpoint and checkpoint.has_repo(repo_config.name):
+                        repo_progress.phase = "restored"
+                        spool.extend(checkpoint.read_repo(repo_config.name))
+                        repo_progress.finish()
+                        continue
+
+                    try:
+                        analyzer = self._get_analyzer(analyzers, repo_config.name)
+                        if since_last:
+                            commits = self._iter_since_last(
+                                analyzer,
+                                last_marks.get(repo_config.name),
+                                start_date,
+                                end_date,
+                                watermarks,
+                            )
+                        else:
+                            commits = analyzer.iter_commits(
+                                start_date=start_date, end_date=end_date
+                            )
+                        if checkpoint:
+                            commits = checkpoint.record_repo(repo_config.name, commits)
+                        spool.extend(commits)
+                        if since_last and checkpoint:
+                            checkpoint.save_watermarks(watermarks)
+                        repo_progress.finish()
+                    except Exception as e:
+                        repo_progress.finish(error=str(e))
+                        # Log error but continue with other repos
+                        print(
+                            f"Warning: Error analyzing {repo_config.name}: {e}",
+                            file=sys.stderr,
+                        )
+            except BaseException:
+                # Interrupted: keep the repositories walked so far
+                if checkpoint:
+                    checkpoint.flush(spool)
+                raise
+
+            if self.config.deduplicate_commits:
+                self.progress.phase = "Deduplicating commits"
+                spool = self._deduplicate(spool, analyzers)
+            if diff_context:
+                self.progress.phase = "Extracting diff excerpts"
+                spool = self._attach_diff_excerpts(spool, analyzers)
+        finally:
+            # Clean up temporary directories for remote repos
+            for analyzer in analyzers.values():
                 analyzer.cleanup()
-            except Exception as e:
-                # Log error but continue with other repos
-                import sys
 
+        return start_date, end_date, spool
+
+    def _iter_since_last(
+        self,
+        analyzer: GitAnalyzer,
+        mark: Optional[Watermark],
+        start_date: datetime,
+        end_date: datetime,
+        watermarks: dict[str, Watermark],
+    ) -> Iterator[GitCommit]:
+        """Stream the commits of a repository added since its watermark.
+
+        Local histories are walked from the current tips down to the tips
+        recorded by the last report, so the walk is bounded by the new work
+        and includes commits that were merged late with older dates. When
+        there is no usable watermark (first report, REST API, rewritten
+        history) the walk falls back to the dates. The new watermark is
+        recorded once the walk completed.
+
+        Args:
+            analyzer: Analyzer of the repository
+            mark: Watermark of the last report (None if never reported)
+            start_date: Start of the period, used without a watermark
+            end_date: End of the period, the new watermark's time
+            watermarks: Receives the new watermark of the repository
+
+        Yields:
+            Commits added since the last report
+        """
+        tips = analyzer.current_tips()
+        known = analyzer.existing_commits(mark.tips) if mark and mark.tips else []
+        # Commit times have whole seconds; a commit made in the second of the
+        # last report is reported again rather than missed
+        since = mark.reported_at.replace(microsecond=0) if mark else start_date
+        if known and tips is not None:
+            # Everything reachable from the recorded tips was reported; the
+            # end date is not applied, as the new tips mark the end instead
+            commits = analyzer.iter_commits(tips=tips, exclude=known)
+        elif tips is not None:
+            commits = analyzer.iter_commits(start_date=since, tips=tips)
+        else:
+            commits = analyzer.iter_commits(start_date=since, end_date=end_date)
+
+        newest: Optional[GitCommit] = None
+        for commit in commits:
+            if newest is None or commit.date > newest.date:
+                newest = commit
+            yield commit
+
+        watermarks[analyzer.config.name] = Watermark(
+            end_date,
+            tips=tips,
+            last_commit=newest.sha if newest else mark and mark.last_commit,
+        )
+
+    def _deduplicate(
+        self, spool: CommitSpool, analyzers: dict[str, GitAnalyzer]
+    ) -> CommitSpool:
+        """Remove duplicate commits from a spool.
+
+        Args:
+            spool: Collected commits
+            analyzers: Open analyzers by repository name, used for patch-ids
+
+        Returns:
+            Spool of unique commits
+        """
+        if spool.spilled:
+            # Copies of a commit are adjacent in the merged stream, so SHA
+            # duplicates are dropped in one pass; patch-ids need the whole set
+            if self.config.detect_cherry_picks:
                 print(
-                    f"Warning: Error analyzing {repo_config.name}: {e}", file=sys.stderr
+                    "Warning: Cherry-pick detection is skipped for histories "
+                    "larger than commit_memory_budget_mb",
+                    file=sys.stderr,
                 )
+            return spool.rebuild(deduplicate_sorted)
 
-        # Sort all commits by date
-        all_commits.sort(key=lambda c: c.date, reverse=True)
+        patch_ids = (
+            (lambda repo, shas: self._get_analyzer(analyzers, repo).get_patch_ids(shas))
+            if self.config.detect_cherry_picks
+            else None
+        )
+        return spool.rebuild(
+            lambda commits: deduplicate_commits(list(commits), patch_ids=patch_ids)
+        )
 
-        # Generate AI summary
-        summary = await self._generate_summary(all_commits, request.period)
+    def _attach_diff_excerpts(
+        self, spool: CommitSpool, analyzers: dict[str, GitAnalyzer]
+    ) -> CommitSpool:
+        """Attach diff excerpts to the commits that benefit most from them.
 
-        return Report(
-            period=request.period,
-            start_date=start_date,
-            end_date=end_date,
-            commits=all_commits,
-            summary=summary,
-        )
+        Excerpts come from the cache where possible; the rest are extracted
+        with one batched git process per repository and cached by SHA.
 
-    async def _generate_summary(self, commits: list, period: ReportPeriod) -> str:
+        Args:
+            spool: Collected commits
+            analyzers: Open analyzers by repository name
+
+        Returns:
+            Spool with ``diff_excerpt`` set on the selected commits
+        """
+        max_chars = self.config.diff_excerpt_chars
+        selected = select_commits(spool, self.config.diff_context_tokens, max_chars)
+        if not selected:
+            return spool
+
+        cache = DiffExcerptCache()
+        excerpts: dict[str, str] = {}
+        missing: dict[str, list[str]] = {}
+        for commit in selected:
+            cached = cache.get(commit.sha, max_chars)
+            if cached is None:
+                missing.setdefault(commit.repository, []).append(commit.sha)
+            elif cached:
+                excerpts[commit.sha] = cached
+
+        for repo, shas in missing.items():
+            try:
+                extracted = self._get_analyzer(analyzers, repo).get_diff_excerpts(
+                    shas, max_chars
+                )
+            except Exception as e:
+                print(
+                    f"Warning: Could not extract diffs for {repo}: {e}",
+                    file=sys.stderr,
+                )
+                continue
+            # Only commits git reached are cached; empty entries remember
+            # commits without a diff (e.g. merges)
+            for sha, excerpt in extracted.items():
+                cache.put(sha, max_chars, excerpt)
+            excerpts.update(extracted)
+
+        def attach(commits: Iterable[GitCommit]) -> Iterator[GitCommit]:
+            for commit in commits:
+                excerpt = excerpts.get(commit.sha)
+                if excerpt:
+                    commit.diff_excerpt = excerpt
+                yield commit
+
+        return spool.rebuild(attach)
+
+    async def _generate_summary(
+        self,
+        commits: Collection[GitCommit],
+        period: ReportPeriod,
+        ledger: Optional[UsageLedger] = None,
+        budget: Optional[TokenBudget] = None,
+    ) -> tuple[str, Optional[TokenUsage]]:
         """Generate AI summary of commits.
 
         Args:
-            commits: List of commits
+            commits: Commits, newest first
             period: Report period
+            ledger: Usage ledger recording every LLM call
+            budget: Token budget of the run, shared by all its requests
 
         Returns:
-            AI-generated summary
+            Tuple of (AI-generated summary, token usage of the provider)
         """
         if not commits:
-            return "No commits found in this period."
+            return "No commits found in this period.", None
+
+        provider = self._create_provider(
+            self.config.ai_provider, ledger=ledger, budget=budget
+        )
+        label = f"{provider.name}:{provider.model}" if provider.model else provider.name
+        if self.config.hedge_provider is not None:
+            hedge = self._create_provider(
+                self.config.hedge_provider,
+                model=self.config.hedge_model,
+                base_url=self.config.hedge_base_url,
+                ledger=ledger,
+                budget=budget,
+            )
+            label += f" (hedged by {hedge.name})"
+            provider = HedgedProvider(
+                provider,
+                hedge,
+                delay=self.config.hedge_delay,
+                metrics=self.hedge_metrics,
+            )
+
+        self.progress.llm.start(label, ledger)
+        try:
+            summary = await provider.generate_report(commits, period)
+        except BaseException:
+            self.progress.llm.finish(failed=True)
+            raise
+        self.progress.llm.finish()
+        return summary, provider.usage
+
+    def _create_clusterer(self) -> Optional[ThemeClusterer]:
+        """Create the theme clusterer used to compact prompts, if enabled."""
+        if not self.config.cluster_themes:
+            return None
+        return ThemeClusterer(
+            min_commits=self.config.theme_min_commits,
+            max_commits_per_theme=self.config.theme_max_commits,
+        )
+
+    def _create_provider(
+        self,
+        provider_type: AIProvider,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        ledger: Optional[UsageLedger] = None,
+        budget: Optional[TokenBudget] = None,
+    ) -> BaseAIProvider:
+        """Create an AI provider from the configuration.
+
+        Args:
+            provider_type: AI provider to create
+            model: Model to use instead of the configured one
+            base_url: OpenAI-compatible endpoint to use instead of the configured one
+            ledger: Usage ledger recording every call
+            budget: Token budget of the run
+
+        Returns:
+            AI provider instance
 
-        # Initialize AI provider
-        if self.config.ai_provider == AIProvider.OPENAI:
+        Raises:
+            ValueError: If the provider is unknown or its API key is missing
+        """
+        if provider_type == AIProvider.OPENAI:
             if not self.config.openai_api_key:
                 raise ValueError(
                     "OpenAI API key not configured. Set OPENAI_API_KEY environment variable "
                     "or add 'openai_api_key' to config."
                 )
-            provider = OpenAIProvider(
+            return OpenAIProvider(
                 api_key=self.config.openai_api_key,
-                model=self.config.openai_model,
+                model=model or self.config.openai_model,
+                base_url=base_url or self.config.openai_base_url,
+                scheduler=self._get_scheduler(provider_type),
+                clusterer=self._create_clusterer(),
+                ledger=ledger,
+                budget=budget,
             )
-        elif self.config.ai_provider == AIProvider.GEMINI:
+        elif provider_type == AIProvider.GEMINI:
             if not self.config.gemini_api_key:
                 raise ValueError(
                     "Gemini API key not configured. Set GEMINI_API_KEY environment variable "
                     "or add 'gemini_api_key' to config."
                 )
-            provider = GeminiProvider(
+            return GeminiProvider(
                 api_key=self.config.gemini_api_key,
-                model=self.config.gemini_model,
+                model=model or self.config.gemini_model,
+                scheduler=self._get_scheduler(provider_type),
+                clusterer=self._create_clusterer(),
+                ledger=ledger,
+                budget=budget,
             )
+        elif provider_type == AIProvider.LOCAL:
+            return LocalProvider()
         else:
-            raise ValueError(f"Unknown AI provider: {self.config.ai_provider}")
-
-        return await provider.generate_report(commits, period)
+            raise ValueError(f"Unknown AI provider: {provider_type}")
@@ -0,0 +1,202 @@
+"""Memory-bounded commit collection with spilling to disk."""
+
+import heapq
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from .models import GitCommit
+
+# Approximate in-memory size of a GitCommit without its strings, in bytes
+COMMIT_OVERHEAD = 1024
+
+# Runs of the same size class merged into one, bounding the open files per merge
+MERGE_FAN_IN = 16
+
+
+def estimate_size(commit: GitCommit) -> int:
+    """Roughly estimate the memory used by a commit.
+
+    Args:
+        commit: Commit to measure
+
+    Returns:
+        Estimated size in bytes
+    """
+    return (
+        COMMIT_OVERHEAD
+        + len(commit.message)
+        + len(commit.author)
+        + len(commit.email)
+        + len(commit.repository)
+        + sum(len(path) for path in commit.paths)
+    )
+
+
+def sort_key(commit: GitCommit) -> tuple:
+    """Ordering used by every run; copies of the same commit end up adjacent."""
+    return commit.date, commit.sha
+
+
+_Spool = TypeVar("_Spool", bound="CommitSpool")
+
+
+class CommitSpool:
+    """Collects commits and streams them back newest first.
+
+    Commits are buffered in memory until the buffer exceeds the memory budget.
+    The buffer is then sorted and written to a temporary NDJSON file (a run).
+    Iterating merges the runs and the remaining buffer with ``heapq.merge``,
+    so memory use stays bounded by the budget plus one commit per run,
+    regardless of how many commits were collected. Whenever ``MERGE_FAN_IN``
+    runs of the same level exist they are merged into one run of the next
+    level, which keeps the number of runs logarithmic.
+
+    Without a budget all commits stay in memory and nothing is written to disk.
+    """
+
+    def __init__(self, memory_budget: Optional[int] = None):
+        """Initialize the spool.
+
+        Args:
+            memory_budget: Maximum estimated size of buffered commits in bytes
+                (unlimited if None)
+        """
+        self.memory_budget = memory_budget
+        self._buffer: list[GitCommit] = []
+        self._buffer_size = 0
+        # (level, path) of each run; level 0 runs hold one spilled buffer
+        self._runs: list[tuple[int, Path]] = []
+        self._run_counter = 0
+        self._temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._count = 0
+
+    @property
+    def spilled(self) -> bool:
+        """Whether any commits were written to disk."""
+        return bool(self._runs)
+
+    def add(self, commit: GitCommit) -> None:
+        """Add a commit, spilling the buffer to disk if it exceeds the budget.
+
+        Args:
+            commit: Commit to add
+        """
+        self._buffer.append(commit)
+        self._count += 1
+        if self.memory_budget is None:
+            return
+        self._buffer_size += estimate_size(commit)
+        if self._buffer_size > self.memory_budget:
+            self._spill()
+
+    def extend(self, commits: Iterable[GitCommit]) -> None:
+        """Add commits from any iterable, consuming it lazily.
+
+        Args:
+            commits: Commits to add
+        """
+        for commit in commits:
+            self.add(commit)
+
+    def _new_run_path(self) -> Path:
+        if self._temp_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="git-reporter-spill-")
+        self._run_counter += 1
+        return Path(self._temp_dir.name) / f"run-{self._run_counter:06d}.ndjson"
+
+    @staticmethod
+    def _write_run(path: Path, commits: Iterable[GitCommit]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for commit in commits:
+                f.write(commit.model_dump_json())
+                f.write("\n")
+
+    def _spill(self) -> None:
+        """Write the sorted buffer to a new run file and clear it."""
+        self._buffer.sort(key=sort_key, reverse=True)
+        path = self._new_run_path()
+        self._write_run(path, self._buffer)
+        self._runs.append((0, path))
+        self._buffer = []
+        self._buffer_size = 0
+
+        level = 0
+        while True:
+            same_level = [path for run_level, path in self._runs if run_level == level]
+            if len(same_level) < MERGE_FAN_IN:
+                break
+            merged = self._new_run_path()
+            self._write_run(
+                merged,
+                heapq.merge(
+                    *(self._read_run(path) for path in same_level),
+                    key=sort_key,
+                    reverse=True,
+                ),
+            )
+            for path in same_level:
+                path.unlink()
+            self._runs = [run for run in self._runs if run[0] != level]
+            level += 1
+            self._runs.append((level, merged))
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[GitCommit]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield GitCommit.model_validate_json(line)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[GitCommit]:
+        """Iterate over all commits, newest first.
+
+        Can be iterated any number of times; each iteration re-reads the runs.
+        """
+        self._buffer.sort(key=sort_key, reverse=True)
+        if not self._runs:
+            return iter(self._buffer)
+        return heapq.merge(
+            self._buffer,
+            *(self._read_run(path) for _, path in self._runs),
+            key=sort_key,
+            reverse=True,
+        )
+
+    def rebuild(
+        self, transform: Callable[[Iterable[GitCommit]], Iterable[GitCommit]]
+    ) -> "CommitSpool":
+        """Pass all commits through a transformation into a new spool.
+
+        This spool is closed afterwards.
+
+        Args:
+            transform: Function from the current commits to the new commits
+
+        Returns:
+            New spool with the same memory budget
+        """
+        rebuilt = CommitSpool(self.memory_budget)
+        try:
+            rebuilt.extend(transform(self))
+        finally:
+            self.close()
+        return rebuilt
+
+    def close(self) -> None:
+        """Delete the run files and drop the buffered commits."""
+        self._buffer = []
+        self._buffer_size = 0
+        self._runs = []
+        self._count = 0
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __enter__(self: _Spool) -> _Spool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,349 @@
+"""Offline clustering of commits into themes.
+
+Each commit is described by a set of features: the words of its subject line,
+its conventional-commit scope and the directories it touched. Commits are
+compared by the Jaccard similarity of these sets, estimated with MinHash
+signatures. Locality-sensitive hashing over signature bands finds candidate
+pairs, so clustering stays roughly linear in the number of commits.
+
+Signatures are computed with NumPy when it is installed and with plain Python
+otherwise; both produce the same themes.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Collection, Iterable, Optional
+
+from .diff_context import indent_excerpt
+from .models import GitCommit
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Universal hashing modulo a Mersenne prime keeps products within 64 bits
+_PRIME = (1 << 31) - 1
+NUM_PERMUTATIONS = 64
+ROWS_PER_BAND = 2
+
+WORD = re.compile(r"[a-z][a-z0-9]+")
+CONVENTIONAL_PREFIX = re.compile(r"^(?P<type>[a-z]+)(?:\((?P<scope>[^)]*)\))?!?:")
+STOPWORDS = frozenset(
+    [
+        "the",
+        "and",
+        "for",
+        "with",
+        "from",
+        "into",
+        "this",
+        "that",
+        "when",
+        "then",
+        "also",
+        "add",
+        "adds",
+        "added",
+        "update",
+        "updates",
+        "updated",
+        "use",
+        "uses",
+        "using",
+        "make",
+        "makes",
+        "fix",
+        "fixes",
+        "fixed",
+        "change",
+        "changes",
+        "changed",
+        "remove",
+        "removes",
+        "removed",
+        "new",
+        "more",
+        "some",
+        "all",
+        "not",
+        "feat",
+        "chore",
+        "docs",
+        "refactor",
+        "test",
+        "tests",
+        "style",
+        "perf",
+        "build",
+        "merge",
+        "branch",
+        "pull",
+        "request",
+    ]
+)
+# Directories deeper than this are truncated, e.g. src/auth/oauth/providers -> src/auth/oauth
+PATH_DEPTH = 3
+
+
+def commit_features(commit: GitCommit) -> set[str]:
+    """Extract the similarity features of a commit.
+
+    Args:
+        commit: Commit to describe
+
+    Returns:
+        Set of ``word:``, ``scope:`` and ``dir:`` features
+    """
+    subject = commit.message.split("\n", 1)[0].strip().lower()
+    features = set()
+
+    match = CONVENTIONAL_PREFIX.match(subject)
+    if match:
+        if match["scope"]:
+            features.add(f"scope:{match['scope']}")
+        subject = subject[match.end() :]
+
+    for word in WORD.findall(subject):
+        if word not in STOPWORDS:
+            features.add(f"word:{word}")
+
+    # Only the (truncated) parent directory: shared prefixes such as src/ or
+    # the repository root would otherwise make unrelated commits look similar
+    for path in commit.paths:
+        parts = path.split("/")[:-1][:PATH_DEPTH]
+        if parts:
+            features.add("dir:" + "/".join(parts))
+
+    return features
+
+
+def _hash_features(features: set[str]) -> list[int]:
+    # crc32 is stable across runs, unlike hash() of a str
+    return [zlib.crc32(feature.encode()) % _PRIME for feature in features]
+
+
+class _Permutations:
+    """Fixed random hash functions ``(a * x + b) mod p`` shared by all signatures."""
+
+    def __init__(self, count: int, seed: int = 1):
+        state = seed
+        self.a = []
+        self.b = []
+        for _ in range(count):
+            # Small deterministic LCG so results do not depend on NumPy
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self.a.append(1 + (state >> 33) % (_PRIME - 1))
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self.b.append((state >> 33) % _PRIME)
+        if np is not None:
+            self.a_array = np.array(self.a, dtype=np.uint64)[:, None]
+            self.b_array = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, hashes: list[int]) -> tuple[int, ...]:
+        """MinHash signature of a set of feature hashes."""
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(
+                ((self.a_array * values + self.b_array) % _PRIME).min(axis=1).tolist()
+            )
+        return tuple(
+            min((a * x + b) % _PRIME for x in hashes) for a, b in zip(self.a, self.b)
+        )
+
+
+class Theme:
+    """A group of related commits."""
+
+    def __init__(self, label: str, commits: list[GitCommit], paths: list[str]):
+        """Initialize the theme.
+
+        Args:
+            label: Short description made of the most common features
+            commits: Commits in the theme
+            paths: Most common directories touched by the theme
+        """
+        self.label = label
+        self.commits = commits
+        self.paths = paths
+
+    @property
+    def insertions(self) -> int:
+        return sum(c.insertions for c in self.commits)
+
+    @property
+    def deletions(self) -> int:
+        return sum(c.deletions for c in self.commits)
+
+    @property
+    def repositories(self) -> list[str]:
+        return sorted({c.repository for c in self.commits})
+
+
+class ThemeClusterer:
+    """Groups commits into themes by MinHash similarity."""
+
+    OTHER_LABEL = "Other changes"
+
+    def __init__(
+        self,
+        threshold: float = 0.3,
+        max_themes: int = 12,
+        min_commits: int = 50,
+        max_commits_per_theme: Optional[int] = 20,
+    ):
+        """Initialize the clusterer.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity to join two commits
+            max_themes: Maximum number of themes; smaller groups and unmatched
+                commits are collected in a final "Other changes" theme
+            min_commits: Periods with fewer commits are not clustered
+            max_commits_per_theme: Largest commits listed per formatted theme
+                (all if None)
+        """
+        self.threshold = threshold
+        self.max_themes = max_themes
+        self.min_commits = min_commits
+        self.max_commits_per_theme = max_commits_per_theme
+        self._permutations = _Permutations(NUM_PERMUTATIONS)
+
+    def should_cluster(self, commits: Collection[GitCommit]) -> bool:
+        """Whether a set of commits is large enough to be worth clustering."""
+        return len(commits) >= self.min_commits
+
+    def cluster(self, commits: Iterable[GitCommit]) -> list[Theme]:
+        """Group commits into themes.
+
+        Args:
+            commits: Commits to cluster (consumed once)
+
+        Returns:
+            Themes, largest first, with unclustered commits in a final theme
+        """
+        commits = list(commits)
+        features = [commit_features(commit) for commit in commits]
+        signatures = [
+            self._permutations.signature(_hash_features(f)) if f else None
+            for f in features
+        ]
+
+        parent = list(range(len(commits)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Commits sharing a band are candidates; each is compared to the
+        # first commit of the bucket, keeping the work linear
+        for band in range(0, NUM_PERMUTATIONS, ROWS_PER_BAND):
+            anchors: dict[tuple[int, ...], int] = {}
+            for i, signature in enumerate(signatures):
+                if signature is None:
+                    continue
+                key = signature[band : band + ROWS_PER_BAND]
+                anchor = anchors.setdefault(key, i)
+                if anchor == i or find(anchor) == find(i):
+                    continue
+                if self._similarity(signatures[anchor], signature) >= self.threshold:
+                    parent[find(i)] = find(anchor)
+
+        groups: dict[int, list[int]] = {}
+        for i in range(len(commits)):
+            groups.setdefault(find(i), []).append(i)
+
+        ranked = sorted(
+            (members for members in groups.values() if len(members) > 1),
+            key=len,
+            reverse=True,
+        )
+        document_frequency: Counter[str] = Counter()
+        for f in features:
+            document_frequency.update(f)
+        themes = [
+            self._make_theme(members, commits, features, document_frequency)
+            for members in ranked[: self.max_themes]
+        ]
+
+        clustered = {i for members in ranked[: self.max_themes] for i in members}
+        other = [c for i, c in enumerate(commits) if i not in clustered]
+        if other:
+            themes.append(Theme(self.OTHER_LABEL, other, []))
+        return themes
+
+    @staticmethod
+    def _similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+    @staticmethod
+    def _make_theme(
+        members: list[int],
+        commits: list[GitCommit],
+        features: list[set[str]],
+        document_frequency: Counter[str],
+    ) -> Theme:
+        counts: Counter[str] = Counter()
+        for i in members:
+            counts.update(features[i])
+
+        # TF-IDF weighting prefers features that set this theme apart
+        total = len(commits)
+        ranked = sorted(
+            counts,
+            key=lambda f: counts[f] * math.log(total / document_frequency[f]),
+            reverse=True,
+        )
+        words = [f.split(":", 1)[1] for f in ranked if not f.startswith("dir:")][:3]
+        paths = [f[4:] for f in ranked if f.startswith("dir:")][:3]
+        label = ", ".join(words or paths) or "Related changes"
+        return Theme(label, [commits[i] for i in members], paths)
+
+
+def format_theme(theme: Theme, max_commits: Optional[int] = None) -> str:
+    """Format a theme as a compact text block.
+
+    Each listed commit gets a single line with its date, subject and line
+    totals, largest first; the repository is only named when the theme spans
+    several. Commits beyond ``max_commits`` are summed up in a final line.
+
+    Args:
+        theme: Theme to format
+        max_commits: Largest commits listed per theme (all if None)
+
+    Returns:
+        Block with the theme totals and its commits
+    """
+    lines = [
+        (
+            f"### {theme.label} ({len(theme.commits)} commits in "
+            f"{', '.join(theme.repositories)}, +{theme.insertions}/-{theme.deletions})"
+        )
+    ]
+    if theme.paths:
+        lines.append(f"Paths: {', '.join(theme.paths)}")
+
+    ranked = sorted(
+        theme.commits, key=lambda c: c.insertions + c.deletions, reverse=True
+    )
+    listed = ranked if max_commits is None else ranked[:max_commits]
+    several_repositories = len(theme.repositories) > 1
+    for commit in listed:
+        subject = commit.message.split("\n", 1)[0].strip()
+        repository = f"[{commit.repository}] " if several_repositories else ""
+        lines.append(
+            f"- {repository}{commit.date.strftime('%Y-%m-%d')}: "
+            f"{subject[:100]} (+{commit.insertions}/-{commit.deletions})"
+        )
+        if commit.diff_excerpt:
+            lines.append(indent_excerpt(commit.diff_excerpt))
+    rest = ranked[len(listed) :]
+    if rest:
+        lines.append(
+            f"- ...and {len(rest)} smaller commits "
+            f"(+{sum(c.insertions for c in rest)}/-{sum(c.deletions for c in rest)})"
+        )
+    return "\n".join(lines)
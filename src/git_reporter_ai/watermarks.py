@@ -0,0 +1,162 @@
+"""Watermarks recording how far each repository has been reported."""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .config.paths import get_state_dir
+from .models import IdentityConfig, RepositoryConfig
+
+
+def get_watermarks_dir() -> Path:
+    """Get the directory holding the watermark files."""
+    return get_state_dir() / "watermarks"
+
+
+def watermark_key(
+    repos: list[RepositoryConfig], identities: Iterable[IdentityConfig] = ()
+) -> str:
+    """Derive the key of the watermarks of an author and a set of repositories.
+
+    Args:
+        repos: Repositories reported together
+        identities: Configured identities the author filters may refer to
+
+    Returns:
+        Hex key
+    """
+    identity = {
+        "identities": [identity.model_dump() for identity in identities],
+        "repositories": sorted(
+            [
+                repo.name,
+                repo.get_repo_location(),
+                repo.author_email,
+                sorted(repo.author_emails),
+                repo.author,
+            ]
+            for repo in repos
+        ),
+    }
+    encoded = json.dumps(identity, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:24]
+
+
+class Watermark:
+    """Point up to which the history of one repository was reported."""
+
+    def __init__(
+        self,
+        reported_at: datetime,
+        tips: Optional[list[str]] = None,
+        last_commit: Optional[str] = None,
+    ):
+        """Initialize the watermark.
+
+        Args:
+            reported_at: End of the reported period
+            tips: Tips the reported walk started from; commits reachable from
+                them were reported (None for repositories read through the
+                REST API, which continue from ``reported_at``)
+            last_commit: Newest reported commit, if any
+        """
+        self.reported_at = reported_at
+        self.tips = tips
+        self.last_commit = last_commit
+
+    def to_dict(self) -> dict:
+        """Serialize the watermark to JSON-compatible data."""
+        return {
+            "reported_at": self.reported_at.isoformat(),
+            "tips": self.tips,
+            "last_commit": self.last_commit,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Watermark":
+        """Deserialize a watermark written by :meth:`to_dict`."""
+        return cls(
+            datetime.fromisoformat(data["reported_at"]),
+            tips=data.get("tips"),
+            last_commit=data.get("last_commit"),
+        )
+
+
+class WatermarkStore:
+    """Watermarks of one author and set of repositories, stored as JSON."""
+
+    def __init__(self, path: Path):
+        """Initialize the store.
+
+        Args:
+            path: Watermark file (created on first save)
+        """
+        self.path = path
+
+    @classmethod
+    def for_repositories(
+        cls,
+        repos: list[RepositoryConfig],
+        identities: Iterable[IdentityConfig] = (),
+        watermarks_dir: Optional[Path] = None,
+    ) -> "WatermarkStore":
+        """Get the store of an author and a set of repositories.
+
+        Args:
+            repos: Repositories reported together
+            identities: Configured identities the author filters may refer to
+            watermarks_dir: Directory holding all watermark files (default:
+                ``watermarks`` in the state directory)
+
+        Returns:
+            Watermark store
+        """
+        directory = watermarks_dir or get_watermarks_dir()
+        return cls(directory / f"{watermark_key(repos, identities)}.json")
+
+    def load(self) -> dict[str, Watermark]:
+        """Read the watermarks.
+
+        Returns:
+            Watermarks by repository name (empty if nothing was reported yet)
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                name: Watermark.from_dict(mark)
+                for name, mark in data["repositories"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if self.path.exists():
+                print(
+                    f"Warning: Ignoring unreadable watermarks {self.path}: {e}",
+                    file=sys.stderr,
+                )
+            return {}
+
+    def save(self, watermarks: dict[str, Watermark]) -> None:
+        """Record new watermarks, keeping those of other repositories.
+
+        Args:
+            watermarks: Watermarks by repository name
+        """
+        merged = self.load()
+        merged.update(watermarks)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "repositories": {
+                        name: mark.to_dict() for name, mark in merged.items()
+                    }
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,176 @@
+"""Streaming report writers for markdown, JSON and NDJSON output."""
+
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterable, Optional, TextIO
+
+from .models import GitCommit, Report
+
+
+class ReportWriter(ABC):
+    """Base class for writers that stream a report to a text file.
+
+    The header (metadata and summary) is written first, then each commit as it
+    is produced, so the full report never has to be built in memory.
+    """
+
+    def __init__(self, stream: TextIO):
+        """Initialize the writer.
+
+        Args:
+            stream: Text stream to write to
+        """
+        self.stream = stream
+
+    @abstractmethod
+    def write_header(self, report: Report) -> None:
+        """Write the report metadata and summary.
+
+        Args:
+            report: Report to write
+        """
+
+    @abstractmethod
+    def write_commit(self, commit: GitCommit) -> None:
+        """Write a single commit.
+
+        Args:
+            commit: Commit to write
+        """
+
+    def write_footer(self) -> None:
+        """Write anything needed after the last commit."""
+
+    def write(
+        self, report: Report, commits: Optional[Iterable[GitCommit]] = None
+    ) -> int:
+        """Write a complete report.
+
+        Args:
+            report: Report to write
+            commits: Commits to stream (defaults to ``report.iter_commits()``)
+
+        Returns:
+            Number of commits written
+        """
+        self.write_header(report)
+        count = 0
+        for commit in report.iter_commits() if commits is None else commits:
+            self.write_commit(commit)
+            count += 1
+        self.write_footer()
+        return count
+
+
+class MarkdownReportWriter(ReportWriter):
+    """Writes a human-readable markdown report."""
+
+    def write_header(self, report: Report) -> None:
+        self.stream.write(
+            f"# {report.period.value.upper()} Report\n\n"
+            f"Period: {report.start_date.strftime('%Y-%m-%d')} to "
+            f"{report.end_date.strftime('%Y-%m-%d')}\n"
+            f"Commits: {report.total_commits}\n"
+            f"Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"## Summary\n\n"
+            f"{report.summary}\n\n"
+            f"## Commit Details\n\n"
+        )
+
+    def write_commit(self, commit: GitCommit) -> None:
+        self.stream.write(
+            f"- [{commit.repository}] {commit.date.strftime('%Y-%m-%d %H:%M')}: "
+            f"{commit.message[:100]}\n"
+        )
+
+
+def _report_metadata(report: Report) -> dict:
+    """Report fields other than the commits, as JSON-compatible values."""
+    metadata = report.model_dump(mode="json", exclude={"commits"})
+    metadata["commit_count"] = report.total_commits
+    return metadata
+
+
+class JSONReportWriter(ReportWriter):
+    """Writes the report as a single JSON document.
+
+    Commits are streamed one per line inside the ``commits`` array.
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self._first = True
+
+    def write_header(self, report: Report) -> None:
+        header = json.dumps(_report_metadata(report))
+        # Re-open the object so the commits array can be streamed into it
+        self.stream.write(header[:-1] + ', "commits": [')
+        self._first = True
+
+    def write_commit(self, commit: GitCommit) -> None:
+        self.stream.write("\n  " if self._first else ",\n  ")
+        self.stream.write(commit.model_dump_json())
+        self._first = False
+
+    def write_footer(self) -> None:
+        self.stream.write("\n]}\n")
+
+
+class NDJSONReportWriter(ReportWriter):
+    """Writes newline-delimited JSON: one report record, then one line per commit."""
+
+    def write_header(self, report: Report) -> None:
+        self.stream.write(json.dumps({"type": "report", **_report_metadata(report)}))
+        self.stream.write("\n")
+
+    def write_commit(self, commit: GitCommit) -> None:
+        self.stream.write(
+            json.dumps({"type": "commit", **commit.model_dump(mode="json")})
+        )
+        self.stream.write("\n")
+
+
+WRITERS: dict[str, type[ReportWriter]] = {
+    "markdown": MarkdownReportWriter,
+    "json": JSONReportWriter,
+    "ndjson": NDJSONReportWriter,
+}
+
+EXTENSION_FORMATS = {
+    ".json": "json",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+def detect_format(path: Path) -> str:
+    """Guess the output format from a file extension.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Format name (defaults to markdown)
+    """
+    return EXTENSION_FORMATS.get(path.suffix.lower(), "markdown")
+
+
+def get_writer(output_format: str, stream: TextIO) -> ReportWriter:
+    """Create a report writer for a format.
+
+    Args:
+        output_format: One of ``markdown``, ``json`` or ``ndjson``
+        stream: Text stream to write to
+
+    Returns:
+        Report writer
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        writer_class = WRITERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output_format}") from None
+    return writer_class(stream)
@@ -0,0 +1,134 @@
+"""Shared fixtures."""
+
+import json
+import os
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+
+class StubServer:
+    """Local HTTP server answering requests with a test-provided handler.
+
+    The handler is called with each :class:`StubRequest` and returns a tuple of
+    (status, headers, body); dicts and lists are sent as JSON.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests: list[StubRequest] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                request = StubRequest(self.command, self.path, dict(self.headers), body)
+                with stub._lock:
+                    stub.requests.append(request)
+                status, headers, payload = stub.handler(request)
+                if isinstance(payload, (dict, list)):
+                    payload = json.dumps(payload).encode()
+                    headers = {"Content-Type": "application/json", **headers}
+                payload = payload or b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _respond
+            do_POST = _respond
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StubRequest:
+    """A request received by a :class:`StubServer`."""
+
+    def __init__(self, method: str, path: str, headers: dict, body: bytes):
+        self.method = method
+        self.path = path
+        # Lower-cased names, as clients differ in how they capitalize them
+        self.headers = {name.lower(): value for name, value in headers.items()}
+        self.body = body
+
+    @property
+    def route(self) -> str:
+        """Path without the query string."""
+        return urlsplit(self.path).path
+
+    @property
+    def query(self) -> dict[str, str]:
+        """Query parameters (the last value of repeated ones)."""
+        return dict(parse_qsl(urlsplit(self.path).query))
+
+    def json(self):
+        return json.loads(self.body)
+
+
+@pytest.fixture
+def stub_server():
+    """Start local HTTP servers; call with a handler to get a server."""
+    servers = []
+
+    def start(handler) -> StubServer:
+        server = StubServer(handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture(autouse=True)
+def reporter_home(tmp_path, monkeypatch):
+    """Keep state and caches of every test in a temporary directory."""
+    home = tmp_path / "reporter-home"
+    monkeypatch.setenv("GIT_REPORTER_HOME", str(home))
+    return home
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Repository with 24 hourly commits, each adding a line to one of three files."""
+    path = tmp_path / "repo"
+    path.mkdir()
+
+    def git(*args, date=None):
+        env = {**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+        subprocess.run(
+            ["git", *args],
+            cwd=path,
+            check=True,
+            capture_output=True,
+            env=env if date else None,
+        )
+
+    git("init", "-q")
+    git("config", "user.name", "Dev")
+    git("config", "user.email", "dev@example.com")
+    for i in range(24):
+        with open(path / f"file{i % 3}.txt", "a") as f:
+            f.write(f"line {i}\n")
+        git("add", "-A")
+        git("commit", "-q", "-m", f"Change {i}", date=f"2024-05-01T{i:02d}:00:00")
+    return path
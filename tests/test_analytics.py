@@ -0,0 +1,142 @@
+"""Tests for the columnar commit analytics."""
+
+import asyncio
+import statistics
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from git_reporter_ai import analytics
+from git_reporter_ai.ai.local_provider import LocalProvider
+from git_reporter_ai.models import GitCommit, ReportPeriod
+
+pytest.importorskip("numpy")
+
+REPOSITORIES = ["app", "api", "docs"]
+EMAILS = ["dev@example.com", "Ops@Example.com", "ops@example.com", "qa@example.com"]
+
+
+def _commits(count: int = 200) -> list[GitCommit]:
+    return [
+        GitCommit(
+            sha=f"{i:040x}",
+            author="Dev",
+            email=EMAILS[i % len(EMAILS)],
+            date=datetime(2024, 5, 1, 9) + timedelta(hours=i * 7, minutes=i),
+            message=f"Change {i}",
+            repository=REPOSITORIES[i % len(REPOSITORIES)],
+            insertions=(i * 37) % 101,
+            deletions=(i * 13) % 29,
+            files_changed=i % 5 + 1,
+        )
+        for i in range(count)
+    ]
+
+
+def _group(commits, key) -> dict:
+    groups: dict = {}
+    for commit in commits:
+        row = groups.setdefault(key(commit), [0, 0, 0, 0])
+        row[0] += 1
+        row[1] += commit.insertions
+        row[2] += commit.deletions
+        row[3] += commit.files_changed
+    return groups
+
+
+def _rows(activity) -> dict:
+    return {
+        key: [commits, insertions, deletions, files]
+        for key, commits, insertions, deletions, files in zip(
+            *(column.tolist() for column in activity.values())
+        )
+    }
+
+
+def test_totals_match_the_local_report():
+    """Totals agree with the overview of the local provider."""
+    commits = _commits()
+    totals = analytics.CommitTable.from_commits(commits).churn_totals()
+
+    report = asyncio.run(LocalProvider().generate_report(commits, ReportPeriod.DAILY))
+
+    assert totals["commits"] == len(commits)
+    assert f"**Commits:** {totals['commits']} across 3 repositories" in report
+    assert (
+        f"+{totals['insertions']} / -{totals['deletions']} "
+        f"in {totals['files_changed']} files"
+    ) in report
+    assert totals["churn"] == totals["insertions"] + totals["deletions"]
+
+
+def test_percentiles_match_statistics():
+    """Percentiles interpolate like ``statistics.quantiles`` (inclusive)."""
+    commits = _commits()
+    churn = [c.insertions + c.deletions for c in commits]
+    expected = statistics.quantiles(churn, n=100, method="inclusive")
+
+    percentiles = analytics.CommitTable.from_commits(commits).percentiles()
+
+    assert percentiles == {
+        50: pytest.approx(expected[49]),
+        90: pytest.approx(expected[89]),
+        99: pytest.approx(expected[98]),
+    }
+
+
+@pytest.mark.parametrize(
+    "by, key",
+    [
+        ("repository", lambda c: c.repository),
+        ("author", lambda c: c.email.lower()),
+        ("day", lambda c: c.date.strftime("%Y-%m-%d")),
+    ],
+)
+def test_activity_matches_grouped_sums(by, key):
+    """Grouped counts and churn equal sums over the commits of each group."""
+    commits = _commits()
+
+    activity = analytics.CommitTable.from_commits(commits).activity(by)
+
+    assert _rows(activity) == _group(commits, key)
+
+
+def test_histograms_match_counters():
+    """Weekday and hour histograms count the commits' local times."""
+    commits = _commits()
+    table = analytics.CommitTable.from_commits(commits)
+
+    weekdays = Counter(c.date.weekday() for c in commits)
+    hours = Counter(c.date.hour for c in commits)
+    assert table.weekday_histogram().tolist() == [weekdays[d] for d in range(7)]
+    assert table.hour_histogram().tolist() == [hours[h] for h in range(24)]
+
+
+def test_chunked_load_matches_single_chunk(monkeypatch):
+    """Loading in several chunks keeps the codes of earlier chunks."""
+    commits = _commits(50)
+    whole = analytics.CommitTable.from_commits(commits)
+    monkeypatch.setattr(analytics, "CHUNK_SIZE", 7)
+
+    chunked = analytics.CommitTable.from_commits(iter(commits))
+
+    assert chunked.repositories == whole.repositories
+    for name, column in whole.to_columns().items():
+        assert chunked.to_columns()[name].tolist() == column.tolist()
+
+
+def test_empty_table():
+    """No commits give zero totals and empty groups."""
+    table = analytics.CommitTable.from_commits([])
+
+    assert table.churn_totals()["commits"] == 0
+    assert table.percentiles() == {50: 0.0, 90: 0.0, 99: 0.0}
+    assert _rows(table.activity("day")) == {}
+    assert table.weekday_histogram().tolist() == [0] * 7
+
+
+def test_unknown_grouping_is_rejected():
+    """Grouping by anything else names the supported options."""
+    with pytest.raises(ValueError, match="repository, author, day"):
+        analytics.CommitTable.from_commits(_commits(3)).activity("week")
@@ -0,0 +1,113 @@
+"""Tests for token budgets and usage accounting of LLM requests."""
+
+import asyncio
+
+import httpx
+import pytest
+from pydantic_ai.usage import RunUsage
+
+from git_reporter_ai.ai import scheduler as scheduler_module
+from git_reporter_ai.ai.base import AIProvider
+from git_reporter_ai.ai.budget import TokenBudget, TokenBudgetExceeded
+from git_reporter_ai.ai.scheduler import RequestScheduler
+from git_reporter_ai.ledger import UsageLedger
+
+
+class FakeResult:
+    def __init__(self, output: str, usage: RunUsage):
+        self.output = output
+        self._usage = usage
+
+    def usage(self) -> RunUsage:
+        return self._usage
+
+
+class FakeAgent:
+    """Agent whose first runs spend tokens and then fail with ``errors``."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.settings = []
+
+    async def run(self, user_prompt, model_settings=None, usage=None):
+        self.settings.append(model_settings)
+        usage.incr(RunUsage(requests=1, input_tokens=100, output_tokens=20))
+        if self.errors:
+            raise self.errors.pop(0)
+        return FakeResult("# Report", usage)
+
+
+class FakeProvider(AIProvider):
+    name = "fake"
+    model = "fake-1"
+
+    def __init__(self, budget=None, ledger=None):
+        self.scheduler = RequestScheduler(max_retries=2)
+        self.budget = budget
+        self.ledger = ledger
+
+    async def generate_report(self, commits, period, additional_context=None):
+        raise NotImplementedError
+
+
+def _server_error() -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://llm.example.com/v1/chat/completions")
+    response = httpx.Response(502, request=request)
+    return httpx.HTTPStatusError("bad gateway", request=request, response=response)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: 0)
+
+
+def test_retried_attempts_are_charged(tmp_path):
+    """The budget, usage and ledger count every attempt, not only the last."""
+    budget = TokenBudget(10_000)
+    ledger = UsageLedger(tmp_path / "usage.ndjson", run_id="run-1")
+    provider = FakeProvider(budget=budget, ledger=ledger)
+    agent = FakeAgent(_server_error())
+
+    output = asyncio.run(provider._run_agent(agent, "system", "user"))
+
+    assert output == "# Report"
+    assert budget.spent == 240
+    assert budget.reserved == 0
+    assert (provider.usage.requests, provider.usage.input_tokens) == (2, 200)
+    assert [r.status for r in ledger.read()] == ["error", "ok"]
+    assert [r.input_tokens for r in ledger.read()] == [100, 100]
+
+
+def test_failed_request_is_charged():
+    """Tokens of a request that failed for good still count against the budget."""
+    budget = TokenBudget(10_000)
+    provider = FakeProvider(budget=budget)
+    agent = FakeAgent(*(_server_error() for _ in range(3)))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(provider._run_agent(agent, "system", "user"))
+
+    assert budget.spent == 360
+    assert budget.reserved == 0
+    assert provider.usage.requests == 3
+
+
+def test_answer_is_capped_to_the_budget():
+    """The output allowance is passed to the model as max_tokens."""
+    provider = FakeProvider(budget=TokenBudget(1_000))
+    agent = FakeAgent()
+
+    asyncio.run(provider._run_agent(agent, "system", "user"))
+
+    assert agent.settings == [{"max_tokens": 997}]
+
+
+def test_prompt_too_large_for_budget():
+    """A request that leaves no room for an answer is not sent."""
+    provider = FakeProvider(budget=TokenBudget(300))
+    agent = FakeAgent()
+
+    with pytest.raises(TokenBudgetExceeded):
+        asyncio.run(provider._run_agent(agent, "system", "x" * 1000))
+
+    assert agent.settings == []
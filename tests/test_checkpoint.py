@@ -0,0 +1,112 @@
+"""Tests for checkpointing and resuming report runs."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from git_reporter_ai.checkpoint import RunCheckpoint, get_runs_dir
+from git_reporter_ai.config import ConfigManager
+from git_reporter_ai.models import (
+    AIProvider,
+    Config,
+    GitBackendType,
+    GitCommit,
+    ReportPeriod,
+    ReportRequest,
+    RepositoryConfig,
+)
+from git_reporter_ai.report_generator import ReportGenerator
+
+REQUEST = ReportRequest(
+    period=ReportPeriod.CUSTOM,
+    start_date=datetime(2024, 4, 30),
+    end_date=datetime(2024, 5, 2),
+)
+
+
+def _commit(sha: str, repository: str) -> GitCommit:
+    return GitCommit(
+        sha=sha,
+        author="Dev",
+        email="dev@example.com",
+        date=datetime(2024, 5, 1),
+        message=f"Change {sha}",
+        repository=repository,
+    )
+
+
+@pytest.fixture
+def generator(git_repo, tmp_path):
+    config = Config(
+        repositories=[RepositoryConfig(name="repo", path=str(git_repo))],
+        ai_provider=AIProvider.LOCAL,
+        git_backend=GitBackendType.CLI,
+    )
+    return ReportGenerator(ConfigManager(tmp_path / "config.yaml"), config)
+
+
+def _fail_summary_once(generator, monkeypatch):
+    generate_summary = generator._generate_summary
+    calls = []
+
+    async def fail_once(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("provider timeout")
+        return await generate_summary(*args, **kwargs)
+
+    monkeypatch.setattr(generator, "_generate_summary", fail_once)
+
+
+def test_deferred_checkpoint_writes_nothing_until_flushed(tmp_path):
+    """Only repositories whose walk completed are written, on flush."""
+    checkpoint = RunCheckpoint(tmp_path / "run", deferred=True)
+    checkpoint.save_date_range(datetime(2024, 5, 1), datetime(2024, 5, 2))
+    walked = list(checkpoint.record_repo("app", [_commit("a1", "app")]))
+
+    assert [c.sha for c in walked] == ["a1"]
+    assert not (tmp_path / "run").exists()
+
+    checkpoint.flush([_commit("a1", "app"), _commit("b2", "partial")])
+
+    assert checkpoint.load_date_range() == (datetime(2024, 5, 1), datetime(2024, 5, 2))
+    assert [c.sha for c in checkpoint.read_repo("app")] == ["a1"]
+    assert not checkpoint.has_repo("partial")
+
+
+def test_successful_run_leaves_no_checkpoint(generator):
+    """A run that generates its report keeps nothing in the runs directory."""
+    report = asyncio.run(generator.generate(REQUEST))
+
+    assert report.total_commits == 24
+    assert not any(get_runs_dir().glob("*"))
+
+
+def test_failed_run_is_resumed(generator, monkeypatch):
+    """A run failing on the summary is checkpointed, and resuming reuses it."""
+    _fail_summary_once(generator, monkeypatch)
+    with pytest.raises(RuntimeError, match="provider timeout"):
+        asyncio.run(generator.generate(REQUEST))
+    assert len(list(get_runs_dir().glob("*/repos/*.ndjson"))) == 1
+
+    report = asyncio.run(generator.generate(REQUEST, resume=True))
+
+    assert generator.progress.repo("repo").phase == "restored"
+    assert report.total_commits == 24
+    assert not any(get_runs_dir().glob("*"))
+
+
+def test_resumed_run_checkpoints_as_it_goes(generator, monkeypatch):
+    """With resume, walks are written as they complete, before any failure."""
+    written = []
+
+    async def fail(*args, **kwargs):
+        written.extend(get_runs_dir().glob("*/repos/*.ndjson"))
+        raise RuntimeError("provider timeout")
+
+    monkeypatch.setattr(generator, "_generate_summary", fail)
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.generate(REQUEST, resume=True))
+
+    assert len(written) == 1
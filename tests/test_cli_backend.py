@@ -0,0 +1,23 @@
+"""Tests for the git log backend."""
+
+from git_reporter_ai.backends import cli_backend
+from git_reporter_ai.backends.cli_backend import GitCLIBackend
+from git_reporter_ai.models import Config
+
+
+def test_sharded_walk_matches_single_process(git_repo, monkeypatch):
+    """Shards diffed in worker processes are merged back in order."""
+    expected = list(GitCLIBackend(git_repo, "repo").iter_commits())
+    monkeypatch.setattr(cli_backend, "shard_size", lambda commits, workers: 5)
+
+    commits = list(GitCLIBackend(git_repo, "repo", workers=2).iter_commits())
+
+    assert [c.sha for c in commits] == [c.sha for c in expected]
+    assert [(c.insertions, c.deletions, c.paths) for c in commits] == [
+        (c.insertions, c.deletions, c.paths) for c in expected
+    ]
+
+
+def test_stats_workers_default_to_a_single_process():
+    """Process pools are opt-in."""
+    assert Config().stats_workers == 1
@@ -0,0 +1,68 @@
+"""Tests for saving and loading the configuration."""
+
+import yaml
+
+from git_reporter_ai.config import ConfigManager
+from git_reporter_ai.models import (
+    AIProvider,
+    Config,
+    GitBackendType,
+    ModelPrice,
+    ReportPeriod,
+    RepositoryConfig,
+)
+
+
+def test_save_load_round_trip(tmp_path):
+    """Every field, including enums, survives a save and a load."""
+    config = Config(
+        repositories=[
+            RepositoryConfig(name="local", path="/src/local"),
+            RepositoryConfig(
+                name="remote",
+                repo="https://github.com/example/remote.git",
+                backend=GitBackendType.REST,
+            ),
+        ],
+        ai_provider=AIProvider.LOCAL,
+        default_period=ReportPeriod.MONTHLY,
+        git_backend=GitBackendType.CLI,
+        model_prices={"gpt-4o-mini": ModelPrice(input=0.15, output=0.6)},
+    )
+    manager = ConfigManager(tmp_path / "config.yaml")
+
+    manager.save(config)
+    loaded = manager.load()
+
+    assert loaded == config
+    data = yaml.safe_load((tmp_path / "config.yaml").read_text())
+    assert data["git_backend"] == "cli"
+    assert data["repositories"][1]["backend"] == "rest"
+
+
+def test_save_default_config(tmp_path):
+    """A default configuration, as written by ``init``, can be saved."""
+    manager = ConfigManager(tmp_path / "config.yaml")
+
+    manager.save(Config())
+
+    assert manager.load() == Config()
+
+
+def test_save_omits_secrets(tmp_path, monkeypatch):
+    """API keys and tokens are never written to the file."""
+    for name in ("OPENAI_API_KEY", "GEMINI_API_KEY", "GITHUB_TOKEN", "GITLAB_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
+    manager = ConfigManager(tmp_path / "config.yaml")
+
+    manager.save(
+        Config(
+            openai_api_key="sk-secret",
+            gemini_api_key="gm-secret",
+            github_token="gh-secret",
+            gitlab_token="gl-secret",
+        )
+    )
+
+    text = (tmp_path / "config.yaml").read_text()
+    assert "secret" not in text
@@ -0,0 +1,146 @@
+"""Tests for cross-repository commit deduplication."""
+
+import subprocess
+from datetime import datetime, timedelta
+
+import pytest
+
+from git_reporter_ai.dedup import deduplicate_commits
+from git_reporter_ai.git_analyzer import GitAnalyzer
+from git_reporter_ai.models import GitBackendType, GitCommit, RepositoryConfig
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _commit(sha: str, repository: str, message: str, hour: int) -> GitCommit:
+    return GitCommit(
+        sha=sha,
+        author="Dev",
+        email="dev@example.com",
+        date=datetime(2024, 5, 2) + timedelta(hours=hour),
+        message=message,
+        repository=repository,
+    )
+
+
+@pytest.fixture
+def analyzer(git_repo) -> GitAnalyzer:
+    return GitAnalyzer(RepositoryConfig(name="app", path=str(git_repo)))
+
+
+def _resolver(analyzer: GitAnalyzer):
+    # Every repository name of a test lives in the same git repository
+    return lambda repo, shas: analyzer.get_patch_ids(shas)
+
+
+def _side_change(git_repo, message: str) -> str:
+    """Commit a change on a new branch off the first commit."""
+    _git(git_repo, "checkout", "-qb", "side", "HEAD~10")
+    (git_repo / "feature.txt").write_text("feature\n")
+    _git(git_repo, "add", "feature.txt")
+    _git(git_repo, "commit", "-qm", message)
+    sha = _git(git_repo, "rev-parse", "HEAD")
+    _git(git_repo, "checkout", "-q", "-")
+    return sha
+
+
+def test_same_sha_is_collapsed_across_repositories():
+    """Copies of a commit in forks keep the first and list every repository."""
+    sha = "ab" * 20
+    commits = [
+        _commit(sha, "app", "Add feature", 0),
+        _commit(sha, "fork", "Add feature", 0),
+    ]
+
+    unique = deduplicate_commits(commits)
+
+    assert len(unique) == 1
+    assert unique[0].repositories == ["app", "fork"]
+
+
+def test_rebased_cherry_pick_is_collapsed(git_repo, analyzer):
+    """A change picked onto a different base keeps only the oldest copy."""
+    original = _side_change(git_repo, "Add feature")
+    _git(git_repo, "cherry-pick", original)
+    picked = _git(git_repo, "rev-parse", "HEAD")
+    assert picked != original
+    commits = [
+        _commit(picked, "fork", "Add feature", 5),
+        _commit(original, "app", "Add feature", 1),
+    ]
+
+    unique = deduplicate_commits(commits, patch_ids=_resolver(analyzer))
+
+    assert [c.sha for c in unique] == [original]
+    assert unique[0].repositories == ["app", "fork"]
+
+
+def test_different_changes_with_same_subject_are_kept(git_repo, analyzer):
+    """Sharing an author and subject is not enough to be a duplicate."""
+    original = _side_change(git_repo, "Change 1")
+    head = _git(git_repo, "rev-parse", "HEAD~22")
+    commits = [
+        _commit(head, "app", "Change 1", 0),
+        _commit(original, "fork", "Change 1", 1),
+    ]
+
+    unique = deduplicate_commits(commits, patch_ids=_resolver(analyzer))
+
+    assert len(unique) == 2
+
+
+def test_merges_have_no_patch_id(git_repo, analyzer):
+    """Merge commits are never collapsed by their (empty) patch-id."""
+    subject = "Merge feature"
+    _side_change(git_repo, "Add feature")
+    _git(git_repo, "merge", "-q", "--no-ff", "-m", subject, "side")
+    first = _git(git_repo, "rev-parse", "HEAD")
+    _git(git_repo, "checkout", "-qb", "other", "HEAD~2")
+    (git_repo / "other.txt").write_text("other\n")
+    _git(git_repo, "add", "other.txt")
+    _git(git_repo, "commit", "-qm", "Add other")
+    _git(git_repo, "merge", "-q", "--no-ff", "-m", subject, "side")
+    second = _git(git_repo, "rev-parse", "HEAD")
+    merges = _git(git_repo, "rev-list", "--merges", "--all").split()
+    assert {first, second} <= set(merges)
+
+    assert analyzer.get_patch_ids([first, second]) == {}
+    unique = deduplicate_commits(
+        [_commit(first, "app", subject, 0), _commit(second, "fork", subject, 1)],
+        patch_ids=_resolver(analyzer),
+    )
+    assert len(unique) == 2
+
+
+def test_no_patch_ids_without_local_repository():
+    """Histories read through the REST API are only collapsed by SHA."""
+    analyzer = GitAnalyzer(
+        RepositoryConfig(name="app", repo="https://github.com/example/app"),
+        backend=GitBackendType.REST,
+    )
+    commits = [
+        _commit("ab" * 20, "app", "Fix", 0),
+        _commit("cd" * 20, "fork", "Fix", 1),
+    ]
+
+    assert analyzer.get_patch_ids(["ab" * 20]) == {}
+    assert len(deduplicate_commits(commits, patch_ids=_resolver(analyzer))) == 2
+
+
+def test_failed_diff_is_reported(git_repo, analyzer, monkeypatch, capsys):
+    """A failing git warns and leaves the cherry-picks in place."""
+    original = _side_change(git_repo, "Add feature")
+    _git(git_repo, "cherry-pick", original)
+    picked = _git(git_repo, "rev-parse", "HEAD")
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(git_repo.parent))
+    (git_repo / ".git" / "HEAD").unlink()
+
+    with pytest.raises(RuntimeError, match="git diff-tree failed"):
+        analyzer.get_patch_ids([original])
+    commits = [_commit(original, "app", "Add", 0), _commit(picked, "fork", "Add", 1)]
+    assert len(deduplicate_commits(commits, patch_ids=_resolver(analyzer))) == 2
+    assert "Could not compute patch-ids for" in capsys.readouterr().err
@@ -0,0 +1,131 @@
+"""Tests for diff excerpts in the LLM prompt."""
+
+import io
+import subprocess
+from datetime import datetime
+
+import pytest
+
+from git_reporter_ai.config import ConfigManager
+from git_reporter_ai.diff_context import DiffExcerptCache, parse_diff_output
+from git_reporter_ai.git_analyzer import GitAnalyzer
+from git_reporter_ai.models import (
+    AIProvider,
+    Config,
+    GitBackendType,
+    GitCommit,
+    RepositoryConfig,
+)
+from git_reporter_ai.report_generator import ReportGenerator
+from git_reporter_ai.spill import CommitSpool
+
+SHA = "a" * 40
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def generator(git_repo, tmp_path):
+    config = Config(
+        repositories=[RepositoryConfig(name="repo", path=str(git_repo))],
+        ai_provider=AIProvider.LOCAL,
+        git_backend=GitBackendType.CLI,
+        diff_context=True,
+    )
+    return ReportGenerator(ConfigManager(tmp_path / "config.yaml"), config)
+
+
+def _attach(generator, analyzers, shas: list[str]) -> dict[str, str]:
+    spool = CommitSpool()
+    spool.extend(
+        GitCommit(
+            sha=sha,
+            author="Dev",
+            email="dev@example.com",
+            date=datetime(2024, 5, 1),
+            message="Fix",
+            repository="repo",
+            insertions=1,
+        )
+        for sha in shas
+    )
+    with generator._attach_diff_excerpts(spool, analyzers) as attached:
+        return {commit.sha: commit.diff_excerpt for commit in attached}
+
+
+def test_excerpt_is_truncated_at_max_chars():
+    """Changed lines are kept until the cap, then the excerpt is cut."""
+    added = b"".join(b"+line %d\n" % i for i in range(100))
+    output = (
+        SHA.encode() + b"\n"
+        b"diff --git a/app.py b/app.py\n"
+        b"index 1234567..89abcde 100644\n"
+        b"--- a/app.py\n"
+        b"+++ b/app.py\n"
+        b"@@ -0,0 +1,100 @@\n" + added
+    )
+
+    excerpt = parse_diff_output(io.BytesIO(output), max_chars=60)[SHA]
+
+    lines = excerpt.splitlines()
+    assert lines[:3] == ["diff app.py", "@@ -0,0 +1,100 @@", "+line 0"]
+    assert lines[-1] == "..."
+    assert len(excerpt) - len("\n...") <= 60
+
+
+def test_merge_and_empty_commits_have_empty_excerpts(git_repo):
+    """Commits without a diff are reported empty; unknown ones are left out."""
+    _git(git_repo, "checkout", "-qb", "side")
+    (git_repo / "side.txt").write_text("side\n")
+    _git(git_repo, "add", "side.txt")
+    _git(git_repo, "commit", "-qm", "Side change")
+    change = _git(git_repo, "rev-parse", "HEAD")
+    _git(git_repo, "checkout", "-q", "-")
+    _git(git_repo, "merge", "-q", "--no-ff", "--no-edit", "side")
+    merge = _git(git_repo, "rev-parse", "HEAD")
+    _git(git_repo, "commit", "-q", "--allow-empty", "-m", "Empty")
+    empty = _git(git_repo, "rev-parse", "HEAD")
+    analyzer = GitAnalyzer(RepositoryConfig(name="repo", path=str(git_repo)))
+
+    excerpts = analyzer.get_diff_excerpts([change, merge, empty, "0" * 40], 1200)
+
+    assert excerpts == {
+        change: "diff side.txt\n@@ -0,0 +1 @@\n+side",
+        merge: "",
+        empty: "",
+    }
+
+
+def test_cached_excerpts_are_not_extracted_again(generator, git_repo, monkeypatch):
+    """A second run takes the excerpt from the cache without running git."""
+    head = _git(git_repo, "rev-parse", "HEAD")
+    first = _attach(generator, {}, [head])
+    assert first[head].startswith("diff file")
+
+    calls = []
+    monkeypatch.setattr(
+        GitAnalyzer, "get_diff_excerpts", lambda self, *args: calls.append(args)
+    )
+    assert _attach(generator, {}, [head]) == first
+    assert calls == []
+
+
+def test_failed_diff_is_not_cached(generator, git_repo, monkeypatch):
+    """A git failure leaves the commits uncached so a later run retries them."""
+    head = _git(git_repo, "rev-parse", "HEAD")
+    analyzers = {}
+    generator._get_analyzer(analyzers, "repo")
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(git_repo.parent))
+    (git_repo / ".git" / "HEAD").rename(git_repo / "HEAD.saved")
+
+    with pytest.raises(RuntimeError, match="git diff-tree failed"):
+        analyzers["repo"].get_diff_excerpts([head], 1200)
+    assert _attach(generator, analyzers, [head]) == {head: None}
+    assert DiffExcerptCache().get(head, generator.config.diff_excerpt_chars) is None
+
+    (git_repo / "HEAD.saved").rename(git_repo / ".git" / "HEAD")
+    assert _attach(generator, analyzers, [head])[head].startswith("diff file")
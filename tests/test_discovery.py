@@ -0,0 +1,111 @@
+"""Tests for discovering repositories below workspace roots."""
+
+import shutil
+
+import pytest
+
+from git_reporter_ai.config import ConfigManager
+from git_reporter_ai.config.discovery import RepositoryDiscovery
+from git_reporter_ai.models import Config, WorkspaceConfig
+
+
+def _repo(path):
+    (path / ".git").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """A workspace with two checkouts and some trees that are not repositories."""
+    root = tmp_path / "work"
+    _repo(root / "team" / "api")
+    _repo(root / "web")
+    (root / "notes" / "drafts").mkdir(parents=True)
+    return root
+
+
+def _discovery(tmp_path, **kwargs) -> RepositoryDiscovery:
+    return RepositoryDiscovery(index_path=tmp_path / "index.json", **kwargs)
+
+
+def test_repositories_are_found(workspace, tmp_path):
+    """Checkouts are found at any depth and not descended into."""
+    _repo(workspace / "web" / "vendor-lib")
+
+    found = _discovery(tmp_path).discover([workspace])
+
+    assert found == [workspace / "team" / "api", workspace / "web"]
+
+
+def test_excluded_directories_are_skipped(workspace, tmp_path):
+    """Default and extra exclusion patterns are not scanned."""
+    _repo(workspace / "node_modules" / "pkg")
+    _repo(workspace / ".cache" / "clone")
+    _repo(workspace / "archive" / "old")
+
+    found = _discovery(tmp_path).discover([workspace], exclude=["arch*"])
+
+    assert found == [workspace / "team" / "api", workspace / "web"]
+
+
+def test_worktree_git_file_marks_a_repository(workspace, tmp_path):
+    """Worktrees and submodules have a .git file instead of a directory."""
+    worktree = workspace / "api-hotfix"
+    worktree.mkdir()
+    (worktree / ".git").write_text("gitdir: ../team/api/.git/worktrees/hotfix\n")
+
+    assert worktree in _discovery(tmp_path).discover([workspace])
+
+
+def test_unchanged_directories_are_reused(workspace, tmp_path):
+    """A rescan lists no directory whose mtime did not change."""
+    first = _discovery(tmp_path)
+    found = first.discover([workspace])
+
+    second = _discovery(tmp_path)
+    assert second.discover([workspace]) == found
+    assert second.scanned == 0
+    assert second.reused == first.scanned
+
+
+def test_new_and_removed_repositories_are_picked_up(workspace, tmp_path):
+    """Only the changed directories are listed again on a rescan."""
+    _discovery(tmp_path).discover([workspace])
+    _repo(workspace / "team" / "app")
+    shutil.rmtree(workspace / "web")
+
+    discovery = _discovery(tmp_path)
+    found = discovery.discover([workspace])
+
+    assert found == [workspace / "team" / "api", workspace / "team" / "app"]
+    # The root and team/ changed, and team/app is new
+    assert discovery.scanned == 3
+
+
+def test_recent_scan_is_reused_without_walking(workspace, tmp_path):
+    """Within max_age the last result is reused; removed repositories drop out."""
+    _discovery(tmp_path).discover([workspace])
+    _repo(workspace / "team" / "app")
+    shutil.rmtree(workspace / "web")
+
+    discovery = _discovery(tmp_path)
+    found = discovery.discover([workspace], max_age=600)
+
+    assert found == [workspace / "team" / "api"]
+    assert (discovery.scanned, discovery.reused) == (0, 0)
+    assert workspace / "team" / "app" in discovery.discover([workspace], max_age=0)
+
+
+def test_reports_reuse_recent_workspace_scans(workspace, tmp_path):
+    """Resolving repositories only rescans once the interval has passed."""
+    manager = ConfigManager(tmp_path / "config.yaml")
+    config = Config(workspaces=[WorkspaceConfig(root=str(workspace))])
+    discovery = _discovery(tmp_path)
+    assert len(manager.resolve_repositories(config, discovery)) == 2
+
+    _repo(workspace / "team" / "app")
+    names = [r.name for r in manager.resolve_repositories(config, discovery)]
+    assert names == ["team/api", "web"]
+
+    rescanned = manager.resolve_repositories(config, discovery, rescan=True)
+    assert [r.name for r in rescanned] == ["team/api", "team/app", "web"]
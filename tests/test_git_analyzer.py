@@ -0,0 +1,41 @@
+"""Tests for the git analyzer."""
+
+import subprocess
+
+import pytest
+
+from git_reporter_ai.git_analyzer import GitAnalyzer
+from git_reporter_ai.models import RepositoryConfig
+
+
+def _analyzer(path) -> GitAnalyzer:
+    return GitAnalyzer(RepositoryConfig(name="repo", path=str(path)))
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def test_existing_commits_keeps_known_commits(git_repo):
+    """Unknown objects and objects that are not commits are dropped."""
+    head = _git(git_repo, "rev-parse", "HEAD")
+    first = _git(git_repo, "rev-list", "--max-parents=0", "HEAD")
+    blob = _git(git_repo, "rev-parse", "HEAD:file0.txt")
+    missing = "0" * 40
+
+    known = _analyzer(git_repo).existing_commits([missing, head, blob, first])
+
+    assert known == [head, first]
+
+
+def test_existing_commits_raises_when_git_fails(git_repo, monkeypatch):
+    """A failing git is reported instead of looking like deleted commits."""
+    head = _git(git_repo, "rev-parse", "HEAD")
+    analyzer = _analyzer(git_repo)
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(git_repo.parent))
+    (git_repo / ".git" / "HEAD").unlink()
+
+    with pytest.raises(RuntimeError, match="git cat-file failed"):
+        analyzer.existing_commits([head])
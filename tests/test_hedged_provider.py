@@ -0,0 +1,169 @@
+"""Tests for hedged requests across two providers."""
+
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+import pytest
+
+from git_reporter_ai.ai.base import AIProvider
+from git_reporter_ai.ai.hedged_provider import HedgedProvider, HedgeMetrics
+from git_reporter_ai.models import GitCommit, ReportPeriod
+
+COMMITS = [
+    GitCommit(
+        sha="a1",
+        author="Dev",
+        email="dev@example.com",
+        date=datetime(2024, 5, 6, 12, 0),
+        message="Add login form",
+        repository="app",
+    )
+]
+
+
+class FakeProvider(AIProvider):
+    """Provider answering once ``release`` is set, or failing with ``error``.
+
+    Without a release event it answers immediately. Start times (on the event
+    loop clock) and cancellations are recorded.
+    """
+
+    def __init__(
+        self,
+        answer: str,
+        release: Optional[asyncio.Event] = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.answer = answer
+        self.release = release
+        self.error = error
+        self.started: list[float] = []
+        self.cancelled = 0
+
+    async def generate_report(self, commits, period, additional_context=None):
+        self.started.append(asyncio.get_running_loop().time())
+        try:
+            if self.release:
+                await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return self.answer
+
+
+def _hedge(primary, secondary, delay=0.05) -> HedgedProvider:
+    return HedgedProvider(primary, secondary, delay=delay)
+
+
+def _generate(provider: HedgedProvider) -> str:
+    return asyncio.run(provider.generate_report(COMMITS, ReportPeriod.DAILY))
+
+
+def test_fast_primary_is_not_hedged():
+    """An answer within the delay never reaches the secondary."""
+    primary = FakeProvider("primary")
+    secondary = FakeProvider("secondary")
+    provider = _hedge(primary, secondary)
+
+    assert _generate(provider) == "primary"
+    assert secondary.started == []
+    assert provider.metrics.requests == 1
+    assert provider.metrics.hedged == 0
+
+
+def test_slow_primary_is_hedged_after_delay_and_cancelled():
+    """The secondary starts after the delay, wins and cancels the primary."""
+    primary = FakeProvider("primary", release=asyncio.Event())
+    secondary = FakeProvider("secondary")
+    provider = _hedge(primary, secondary, delay=0.05)
+
+    assert _generate(provider) == "secondary"
+    assert secondary.started[0] - primary.started[0] >= 0.05
+    assert primary.cancelled == 1
+    assert provider.metrics.hedged == 1
+    assert provider.metrics.secondary_wins == 1
+
+
+def test_primary_answering_after_hedge_wins():
+    """A late primary answering first cancels the hedged request."""
+
+    async def run():
+        release = asyncio.Event()
+        primary = FakeProvider("primary", release=release)
+        secondary = FakeProvider("secondary", release=asyncio.Event())
+        provider = _hedge(primary, secondary, delay=0.01)
+
+        request = asyncio.ensure_future(
+            provider.generate_report(COMMITS, ReportPeriod.DAILY)
+        )
+        while not secondary.started:
+            await asyncio.sleep(0.01)
+        release.set()
+        assert await request == "primary"
+        assert secondary.cancelled == 1
+        assert provider.metrics.secondary_wins == 0
+
+    asyncio.run(run())
+
+
+def test_failing_primary_is_hedged_immediately():
+    """A primary error sends the request on without waiting for the delay."""
+    primary = FakeProvider("primary", error=RuntimeError("overloaded"))
+    secondary = FakeProvider("secondary")
+    provider = _hedge(primary, secondary, delay=60)
+
+    assert _generate(provider) == "secondary"
+    assert provider.metrics.primary_failures == 1
+
+
+def test_primary_error_is_raised_when_both_fail():
+    """The primary's error is reported when neither provider answers."""
+    primary = FakeProvider("primary", error=RuntimeError("primary down"))
+    secondary = FakeProvider("secondary", error=RuntimeError("secondary down"))
+
+    with pytest.raises(RuntimeError, match="primary down"):
+        _generate(_hedge(primary, secondary))
+
+
+def test_cancelled_primary_reports_secondary_error():
+    """A primary cancelled from inside its provider does not mask the error."""
+    primary = FakeProvider("primary", error=asyncio.CancelledError())
+    secondary = FakeProvider("secondary", error=RuntimeError("secondary down"))
+
+    with pytest.raises(RuntimeError, match="secondary down"):
+        _generate(_hedge(primary, secondary))
+
+
+def test_cancelling_the_request_cancels_both_providers():
+    """Cancelling a hedged request cancels every request it started."""
+
+    async def run():
+        primary = FakeProvider("primary", release=asyncio.Event())
+        secondary = FakeProvider("secondary", release=asyncio.Event())
+        provider = _hedge(primary, secondary, delay=0.01)
+
+        request = asyncio.ensure_future(
+            provider.generate_report(COMMITS, ReportPeriod.DAILY)
+        )
+        while not secondary.started:
+            await asyncio.sleep(0.01)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        return primary, secondary
+
+    primary, secondary = asyncio.run(run())
+    assert (primary.cancelled, secondary.cancelled) == (1, 1)
+
+
+def test_latency_percentiles():
+    """Percentiles pick the nearest recorded latency."""
+    metrics = HedgeMetrics()
+    assert metrics.latency_percentile(95) == 0.0
+    metrics.recent_latencies.extend([2.0, 1.0, 4.0, 3.0])
+
+    assert metrics.latency_percentile(50) == 3.0
+    assert metrics.latency_percentile(100) == 4.0
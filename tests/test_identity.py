@@ -0,0 +1,124 @@
+"""Tests for resolving commit authors through .mailmap and identities."""
+
+from datetime import datetime
+
+from git_reporter_ai.identity import AuthorFilter, IdentityIndex, parse_mailmap
+from git_reporter_ai.models import GitCommit, IdentityConfig
+
+MAILMAP = """\
+# Every form of gitmailmap(5)
+Jane Doe <jane@old.example.com>
+<jane@example.com> <jdoe@laptop.local>
+Jane Doe <jane@example.com> <JANE@old.example.com>
+Build Bot <bot@example.com> jenkins <shared@example.com>
+not an entry
+<only-an-email@example.com>
+"""
+
+
+def _fields(entry) -> tuple:
+    return (
+        entry.proper_name,
+        entry.proper_email,
+        entry.commit_name,
+        entry.commit_email,
+    )
+
+
+def test_parse_mailmap_forms():
+    """All four forms are parsed; comments and malformed lines are skipped."""
+    entries = parse_mailmap(MAILMAP)
+
+    assert [_fields(e) for e in entries] == [
+        ("Jane Doe", None, None, "jane@old.example.com"),
+        (None, "jane@example.com", None, "jdoe@laptop.local"),
+        ("Jane Doe", "jane@example.com", None, "JANE@old.example.com"),
+        ("Build Bot", "bot@example.com", "jenkins", "shared@example.com"),
+    ]
+
+
+def test_resolve_follows_mailmap_rules():
+    """Lookups ignore case, later lines win and name-specific entries come first."""
+    index = IdentityIndex(parse_mailmap(MAILMAP))
+
+    assert index.resolve("J", "jane@OLD.example.com") == (
+        "Jane Doe",
+        "jane@example.com",
+    )
+    assert index.resolve("jd", "jdoe@laptop.local") == ("jd", "jane@example.com")
+    assert index.resolve("Jenkins", "shared@example.com") == (
+        "Build Bot",
+        "bot@example.com",
+    )
+    # Another name at the shared address is not mapped
+    assert index.resolve("Alice", "shared@example.com") == (
+        "Alice",
+        "shared@example.com",
+    )
+    assert index.resolve("Bob", "bob@example.com") == ("Bob", "bob@example.com")
+
+
+def test_configured_identities_override_mailmap():
+    """Identities map every listed email and alias to the first email."""
+    identity = IdentityConfig(
+        name="Jane Smith",
+        emails=["jane@corp.example.com", "jane@example.com"],
+        aliases=["jsmith"],
+    )
+    index = IdentityIndex(parse_mailmap(MAILMAP), [identity])
+
+    assert index.resolve("Jane", "jane@example.com") == (
+        "Jane Smith",
+        "jane@corp.example.com",
+    )
+    assert index.resolve("jsmith", "JANE@example.com") == (
+        "Jane Smith",
+        "jane@corp.example.com",
+    )
+
+
+def test_canonicalize_rewrites_the_author_in_place():
+    """The commit's author and email become the canonical identity."""
+    commit = GitCommit(
+        sha="a" * 40,
+        author="jd",
+        email="jdoe@laptop.local",
+        date=datetime(2024, 5, 1),
+        message="Fix",
+        repository="app",
+    )
+
+    result = IdentityIndex(parse_mailmap(MAILMAP)).canonicalize(commit)
+
+    assert result is commit
+    assert (commit.author, commit.email) == ("jd", "jane@example.com")
+
+
+def test_expand_adds_the_emails_mapped_to_the_filter():
+    """Raw addresses of a wanted canonical email or name are included."""
+    index = IdentityIndex(parse_mailmap(MAILMAP))
+
+    by_email = index.expand(AuthorFilter(["jane@example.com"]))
+    by_old_email = index.expand(AuthorFilter(["jdoe@laptop.local"]))
+    by_name = index.expand(AuthorFilter(names=["jane doe"]))
+
+    assert by_email.emails == {
+        "jane@example.com",
+        "jdoe@laptop.local",
+        "jane@old.example.com",
+    }
+    assert by_old_email.emails == by_email.emails
+    assert by_name.emails == {"jane@old.example.com"}
+    assert by_name.names == {"jane doe"}
+
+
+def test_expand_does_not_add_commit_names():
+    """A name-specific entry adds its address, never the name on its own."""
+    index = IdentityIndex(parse_mailmap(MAILMAP))
+
+    expanded = index.expand(AuthorFilter(["bot@example.com"]))
+
+    assert expanded.emails == {"bot@example.com", "shared@example.com"}
+    assert expanded.names == frozenset()
+    # Someone else called "jenkins" at another address is not included
+    assert not expanded.matches("jenkins", "jenkins@elsewhere.example.com")
@@ -0,0 +1,166 @@
+"""Tests for the offline local provider and the shared prompt construction."""
+
+import asyncio
+import hashlib
+from datetime import datetime
+
+from git_reporter_ai.ai.local_provider import LocalProvider, parse_subject
+from git_reporter_ai.models import GitCommit, ReportPeriod
+from git_reporter_ai.themes import ThemeClusterer
+
+
+def _commit(
+    message: str,
+    repository: str = "app",
+    insertions: int = 1,
+    day: int = 6,
+    email: str = "dev@example.com",
+    **fields,
+) -> GitCommit:
+    return GitCommit(
+        sha=hashlib.sha1(f"{repository}:{message}".encode()).hexdigest(),
+        author="Dev",
+        email=email,
+        date=datetime(2024, 5, day, 12),
+        message=message,
+        repository=repository,
+        insertions=insertions,
+        deletions=1,
+        files_changed=2,
+        **fields,
+    )
+
+
+def _report(commits, provider=None, **kwargs) -> str:
+    provider = provider or LocalProvider()
+    return asyncio.run(provider.generate_report(commits, ReportPeriod.WEEKLY, **kwargs))
+
+
+def test_parse_subject():
+    """Conventional commits are sorted into sections; others go to Other Changes."""
+    assert parse_subject("feat(api)!: add paging\n\nBody") == (
+        "Features",
+        "**api:** add paging",
+    )
+    assert parse_subject("FIX: handle empty input") == (
+        "Bug Fixes",
+        "handle empty input",
+    )
+    assert parse_subject("wip: try things") == ("Other Changes", "try things")
+    assert parse_subject("Update README") == ("Other Changes", "Update README")
+
+
+def test_overview_counts_the_whole_period():
+    """Totals, active days, the busiest day and distinct authors are listed."""
+    commits = [
+        _commit("feat: add login", insertions=10, day=6),
+        _commit("fix: crash", insertions=5, day=7, email="Ops@Example.com"),
+        _commit("docs: usage", repository="docs", insertions=2, day=7),
+        _commit("chore: bump", repository="docs", day=7, email="ops@example.com"),
+    ]
+
+    report = _report(commits, additional_context="Release week")
+
+    assert report.startswith("# Weekly Work Report\n\nRelease week\n\n## Overview\n")
+    assert "- **Commits:** 4 across 2 repositories\n" in report
+    assert "- **Lines changed:** +18 / -4 in 8 files\n" in report
+    assert "- **Active days:** 2 (busiest: 2024-05-07 with 3 commits)\n" in report
+    assert "- **Authors:** 2\n" in report
+
+
+def test_largest_changes_are_ranked_by_churn():
+    """The biggest commits come first; earlier commits win ties."""
+    commits = [
+        _commit("fix: small", insertions=1),
+        _commit("feat: big", insertions=50),
+        _commit("feat: medium", repository="api", insertions=9),
+        _commit("fix: also medium", insertions=9),
+    ]
+
+    report = _report(commits, LocalProvider(top_changes=3))
+
+    largest = report.split("## Largest Changes\n\n", 1)[1].split("\n\n", 1)[0]
+    assert largest.splitlines() == [
+        "- [app] big (+50/-1, 2 files)",
+        "- [api] medium (+9/-1, 2 files)",
+        "- [app] also medium (+9/-1, 2 files)",
+    ]
+
+
+def test_sections_are_grouped_per_repository():
+    """Repositories are sorted and their sections follow the type order."""
+    commits = [
+        _commit("Tidy up", repository="web"),
+        _commit("fix: crash"),
+        _commit("feat(ui): dark mode"),
+        _commit("feat: export", repository="api"),
+    ]
+
+    report = _report(commits)
+
+    sha = {c.message: c.sha[:7] for c in commits}
+    assert report.endswith(
+        "## api (1 commits)\n\n### Features\n\n"
+        f"- export (`{sha['feat: export']}`)\n\n"
+        "## app (2 commits)\n\n### Features\n\n"
+        f"- **ui:** dark mode (`{sha['feat(ui): dark mode']}`)\n\n"
+        "### Bug Fixes\n\n"
+        f"- crash (`{sha['fix: crash']}`)\n\n"
+        "## web (1 commits)\n\n### Other Changes\n\n"
+        f"- Tidy up (`{sha['Tidy up']}`)\n"
+    )
+
+
+def test_long_sections_are_truncated():
+    """Only the first commits of a section are listed, then a count of the rest."""
+    commits = [_commit(f"fix: bug {i}") for i in range(5)]
+
+    report = _report(commits, LocalProvider(max_items_per_section=2))
+
+    assert "- bug 1 (" in report
+    assert "- bug 2 (" not in report
+    assert "- ...and 3 more\n" in report
+    assert "## app (5 commits)" in report
+
+
+def test_no_commits():
+    """An empty period gives a short message instead of empty sections."""
+    assert _report([]) == "No commits found in this period."
+    assert _report(iter([])) == "No commits found in this period."
+
+
+def test_user_prompt_lists_commits():
+    """Small periods list each commit with its churn and diff excerpt."""
+    commits = [
+        _commit("feat: add login\n\nWith a form", insertions=10),
+        _commit("fix: crash", diff_excerpt="app.py\n@@ -1 +1 @@\n-a\n+b"),
+    ]
+
+    prompt = LocalProvider()._create_user_prompt(
+        commits, ReportPeriod.DAILY, "Sprint 4"
+    )
+
+    assert prompt == (
+        "Report period: daily\n"
+        "Additional context: Sprint 4\n"
+        "\nCommits:\n\n"
+        "- [app] 2024-05-06 12:00: feat: add login\n\nWith a form (+10/-1, 2 files)\n"
+        "- [app] 2024-05-06 12:00: fix: crash (+1/-1, 2 files)\n"
+        "    app.py\n    @@ -1 +1 @@\n    -a\n    +b\n"
+    )
+
+
+def test_user_prompt_groups_large_periods_into_themes():
+    """With a clusterer, periods above its threshold are sent as themes."""
+    provider = LocalProvider()
+    provider.clusterer = ThemeClusterer(min_commits=3)
+    commits = [
+        _commit(f"fix: parser bug {i}", paths=["src/parser/lexer.py"]) for i in range(4)
+    ]
+
+    prompt = provider._create_user_prompt(commits, ReportPeriod.WEEKLY)
+    small = provider._create_user_prompt(commits[:2], ReportPeriod.WEEKLY)
+
+    assert prompt.startswith("Report period: weekly\n\nThemes:\n\n")
+    assert "Commits:" not in prompt
+    assert small.startswith("Report period: weekly\n\nCommits:\n\n")
@@ -0,0 +1,48 @@
+"""Tests for the persistent mirrors of remote repositories."""
+
+import subprocess
+
+import pytest
+
+from git_reporter_ai.identity import IdentityIndex
+from git_reporter_ai.mirrors import update_mirror
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def test_mirror_is_cloned_then_fetched(git_repo, tmp_path):
+    """The first update clones the remote; later ones fetch new commits."""
+    mirrors = tmp_path / "mirrors"
+    url = git_repo.as_uri()
+
+    path = update_mirror(url, mirrors)
+    (git_repo / "file0.txt").write_text("changed\n")
+    _git(git_repo, "commit", "-qam", "Change again")
+    assert update_mirror(url, mirrors) == path
+
+    assert _git(path, "rev-parse", "HEAD") == _git(git_repo, "rev-parse", "HEAD")
+    assert _git(path, "config", "remote.origin.url") == url
+
+
+def test_unreachable_remote_fails_to_clone(tmp_path):
+    """A mirror that cannot be created reports the git error."""
+    with pytest.raises(RuntimeError, match="git clone failed"):
+        update_mirror((tmp_path / "missing").as_uri(), tmp_path / "mirrors")
+
+
+def test_bare_mirror_uses_mailmap_of_head(git_repo, tmp_path):
+    """Authors of a mirror are resolved through the committed .mailmap."""
+    (git_repo / ".mailmap").write_text(
+        "Dev Team <team@example.com> <dev@example.com>\n"
+    )
+    _git(git_repo, "add", ".mailmap")
+    _git(git_repo, "commit", "-qm", "Add mailmap")
+
+    path = update_mirror(git_repo.as_uri(), tmp_path / "mirrors")
+    index = IdentityIndex.for_repository(path)
+
+    assert index.resolve("Dev", "dev@example.com") == ("Dev Team", "team@example.com")
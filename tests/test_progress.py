@@ -0,0 +1,166 @@
+"""Tests for the live progress counters read by the dashboard."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+import pytest
+
+from git_reporter_ai.ai.scheduler import RequestScheduler
+from git_reporter_ai.progress import (
+    LLMProgress,
+    ProgressTracker,
+    RepoProgress,
+    parse_transfer_size,
+)
+
+START = datetime(2024, 5, 1)
+END = datetime(2024, 5, 11)
+
+
+def _walking(**fields) -> RepoProgress:
+    progress = RepoProgress("app")
+    progress.start_walk(START, END)
+    for name, value in fields.items():
+        setattr(progress, name, value)
+    return progress
+
+
+@pytest.mark.parametrize(
+    "text, size",
+    [
+        (
+            "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s",
+            int(1.2 * (1 << 20)),
+        ),
+        (
+            "Receiving objects:  99% (990/1000), 2.50 GiB | 10.00 MiB/s",
+            int(2.5 * (1 << 30)),
+        ),
+        ("Receiving objects:   1% (1/100), 512 bytes | 512.00 KiB/s", 512),
+        ("Receiving objects: 100% (3/3), 4.00 KiB, done.", 4096),
+        ("Receiving objects:  45% (450/1000)", None),
+        ("Resolving deltas: 100% (12/12), done.", None),
+    ],
+)
+def test_parse_transfer_size(text, size):
+    """The amount received is read, not the transfer rate after it."""
+    assert parse_transfer_size(text) == size
+
+
+def test_fraction_from_the_commit_time_reached():
+    """Walks go newest first, so the cursor's distance from the end counts."""
+    progress = _walking()
+    assert progress.fraction() is None
+
+    progress.cursor = datetime(2024, 5, 9).timestamp()
+    assert progress.fraction() == pytest.approx(0.2)
+    progress.cursor = datetime(2024, 4, 1).timestamp()
+    assert progress.fraction() == 1.0
+    progress.cursor = datetime(2024, 6, 1).timestamp()
+    assert progress.fraction() == 0.0
+
+
+def test_fraction_of_known_totals_and_finished_walks():
+    """Sharded walks count kept commits; finished walks are complete."""
+    assert _walking(total=40, kept=10).fraction() == 0.25
+    assert _walking(total=40, kept=50).fraction() == 1.0
+
+    unbounded = RepoProgress("app")
+    unbounded.start_walk(None, END)
+    unbounded.cursor = START.timestamp()
+    assert unbounded.fraction() is None
+
+    unbounded.finish()
+    assert (unbounded.phase, unbounded.fraction()) == ("done", 1.0)
+
+
+def test_finish_keeps_restored_phase():
+    """Repositories restored from a checkpoint stay restored."""
+    progress = RepoProgress("app")
+    progress.phase = "restored"
+    progress.finish()
+    assert progress.phase == "restored"
+
+    progress = _walking()
+    progress.finish(error="boom")
+    assert (progress.phase, progress.error) == ("failed", "boom")
+
+
+def test_eta_scales_the_elapsed_time():
+    """The time left is the elapsed time times the remaining share."""
+    progress = _walking(total=40, kept=10)
+    progress.started_at = time.monotonic() - 10
+
+    assert progress.eta() == pytest.approx(30, abs=0.5)
+    assert progress.rate == pytest.approx(1, abs=0.1)
+    assert _walking(total=40, kept=0).eta() is None
+    assert _walking().eta() is None
+
+    progress.finish()
+    assert progress.eta() is None
+    assert progress.elapsed == pytest.approx(10, abs=0.5)
+
+
+def test_llm_progress_sums_its_schedulers():
+    """Queued, in-flight and retried requests add up over all schedulers."""
+    request = httpx.Request("POST", "https://llm.example.com/v1/chat/completions")
+    rate_limited = httpx.HTTPStatusError(
+        "rate limited", request=request, response=httpx.Response(429, request=request)
+    )
+
+    async def scenario():
+        first = RequestScheduler(max_in_flight=1, base_delay=0)
+        second = RequestScheduler(max_in_flight=2, base_delay=0)
+        progress = LLMProgress()
+        progress.schedulers = [first, second]
+        release = asyncio.Event()
+        failures = [rate_limited, rate_limited]
+
+        async def call():
+            await release.wait()
+            if failures:
+                raise failures.pop()
+            return "ok"
+
+        tasks = [
+            asyncio.create_task(scheduler.submit(call))
+            for scheduler in (first, first, second, second, second)
+        ]
+        await asyncio.sleep(0)
+        busy = (progress.in_flight, progress.queued)
+        release.set()
+        await asyncio.gather(*tasks)
+        return progress, busy
+
+    progress, busy = asyncio.run(scenario())
+
+    assert busy == (3, 2)
+    assert (progress.in_flight, progress.queued, progress.retries) == (0, 0, 2)
+
+
+def test_llm_progress_phases():
+    """The summary runs from start to finish under its label."""
+    progress = LLMProgress()
+    assert (progress.phase, progress.elapsed) == ("idle", 0.0)
+
+    progress.start("openai/gpt-4o-mini")
+    assert (progress.phase, progress.label) == ("running", "openai/gpt-4o-mini")
+
+    progress.finish(failed=True)
+    elapsed = progress.elapsed
+    assert progress.phase == "failed"
+    # The clock stops once the summary finished
+    assert progress.elapsed == elapsed > 0
+
+
+def test_tracker_adds_each_repository_once():
+    """Repositories are listed in the order they were first seen."""
+    tracker = ProgressTracker()
+
+    api = tracker.repo("api")
+    tracker.repo("app")
+
+    assert tracker.repo("api") is api
+    assert [r.name for r in tracker.repos] == ["api", "app"]
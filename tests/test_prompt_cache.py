@@ -0,0 +1,97 @@
+"""Tests that prompts keep a stable, cacheable prefix."""
+
+import asyncio
+from datetime import datetime
+
+from git_reporter_ai.ai import OpenAIProvider
+from git_reporter_ai.ai.base import SYSTEM_PROMPT
+from git_reporter_ai.models import GitCommit, ReportPeriod
+
+
+def _commit(sha: str, message: str, repository: str = "app") -> GitCommit:
+    return GitCommit(
+        sha=sha,
+        author="Dev",
+        email="dev@example.com",
+        date=datetime(2024, 5, 6, 12, 0),
+        message=message,
+        repository=repository,
+        insertions=3,
+        deletions=1,
+        files_changed=1,
+    )
+
+
+def _completion(request):
+    return (
+        200,
+        {},
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "# Report"},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 1200,
+                "completion_tokens": 50,
+                "total_tokens": 1250,
+                "prompt_tokens_details": {"cached_tokens": 1024},
+            },
+        },
+    )
+
+
+def test_system_prompt_is_stable_prefix(stub_server, monkeypatch):
+    """Requests for different periods and commits share the same prefix."""
+    # The provider exports its key; restore the environment afterwards
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    server = stub_server(_completion)
+    provider = OpenAIProvider(
+        api_key="test-key", model="gpt-4o-mini", base_url=f"{server.url}/v1"
+    )
+
+    asyncio.run(
+        provider.generate_report([_commit("a1", "Add login form")], ReportPeriod.DAILY)
+    )
+    asyncio.run(
+        provider.generate_report(
+            [_commit("b2", "Fix crash"), _commit("c3", "Update docs", "docs")],
+            ReportPeriod.MONTHLY,
+            additional_context="Release month",
+        )
+    )
+
+    first, second = (request.json() for request in server.requests)
+    assert first["messages"][0] == second["messages"][0]
+    assert first["messages"][0] == {"role": "system", "content": SYSTEM_PROMPT}
+    assert first["prompt_cache_key"] == second["prompt_cache_key"]
+
+    # Only the user message varies, starting with the least variable data
+    assert first["messages"][1]["content"].startswith("Report period: daily\n")
+    assert second["messages"][1]["content"].startswith(
+        "Report period: monthly\nAdditional context: Release month\n"
+    )
+
+
+def test_cached_tokens_are_reported(stub_server, monkeypatch):
+    """Prompt tokens served from the provider's cache are recorded."""
+    # The provider exports its key; restore the environment afterwards
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    server = stub_server(_completion)
+    provider = OpenAIProvider(
+        api_key="test-key", model="gpt-4o-mini", base_url=f"{server.url}/v1"
+    )
+
+    asyncio.run(provider.generate_report([_commit("a1", "Add")], ReportPeriod.WEEKLY))
+
+    assert provider.usage.requests == 1
+    assert provider.usage.input_tokens == 1200
+    assert provider.usage.cache_read_tokens == 1024
+    assert provider.usage.output_tokens == 50
@@ -0,0 +1,50 @@
+"""Tests for listing the refs of a repository."""
+
+import subprocess
+
+import pytest
+
+from git_reporter_ai.refs import list_refs
+
+
+def test_branches_tags_and_head_are_listed(git_repo):
+    """Annotated tags are peeled to their commit."""
+    subprocess.run(
+        ["git", "tag", "-a", "v1.0", "-m", "Release", "HEAD~3"],
+        cwd=git_repo,
+        check=True,
+    )
+
+    refs = {ref.name: ref for ref in list_refs(git_repo)}
+
+    assert set(refs) == {"HEAD", "refs/heads/" + _branch(git_repo), "refs/tags/v1.0"}
+    assert refs["refs/tags/v1.0"].sha == _rev_parse(git_repo, "HEAD~3")
+    assert refs["HEAD"].sha == _rev_parse(git_repo, "HEAD")
+
+
+def test_unborn_head_has_no_refs(tmp_path):
+    """A repository without commits lists nothing."""
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+    assert list_refs(tmp_path) == []
+
+
+def test_git_failure_is_raised(tmp_path, monkeypatch):
+    """Listing refs outside a repository fails loudly."""
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+    with pytest.raises(RuntimeError, match="git for-each-ref failed"):
+        list_refs(tmp_path)
+
+
+def _branch(repo) -> str:
+    return _git(repo, "symbolic-ref", "--short", "HEAD")
+
+
+def _rev_parse(repo, revision: str) -> str:
+    return _git(repo, "rev-parse", revision)
+
+
+def _git(repo, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
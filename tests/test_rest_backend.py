@@ -0,0 +1,413 @@
+"""Tests for the REST backend against a local stand-in for the hosting APIs."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+
+import pytest
+
+from git_reporter_ai.backends import RestBackend, rest_backend
+from git_reporter_ai.backends.rest_backend import HTTPCache
+from git_reporter_ai.identity import AuthorFilter
+
+# Commits are one hour apart, newest first
+NEWEST = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+AUTHORS = [("Alice", "alice@example.com"), ("Bob", "bob@example.com")]
+
+
+@pytest.fixture(autouse=True)
+def small_pages(monkeypatch):
+    """Paginate every ten commits, so a few dozen commits span several pages."""
+    monkeypatch.setattr(rest_backend, "PER_PAGE", 10)
+
+
+def _history(count: int) -> list[dict]:
+    return [
+        {
+            "sha": f"{i:040x}",
+            "name": AUTHORS[i % 2][0],
+            "email": AUTHORS[i % 2][1],
+            "date": NEWEST - timedelta(hours=i),
+            "message": f"Change {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _local(value: datetime) -> datetime:
+    # The backend reports naive local times, like the local backends
+    return value.astimezone().replace(tzinfo=None)
+
+
+class FakeAPI:
+    """Paginated commit listing shared by the GitHub and GitLab fakes.
+
+    Pages after the first are answered slowly, so pages requested
+    concurrently overlap; the highest overlap is kept in ``max_active``.
+    ETags are derived from the page content and ``If-None-Match`` is honored.
+    """
+
+    def __init__(self, history: list[dict], page_delay: float = 0.05):
+        self.history = history
+        self.page_delay = page_delay
+        self.active = 0
+        self.max_active = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def select(self, query: dict[str, str]) -> list[dict]:
+        commits = self.history
+        if "since" in query:
+            since = _parse_iso(query["since"])
+            commits = [c for c in commits if c["date"] >= since]
+        if "until" in query:
+            until = _parse_iso(query["until"])
+            commits = [c for c in commits if c["date"] <= until]
+        if "author" in query:
+            commits = [c for c in commits if c["email"] == query["author"]]
+        return commits
+
+    def page(self, request, commits: list[dict], render, link_style: str):
+        per_page = int(request.query.get("per_page", 30))
+        number = int(request.query.get("page", 1))
+        pages = max(1, -(-len(commits) // per_page))
+        chunk = commits[(number - 1) * per_page : number * per_page]
+
+        if number > 1:
+            with self._lock:
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            time.sleep(self.page_delay)
+            with self._lock:
+                self.active -= 1
+
+        etag = f'"{request.route}:{number}:{",".join(c["sha"][-4:] for c in chunk)}"'
+        if request.headers.get("if-none-match") == etag:
+            with self._lock:
+                self.not_modified += 1
+            return 304, {"ETag": etag}, b""
+
+        headers = {"ETag": etag}
+        base = f"http://{request.headers['host']}{request.path.split('&page=')[0]}"
+        if number < pages:
+            links = [f'<{base}&page={number + 1}>; rel="next"']
+            if link_style == "last":
+                links.append(f'<{base}&page={pages}>; rel="last"')
+            headers["Link"] = ", ".join(links)
+        return 200, headers, [render(c) for c in chunk]
+
+
+class FakeGitHub(FakeAPI):
+    """GitHub's commits endpoints for the repository ``octo/app``."""
+
+    def __call__(self, request):
+        if request.route == "/repos/octo/app/commits":
+            commits = self.select(request.query)
+            if "sha" in request.query:
+                commits = [c for c in commits if request.query["sha"] == "main"]
+            return self.page(request, commits, self.summary, "last")
+        if request.route == "/repos/octo/app/branches":
+            return self.page(
+                request,
+                [{"sha": name} for name in ("main", "release/1.0", "feature")],
+                lambda b: {"name": b["sha"]},
+                "last",
+            )
+        sha = request.route.rsplit("/", 1)[-1]
+        commit = next(c for c in self.history if c["sha"] == sha)
+        return (
+            200,
+            {},
+            {
+                **self.summary(commit),
+                "stats": {"additions": 3, "deletions": 1},
+                "files": [{"filename": "src/app.py"}, {"filename": "README.md"}],
+            },
+        )
+
+    @staticmethod
+    def summary(commit: dict) -> dict:
+        person = {
+            "name": commit["name"],
+            "email": commit["email"],
+            "date": _iso(commit["date"]),
+        }
+        return {
+            "sha": commit["sha"],
+            "commit": {
+                "author": person,
+                "committer": person,
+                "message": commit["message"] + "\n",
+            },
+        }
+
+
+class FakeGitLab(FakeAPI):
+    """GitLab's commits endpoints for the project ``group/app``."""
+
+    project = "/api/v4/projects/" + quote("group/app", safe="")
+
+    def __call__(self, request):
+        if request.route == f"{self.project}/repository/commits":
+            commits = self.select(request.query)
+            return self.page(request, commits, self.summary, "next")
+        return 404, {}, {"message": "404 Not Found"}
+
+    @staticmethod
+    def summary(commit: dict) -> dict:
+        return {
+            "id": commit["sha"],
+            "author_name": commit["name"],
+            "author_email": commit["email"],
+            "committed_date": _iso(commit["date"]),
+            "message": commit["message"],
+            "stats": {"additions": 5, "deletions": 2},
+        }
+
+
+def _github_backend(server, tmp_path, **kwargs) -> RestBackend:
+    return RestBackend(
+        "https://github.com/octo/app.git",
+        "app",
+        api_url=server.url,
+        cache=HTTPCache(tmp_path / "http-cache"),
+        **kwargs,
+    )
+
+
+def test_github_pages_are_fetched_concurrently_in_order(stub_server, tmp_path):
+    """With a last-page link, later pages are requested together, kept in order."""
+    api = FakeGitHub(_history(45))
+    server = stub_server(api)
+
+    commits = list(_github_backend(server, tmp_path).iter_commits())
+
+    assert [c.sha for c in commits] == [c["sha"] for c in api.history]
+    assert api.max_active > 1
+    first = commits[0]
+    assert first.author == "Alice"
+    assert first.date == _local(NEWEST)
+    assert (first.insertions, first.deletions, first.files_changed) == (3, 1, 2)
+    assert first.paths == ["src/app.py", "README.md"]
+
+
+def test_github_unchanged_pages_are_revalidated(stub_server, tmp_path):
+    """A second walk sends the stored ETags and reuses 304 responses."""
+    api = FakeGitHub(_history(25))
+    server = stub_server(api)
+
+    first = list(_github_backend(server, tmp_path).iter_commits())
+    server.requests.clear()
+    second = list(_github_backend(server, tmp_path).iter_commits())
+
+    assert [c.sha for c in second] == [c.sha for c in first]
+    assert api.not_modified == 3
+    # Commit details never change and are not requested again
+    assert all(r.route == "/repos/octo/app/commits" for r in server.requests)
+
+
+def test_dates_and_single_author_are_pushed_down(stub_server, tmp_path):
+    """The date range and one author email become query parameters."""
+    api = FakeGitHub(_history(30))
+    server = stub_server(api)
+    start = _local(NEWEST - timedelta(hours=19, minutes=30))
+    end = _local(NEWEST - timedelta(hours=9, minutes=30))
+
+    commits = list(
+        _github_backend(server, tmp_path).iter_commits(
+            start_date=start,
+            end_date=end,
+            author=AuthorFilter(["bob@example.com"]),
+        )
+    )
+
+    listing = server.requests[0].query
+    assert listing["since"] == _iso(NEWEST - timedelta(hours=19, minutes=30))
+    assert listing["until"] == _iso(NEWEST - timedelta(hours=9, minutes=30))
+    assert listing["author"] == "bob@example.com"
+    assert [c.sha for c in commits] == [f"{i:040x}" for i in range(11, 20, 2)]
+
+
+def test_recent_end_date_is_applied_locally(stub_server, tmp_path):
+    """A period ending now keeps a stable URL and is cut after listing."""
+    history = _history(5)
+    for commit in history:
+        commit["date"] = datetime.now(timezone.utc) - timedelta(
+            minutes=10 * int(commit["sha"], 16)
+        )
+    history[0]["date"] = datetime.now(timezone.utc) + timedelta(hours=1)
+    api = FakeGitHub(history)
+    server = stub_server(api)
+
+    commits = list(
+        _github_backend(server, tmp_path).iter_commits(end_date=datetime.now())
+    )
+
+    assert "until" not in server.requests[0].query
+    assert [c.sha for c in commits] == [c["sha"] for c in history[1:]]
+
+
+def test_several_authors_are_filtered_locally(stub_server, tmp_path):
+    """Filters the API cannot express are applied to the listed commits."""
+    api = FakeGitHub(_history(6))
+    server = stub_server(api)
+
+    commits = list(
+        _github_backend(server, tmp_path).iter_commits(
+            author=AuthorFilter(["nobody@example.com"], names=["alice"])
+        )
+    )
+
+    assert "author" not in server.requests[0].query
+    assert [c.author for c in commits] == ["Alice"] * 3
+
+
+def test_github_branches_are_selected_by_pattern(stub_server, tmp_path):
+    """Configured refs list the matching branches only."""
+    api = FakeGitHub(_history(3))
+    server = stub_server(api)
+
+    commits = list(_github_backend(server, tmp_path, refs=["main"]).iter_commits())
+
+    listed = [
+        r.query.get("sha") for r in server.requests if r.route.endswith("/commits")
+    ]
+    assert listed == ["main"]
+    assert len(commits) == 3
+
+
+def test_gitlab_follows_next_links(stub_server, tmp_path):
+    """Without a last-page link, pages are followed one after another."""
+    api = FakeGitLab(_history(23))
+    server = stub_server(api)
+    backend = RestBackend(
+        "https://gitlab.example.com/group/app.git",
+        "app",
+        api_url=f"{server.url}/api/v4",
+        cache=HTTPCache(tmp_path / "http-cache"),
+    )
+
+    commits = list(backend.iter_commits())
+
+    assert [c.sha for c in commits] == [c["sha"] for c in api.history]
+    assert api.max_active == 1
+    listing = server.requests[0].query
+    assert listing["with_stats"] == "true"
+    assert listing["all"] == "true"
+    # Line counts come with the listing; no request is made per commit
+    assert (commits[0].insertions, commits[0].deletions) == (5, 2)
+    assert (commits[0].files_changed, commits[0].paths) == (0, [])
+    assert {r.route for r in server.requests} == {
+        f"{FakeGitLab.project}/repository/commits"
+    }
+
+
+def test_github_files_of_huge_commits_are_paginated(stub_server, tmp_path):
+    """Every page of a commit's files is counted, not only the first."""
+    api = FakeGitHub(_history(1))
+
+    def handler(request):
+        status, headers, body = api(request)
+        if "/commits/" in request.route:
+            number = int(request.query.get("page", 1))
+            body["files"] = [{"filename": f"f{number}-{i}.py"} for i in range(300)]
+            if number < 3:
+                url = f"http://{request.headers['host']}{request.route}"
+                headers = {"Link": f'<{url}?page={number + 1}>; rel="next"'}
+        return status, headers, body
+
+    server = stub_server(handler)
+
+    (commit,) = _github_backend(server, tmp_path).iter_commits()
+
+    assert commit.files_changed == 900
+    assert commit.paths[0] == "f1-0.py"
+
+
+class RateLimited:
+    """Answers the first requests with a rate limit error, then passes on."""
+
+    def __init__(self, api, *responses: tuple[int, dict]):
+        self.api = api
+        self.responses = list(responses)
+
+    def __call__(self, request):
+        if self.responses:
+            status, headers = self.responses.pop(0)
+            return status, headers, {"message": "API rate limit exceeded"}
+        return self.api(request)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the waits for rate limits instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(rest_backend.time, "sleep", delays.append)
+    return delays
+
+
+def test_rate_limited_requests_are_retried(stub_server, tmp_path, sleeps):
+    """Retry-After and an exhausted quota's reset time delay the retries."""
+    reset = str(int(time.time()) + 30)
+    server = stub_server(
+        RateLimited(
+            FakeGitHub(_history(2)),
+            (429, {"Retry-After": "7"}),
+            (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}),
+        )
+    )
+
+    commits = list(_github_backend(server, tmp_path).iter_commits())
+
+    assert len(commits) == 2
+    assert sleeps[0] == 7.0
+    assert 28 <= sleeps[1] <= 30
+
+
+def test_forbidden_is_not_retried(stub_server, tmp_path, sleeps):
+    """A 403 with quota left is a permission error."""
+    server = stub_server(
+        RateLimited(FakeGitHub(_history(2)), (403, {"X-RateLimit-Remaining": "42"}))
+    )
+
+    with pytest.raises(RuntimeError, match=r"API request failed for app \(403\)"):
+        list(_github_backend(server, tmp_path).iter_commits())
+    assert sleeps == []
+
+
+def test_long_rate_limit_is_reported(stub_server, tmp_path, sleeps):
+    """A reset too far ahead fails instead of stalling the run."""
+    server = stub_server(
+        RateLimited(FakeGitHub(_history(2)), (429, {"Retry-After": "3600"}))
+    )
+
+    with pytest.raises(RuntimeError, match="rate limit exceeded .*3600s"):
+        list(_github_backend(server, tmp_path).iter_commits())
+    assert sleeps == []
+
+
+def test_cached_responses_are_kept_apart_per_token(stub_server, tmp_path):
+    """A response fetched with one token is not reused with another."""
+    api = FakeGitHub(_history(2))
+    server = stub_server(api)
+
+    list(_github_backend(server, tmp_path, token="first").iter_commits())
+    server.requests.clear()
+    list(_github_backend(server, tmp_path, token="second").iter_commits())
+
+    assert api.not_modified == 0
+    assert sum("/commits/" in r.route for r in server.requests) == 2
+    assert server.requests[0].headers["authorization"] == "Bearer second"
+    assert not any(
+        b"first" in path.read_bytes() or b"second" in path.read_bytes()
+        for path in (tmp_path / "http-cache").rglob("*.json")
+    )
@@ -0,0 +1,238 @@
+"""Tests for the LLM request scheduler."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from git_reporter_ai.ai import scheduler as scheduler_module
+from git_reporter_ai.ai.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    RequestScheduler,
+    SchedulerMetrics,
+    TokenBucket,
+    is_retryable,
+)
+
+
+def _rate_limited(retry_after: str = None) -> httpx.HTTPStatusError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    request = httpx.Request("POST", "https://llm.example.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting, with the largest jitter."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: high)
+    return delays
+
+
+class FlakyCall:
+    """Fails with the given errors, then returns ``"ok"``."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_retries_with_exponential_backoff(sleeps):
+    """Retryable errors are retried after doubling delays."""
+    scheduler = RequestScheduler(base_delay=1.0, max_delay=3.0)
+    call = FlakyCall(_rate_limited(), httpx.ReadTimeout("slow"), _rate_limited())
+
+    assert asyncio.run(scheduler.submit(call)) == "ok"
+
+    assert call.calls == 4
+    assert sleeps == [1.0, 2.0, 3.0]
+    assert scheduler.metrics.retries == 3
+    assert scheduler.metrics.failures == 0
+
+
+def test_retry_after_is_honored(sleeps):
+    """A Retry-After header sets the least delay before the retry."""
+    scheduler = RequestScheduler(base_delay=0.5)
+    call = FlakyCall(_rate_limited(retry_after="7"))
+
+    asyncio.run(scheduler.submit(call))
+
+    assert sleeps == [7.0]
+
+
+def test_gives_up_after_max_retries(sleeps):
+    """The last error is raised once the retries are used up."""
+    scheduler = RequestScheduler(max_retries=2)
+    errors = [_rate_limited() for _ in range(3)]
+    call = FlakyCall(*errors)
+
+    with pytest.raises(httpx.HTTPStatusError) as raised:
+        asyncio.run(scheduler.submit(call))
+
+    assert raised.value is errors[-1]
+    assert call.calls == 3
+    assert scheduler.metrics.failures == 1
+
+
+def test_other_errors_are_not_retried(sleeps):
+    """Errors that are not transient fail the request immediately."""
+    scheduler = RequestScheduler()
+    call = FlakyCall(ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(scheduler.submit(call))
+
+    assert call.calls == 1
+    assert sleeps == []
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_timeout_is_retried(sleeps):
+    """Attempts exceeding the timeout are cancelled and retried."""
+    scheduler = RequestScheduler(timeout=0.01, max_retries=1)
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.Event().wait()
+        return "ok"
+
+    assert asyncio.run(scheduler.submit(call)) == "ok"
+    assert attempts == [0, 1]
+    assert scheduler.metrics.retries == 1
+
+
+def test_waiting_requests_run_by_priority():
+    """Once a slot frees up, higher-priority requests are dispatched first."""
+    order = []
+
+    async def run():
+        scheduler = RequestScheduler(max_in_flight=1)
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        def request(name):
+            async def call():
+                order.append(name)
+
+            return call
+
+        first = asyncio.ensure_future(scheduler.submit(blocker))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.ensure_future(scheduler.submit(request(name), priority=priority))
+            for name, priority in [
+                ("low", PRIORITY_LOW),
+                ("normal", PRIORITY_NORMAL),
+                ("high", PRIORITY_HIGH),
+                ("normal-2", PRIORITY_NORMAL),
+            ]
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 1
+        assert scheduler.queued == 4
+
+        release.set()
+        await asyncio.gather(first, *waiting)
+
+    asyncio.run(run())
+    assert order == ["high", "normal", "normal-2", "low"]
+
+
+def test_concurrency_is_capped():
+    """No more than ``max_in_flight`` requests run at once."""
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def run():
+        scheduler = RequestScheduler(max_in_flight=2)
+        await asyncio.gather(*(scheduler.submit(call) for _ in range(6)))
+        assert scheduler.in_flight == 0
+        assert scheduler.metrics.requests == 6
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+def test_cancelled_waiter_frees_no_slot():
+    """Cancelling a queued request neither runs it nor leaks its slot."""
+    ran = []
+
+    async def run():
+        scheduler = RequestScheduler(max_in_flight=1)
+        release = asyncio.Event()
+
+        async def blocker():
+            await release.wait()
+
+        async def call():
+            ran.append(True)
+
+        first = asyncio.ensure_future(scheduler.submit(blocker))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(scheduler.submit(call))
+        await asyncio.sleep(0)
+        queued.cancel()
+        release.set()
+        await first
+        await asyncio.gather(queued, return_exceptions=True)
+
+        assert scheduler.in_flight == 0
+        assert scheduler.queued == 0
+        await scheduler.submit(call)
+
+    asyncio.run(run())
+    assert ran == [True]
+
+
+def test_token_bucket_delays_beyond_capacity(monkeypatch):
+    """An exhausted bucket refills at the configured rate."""
+    now = [100.0]
+    monkeypatch.setattr(scheduler_module.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(60)
+
+    assert bucket.delay(60) == 0
+    bucket.consume(60)
+    assert bucket.delay(1) == pytest.approx(1.0)
+
+    now[0] += 0.5
+    assert bucket.delay(1) == pytest.approx(0.5)
+
+
+def test_wait_percentiles():
+    """Percentiles pick the nearest recorded wait."""
+    metrics = SchedulerMetrics()
+    assert metrics.wait_percentile(50) == 0.0
+    for wait in [0.4, 0.1, 0.3, 0.2, 0.5]:
+        metrics.record_wait(wait)
+
+    assert metrics.wait_percentile(0) == 0.1
+    assert metrics.wait_percentile(50) == 0.3
+    assert metrics.wait_percentile(99) == 0.5
+    assert metrics.max_wait == 0.5
@@ -0,0 +1,42 @@
+"""Tests for collecting commits within a memory budget."""
+
+from datetime import datetime, timedelta
+
+from git_reporter_ai.models import GitCommit
+from git_reporter_ai.spill import CommitSpool
+
+
+def _commit(i: int) -> GitCommit:
+    return GitCommit(
+        sha=f"{i:040x}",
+        author="Dev",
+        email="dev@example.com",
+        # Dates are not in the order the commits are added
+        date=datetime(2024, 5, 1) + timedelta(minutes=(i * 7) % 100),
+        message=f"Change {i}",
+        repository="app",
+    )
+
+
+def test_spilled_commits_are_merged_newest_first():
+    """A spool over its budget spills to disk and streams back in order."""
+    commits = [_commit(i) for i in range(100)]
+
+    with CommitSpool(memory_budget=4096) as spool:
+        spool.extend(commits)
+
+        assert spool.spilled
+        assert len(spool) == 100
+        merged = list(spool)
+
+    expected = sorted(commits, key=lambda c: (c.date, c.sha), reverse=True)
+    assert [c.sha for c in merged] == [c.sha for c in expected]
+
+
+def test_unlimited_spool_stays_in_memory():
+    """Without a budget nothing is written to disk."""
+    with CommitSpool() as spool:
+        spool.extend(_commit(i) for i in range(10))
+
+        assert not spool.spilled
+        assert len(list(spool)) == 10
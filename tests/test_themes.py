@@ -0,0 +1,108 @@
+"""Tests for clustering commits into themes."""
+
+from datetime import datetime, timedelta
+
+from git_reporter_ai.ai.base import AIProvider
+from git_reporter_ai.models import GitCommit, ReportPeriod
+from git_reporter_ai.themes import ThemeClusterer, format_theme
+
+AREAS = [
+    ("auth", "src/auth/login.py", "login session token"),
+    ("billing", "src/billing/invoice.py", "invoice payment refund"),
+    ("docs", "docs/guide/setup.md", "guide setup install"),
+]
+
+
+def _commits(count: int) -> list[GitCommit]:
+    commits = []
+    for i in range(count):
+        scope, path, words = AREAS[i % len(AREAS)]
+        commits.append(
+            GitCommit(
+                sha=f"{i:040x}",
+                author="Dev",
+                email="dev@example.com",
+                date=datetime(2024, 5, 1) - timedelta(hours=i),
+                message=f"feat({scope}): {words} change {i}\n\nDetails",
+                repository="app" if i % 4 else "lib",
+                insertions=i,
+                deletions=1,
+                paths=[path],
+            )
+        )
+    return commits
+
+
+class PromptProvider(AIProvider):
+    """Provider used only to build prompts."""
+
+    async def generate_report(self, commits, period, additional_context=None):
+        raise NotImplementedError
+
+
+def test_commits_are_grouped_by_area():
+    """Commits sharing a scope, words and directory end up in one theme."""
+    themes = ThemeClusterer(min_commits=2).cluster(_commits(30))
+
+    assert sorted(len(theme.commits) for theme in themes) == [10, 10, 10]
+    for theme in themes:
+        assert len({c.paths[0] for c in theme.commits}) == 1
+
+
+def test_large_themes_list_their_largest_commits():
+    """Each theme lists its largest commits and counts the others."""
+    commits = _commits(90)
+    provider = PromptProvider()
+    provider.clusterer = ThemeClusterer(min_commits=50, max_commits_per_theme=5)
+
+    prompt = provider._create_user_prompt(commits, ReportPeriod.MONTHLY)
+
+    assert "\nThemes:\n" in prompt
+    assert prompt.count("- ...and 25 smaller commits") == 3
+    # The five largest commits of each area are numbered 75 to 89
+    listed = {c.sha for c in commits if c.insertions >= 75}
+    for commit in commits:
+        line = commit.message.split("\n", 1)[0] + " ("
+        assert (line in prompt) == (commit.sha in listed)
+
+
+def test_uncapped_themes_list_every_commit():
+    """Without a cap every commit subject is listed, one line each."""
+    commits = _commits(90)
+    provider = PromptProvider()
+    provider.clusterer = ThemeClusterer(min_commits=50, max_commits_per_theme=None)
+
+    prompt = provider._create_user_prompt(commits, ReportPeriod.MONTHLY)
+
+    assert "...and" not in prompt
+    for commit in commits:
+        assert commit.message.split("\n", 1)[0] in prompt
+
+
+def test_theme_lines_are_compact():
+    """Commits of a single repository are listed without repeating its name."""
+    commits = [c for c in _commits(12) if c.repository == "app"]
+    theme = ThemeClusterer(min_commits=2).cluster(commits)[0]
+
+    block = format_theme(theme)
+
+    heading, _, *lines = block.split("\n")
+    assert heading.startswith(f"### {theme.label} ({len(theme.commits)} commits in app")
+    assert (
+        lines[0]
+        == "- 2024-04-30: feat(billing): invoice payment refund change 10 (+10/-1)"
+    )
+    assert len(lines) == len(theme.commits)
+
+
+def test_max_commits_limits_the_listing():
+    """An explicit limit keeps the largest commits and counts the rest."""
+    theme = ThemeClusterer(min_commits=2).cluster(_commits(30))[0]
+
+    lines = format_theme(theme, max_commits=3).split("\n")
+
+    rest = sorted(theme.commits, key=lambda c: c.insertions, reverse=True)[3:]
+    assert lines[-1] == (
+        f"- ...and {len(rest)} smaller commits "
+        f"(+{sum(c.insertions for c in rest)}/-{len(rest)})"
+    )
@@ -0,0 +1,131 @@
+"""Tests for the streaming report writers."""
+
+import io
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from git_reporter_ai.models import GitCommit, Report, ReportPeriod
+from git_reporter_ai.spill import CommitSpool
+from git_reporter_ai.writers import detect_format, get_writer
+
+
+def _commits(count: int) -> list[GitCommit]:
+    return [
+        GitCommit(
+            sha=f"{i:040x}",
+            author="Dev",
+            email="dev@example.com",
+            date=datetime(2024, 5, 6, 18) - timedelta(hours=i),
+            message=f"Change {i}\n\nDetails of change {i}" + "!" * 100,
+            repository="app" if i % 2 else "api",
+            insertions=i,
+            deletions=1,
+            files_changed=1,
+            paths=[f"src/file{i}.py"],
+        )
+        for i in range(count)
+    ]
+
+
+def _report(commits: list[GitCommit], spooled: bool = False) -> Report:
+    report = Report(
+        period=ReportPeriod.WEEKLY,
+        start_date=datetime(2024, 5, 1),
+        end_date=datetime(2024, 5, 7),
+        commits=[] if spooled else commits,
+        summary="## Highlights\n\n- Shipped the app",
+        generated_at=datetime(2024, 5, 7, 9, 30),
+    )
+    if spooled:
+        spool = CommitSpool(memory_budget=4096)
+        spool.extend(commits)
+        report.set_commit_source(spool)
+    return report
+
+
+def _write(output_format: str, report: Report) -> str:
+    stream = io.StringIO()
+    get_writer(output_format, stream).write(report)
+    return stream.getvalue()
+
+
+def _markdown(report: Report) -> str:
+    """The report as the markdown that was built in memory before streaming."""
+    text = f"""# {report.period.value.upper()} Report
+
+Period: {report.start_date.strftime("%Y-%m-%d")} to {report.end_date.strftime("%Y-%m-%d")}
+Commits: {len(report.commits)}
+Generated: {report.generated_at.strftime("%Y-%m-%d %H:%M:%S")}
+
+## Summary
+
+{report.summary}
+
+## Commit Details
+
+"""
+    for commit in report.commits:
+        text += (
+            f"- [{commit.repository}] {commit.date.strftime('%Y-%m-%d %H:%M')}: "
+            f"{commit.message[:100]}\n"
+        )
+    return text
+
+
+@pytest.mark.parametrize("spooled", [False, True])
+def test_markdown_matches_in_memory_report(spooled):
+    """Streamed markdown is identical to the report built as one string."""
+    commits = _commits(40)
+
+    streamed = _write("markdown", _report(commits, spooled))
+
+    assert streamed == _markdown(_report(commits))
+
+
+@pytest.mark.parametrize("spooled", [False, True])
+def test_json_matches_model_dump(spooled):
+    """The streamed JSON document decodes to the dumped report."""
+    commits = _commits(40)
+
+    document = json.loads(_write("json", _report(commits, spooled)))
+
+    expected = _report(commits).model_dump(mode="json")
+    assert document.pop("commit_count") == 40
+    assert document == expected
+
+
+@pytest.mark.parametrize("spooled", [False, True])
+def test_ndjson_has_a_report_record_then_one_line_per_commit(spooled):
+    """Each commit is a separate line equal to the dumped commit."""
+    commits = _commits(40)
+
+    lines = _write("ndjson", _report(commits, spooled)).splitlines()
+
+    header, *records = (json.loads(line) for line in lines)
+    expected = _report(commits).model_dump(mode="json")
+    assert header == {
+        "type": "report",
+        "commit_count": 40,
+        **{k: v for k, v in expected.items() if k != "commits"},
+    }
+    assert records == [{"type": "commit", **c} for c in expected["commits"]]
+
+
+def test_empty_report_is_valid_json():
+    """A report without commits still closes the commits array."""
+    document = json.loads(_write("json", _report([])))
+
+    assert document["commits"] == []
+    assert document["commit_count"] == 0
+
+
+def test_format_is_detected_from_the_extension():
+    """JSON extensions select their writer; anything else is markdown."""
+    assert detect_format(Path("report.JSON")) == "json"
+    assert detect_format(Path("report.jsonl")) == "ndjson"
+    assert detect_format(Path("report.md")) == "markdown"
+    with pytest.raises(ValueError, match="Unknown output format: html"):
+        get_writer("html", io.StringIO())